@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+"""
+Created on 2026-10-18
+
+@author: brassbeat
+
+Usage:
+    python -m ls_analysis.benchmarks [--sizes 1000x10 20000x40] [--only import_lss ...]
+                                     [--save baseline.json] [--compare baseline.json] [--check]
+"""
+import argparse
+import sys
+
+import pandas as pd
+
+from ls_analysis.benchmarks.suite import (
+    BENCHMARKS,
+    DEFAULT_SIZES,
+    find_regressions,
+    load_baseline,
+    run_benchmarks,
+    run_checks,
+    save_baseline,
+    to_frame,
+)
+
+
+def _parse_size(size: str) -> tuple[int, int]:
+    attempt_count, segment_count = size.lower().split("x")
+    return int(attempt_count), int(segment_count)
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python -m ls_analysis.benchmarks")
+    parser.add_argument(
+        "--sizes",
+        nargs="+",
+        type=_parse_size,
+        default=DEFAULT_SIZES,
+        help="attempts x segments of each synthetic run, e.g. 20000x40",
+    )
+    parser.add_argument("--only", nargs="+", choices=list(BENCHMARKS), help="benchmarks to run")
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--save", help="store the results as a baseline")
+    parser.add_argument("--compare", help="flag regressions against a stored baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    parser.add_argument("--check", action="store_true", help="also check results against naive calculations")
+    return parser.parse_args()
+
+
+def main():
+    args = _parse_args()
+    if args.check:
+        failures = run_checks(args.sizes, args.only, args.seed)
+        for failure in failures:
+            print(f"CHECK FAILED {failure.name} {failure.attempt_count}x{failure.segment_count}: {failure.message}")
+        if failures:
+            sys.exit(1)
+
+    results = run_benchmarks(args.sizes, args.only, args.repeats, args.seed)
+
+    with pd.option_context("display.width", 120, "display.max_rows", None):
+        print(to_frame(results))
+
+    if args.save:
+        save_baseline(results, args.save)
+
+    if args.compare:
+        regressions = find_regressions(results, load_baseline(args.compare), args.tolerance)
+        for regression in regressions:
+            name, attempt_count, segment_count = regression.result.key
+            print(
+                f"REGRESSION {name} {attempt_count}x{segment_count}: "
+                f"time x{regression.time_ratio:.2f}, peak memory x{regression.memory_ratio:.2f}"
+            )
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,375 @@
+# -*- coding: utf-8 -*-
+"""
+Created on 2026-10-18
+
+@author: brassbeat
+"""
+import io
+import json
+import os
+import time
+import tracemalloc
+from collections.abc import Callable, Iterable
+from pathlib import Path
+from typing import Self
+
+import attrs
+import numpy as np
+import pandas as pd
+from matplotlib import pyplot as plt
+
+from ls_analysis.data.enums import AttemptStat
+from ls_analysis.data.import_lss import import_lss
+from ls_analysis.data.livesplit_data import LivesplitData
+from ls_analysis.data.synthetic_lss import SyntheticRun
+from ls_analysis.distributions.balanced_splits import get_balanced_segment_batch, get_balanced_segments
+from ls_analysis.distributions.core.interpolated import InterpolatedDistribution
+from ls_analysis.distributions.core.online import OnlineDistribution
+from ls_analysis.distributions.core.weights.exponential import get_weights
+from ls_analysis.distributions.core.weights.kernels import get_count_decay_weights
+from ls_analysis.distributions.enums import DistributionColumn
+from ls_analysis.plots.kaplan_meier.figure import KaplanMeierSegment
+from ls_analysis.statistics.core.censored_data import get_censored_segment_data
+from ls_analysis.statistics.kaplan_meier import KaplanMeierTable
+from ls_analysis.statistics.rolling import RollingSegmentStats
+from ls_analysis.statistics.segment_changes import get_segment_changes
+
+DEFAULT_SIZES = ((1_000, 10), (5_000, 20), (20_000, 40))
+_WEIGHT_DECAY = 0.99
+_BENCHMARKED_SEGMENT = 1
+_CHECKED_QUANTILES = (0.1, 0.5, 0.9)
+_CHECKED_WINDOW_COUNT = 50
+
+
+@attrs.define
+class BenchmarkInput:
+    """
+    A synthetic run at one size of the grid, with everything the benchmarks need prepared up front,
+    so only the benchmarked call itself is measured.
+    """
+    attempt_count: int = attrs.field()
+    segment_count: int = attrs.field()
+    lss: str = attrs.field()
+    data: LivesplitData = attrs.field()
+    distribution: InterpolatedDistribution = attrs.field()
+
+    @classmethod
+    def generate(cls, attempt_count: int, segment_count: int, seed: int = 0) -> Self:
+        lss = SyntheticRun.generate(attempt_count, segment_count, seed=seed).to_lss()
+        data = LivesplitData.from_lss(io.StringIO(lss))
+        return cls(
+            attempt_count=attempt_count,
+            segment_count=segment_count,
+            lss=lss,
+            data=data,
+            distribution=InterpolatedDistribution.from_weight_kernel(data, get_count_decay_weights, _WEIGHT_DECAY),
+        )
+
+
+def _bench_import_lss(inputs: BenchmarkInput) -> Callable[[], object]:
+    return lambda: import_lss(io.StringIO(inputs.lss), "RealTime")
+
+
+def _bench_from_weight_func(inputs: BenchmarkInput) -> Callable[[], object]:
+    return lambda: InterpolatedDistribution.from_weight_func(inputs.data, get_weights, _WEIGHT_DECAY)
+
+
+def _bench_from_weight_kernel(inputs: BenchmarkInput) -> Callable[[], object]:
+    return lambda: InterpolatedDistribution.from_weight_kernel(inputs.data, get_count_decay_weights, _WEIGHT_DECAY)
+
+
+def _bench_online_update(inputs: BenchmarkInput) -> Callable[[], object]:
+    distribution = OnlineDistribution.from_livesplit_data(inputs.data, _WEIGHT_DECAY)
+    attempt_row = inputs.data.segment_data.iloc[-1]
+
+    def update():
+        distribution.update(attempt_row)
+        return distribution.nodes
+
+    return update
+
+
+def _bench_get_quantile_times(inputs: BenchmarkInput) -> Callable[[], object]:
+    return lambda: inputs.distribution.get_quantile_times(0.5)
+
+
+def _bench_get_balanced_segments(inputs: BenchmarkInput) -> Callable[[], object]:
+    target_time = inputs.distribution.get_quantile_times(0.5)[DistributionColumn.SEGMENT_TIME].sum()
+    return lambda: get_balanced_segments(inputs.distribution, target_time)
+
+
+def _bench_get_balanced_segment_batch(inputs: BenchmarkInput) -> Callable[[], object]:
+    # every 5 second goal from the sum of best segments to the median run
+    best_time = inputs.distribution.get_quantile_times(0.)[DistributionColumn.SEGMENT_TIME].sum()
+    median_time = inputs.distribution.get_quantile_times(0.5)[DistributionColumn.SEGMENT_TIME].sum()
+    target_times = pd.timedelta_range(best_time, median_time, freq="5s")
+    return lambda: get_balanced_segment_batch(inputs.distribution, target_times)
+
+
+def _bench_get_censored_segment_data(inputs: BenchmarkInput) -> Callable[[], object]:
+    return lambda: list(get_censored_segment_data(inputs.data))
+
+
+def _bench_kaplan_meier_segment(inputs: BenchmarkInput) -> Callable[[], object]:
+    def draw():
+        figure = KaplanMeierSegment(_BENCHMARKED_SEGMENT, None, "game", "category", "runner")
+        figure.draw_segment_from_data(inputs.data, "runner")
+        plt.close(figure.fig)
+
+    return draw
+
+
+def _bench_kaplan_meier_table(inputs: BenchmarkInput) -> Callable[[], object]:
+    return lambda: KaplanMeierTable.from_livesplit_data(inputs.data).evaluate(np.linspace(0., 120., 1000))
+
+
+def _bench_get_segment_changes(inputs: BenchmarkInput) -> Callable[[], object]:
+    starts = inputs.data.start_index.starts.view("datetime64[ns]")
+    cutoffs = pd.date_range(starts[0], starts[-1], periods=100)
+    return lambda: get_segment_changes(inputs.data, cutoffs)
+
+
+def _bench_rolling_segment_stats(inputs: BenchmarkInput) -> Callable[[], object]:
+    return lambda: RollingSegmentStats.from_livesplit_data(inputs.data, 500, (0.25, 0.5, 0.75))
+
+
+BENCHMARKS: dict[str, Callable[[BenchmarkInput], Callable[[], object]]] = {
+    "import_lss": _bench_import_lss,
+    "interpolated_from_weight_func": _bench_from_weight_func,
+    "interpolated_from_weight_kernel": _bench_from_weight_kernel,
+    "online_update": _bench_online_update,
+    "get_quantile_times": _bench_get_quantile_times,
+    "get_balanced_segments": _bench_get_balanced_segments,
+    "get_balanced_segment_batch": _bench_get_balanced_segment_batch,
+    "get_censored_segment_data": _bench_get_censored_segment_data,
+    "kaplan_meier_segment": _bench_kaplan_meier_segment,
+    "kaplan_meier_table": _bench_kaplan_meier_table,
+    "get_segment_changes": _bench_get_segment_changes,
+    "rolling_segment_stats": _bench_rolling_segment_stats,
+}
+
+
+def _get_naive_window_stats(
+        frame: pd.DataFrame,
+        window_rows: np.ndarray,
+        earlier_bests: np.ndarray,
+) -> dict[str, np.ndarray]:
+    """
+    Statistics of one window recomputed from scratch, per segment, with reaching a segment read from
+    the times recorded on it or on any later segment, or from the attempt finishing the run.
+    """
+    times = frame[AttemptStat.SEGMENT_TIME].to_numpy(dtype="timedelta64[ns]")[window_rows]
+    nanoseconds = np.where(np.isnat(times), np.nan, times.view(np.int64).astype(np.float64))
+    has_reset = (
+        frame[AttemptStat.RESET_TIME]
+        .reindex(columns=frame[AttemptStat.SEGMENT_TIME].columns)
+        .notna()
+        .to_numpy()[window_rows]
+    )
+    is_finished = frame[AttemptStat.RUN_TIME, -1].notna().to_numpy()[window_rows]
+    has_time = ~np.isnan(nanoseconds) | has_reset
+    is_reached = np.logical_or.accumulate(has_time[:, ::-1], axis=1)[:, ::-1] | is_finished[:, np.newaxis]
+
+    stats = {
+        "arrivals": is_reached.sum(axis=0),
+        "completions": (~np.isnan(nanoseconds)).sum(axis=0),
+        "resets": has_reset.sum(axis=0),
+        "golds": (nanoseconds < earlier_bests).sum(axis=0),
+    }
+    for quantile in _CHECKED_QUANTILES:
+        stats[quantile] = np.array([
+            np.quantile(column[~np.isnan(column)], quantile) if (~np.isnan(column)).any() else np.nan
+            for column in nanoseconds.T
+        ])
+    return stats
+
+
+def _check_rolling_segment_stats(inputs: BenchmarkInput) -> None:
+    """
+    Compares a count window in row order and a time window in start order
+    against statistics recomputed from scratch for a sample of windows.
+    The start order is found here without start_index, so a wrong order in it shows up as a failure.
+    """
+    frame = inputs.data.data
+    starts = frame[AttemptStat.START_OF_ATTEMPT, -1].to_numpy(dtype="datetime64[ns]")
+    dated_rows = np.flatnonzero(~np.isnat(starts))
+    start_order = dated_rows[np.argsort(starts[dated_rows], kind="stable")]
+    sorted_starts = starts[start_order]
+
+    window_size = max(inputs.attempt_count // 20, 1)
+    window_duration = (sorted_starts[-1] - sorted_starts[0]) / 20
+    windows = (
+        (window_size, np.arange(len(frame)), lambda end: max(end - window_size + 1, 0)),
+        (
+            pd.Timedelta(window_duration),
+            start_order,
+            lambda end: sorted_starts.searchsorted(sorted_starts[end] - window_duration, side="right"),
+        ),
+    )
+
+    for window, rows, get_first in windows:
+        stats = RollingSegmentStats.from_livesplit_data(inputs.data, window, _CHECKED_QUANTILES)
+        if not np.array_equal(stats.completions.index.get_level_values(0), frame.index[rows]):
+            raise AssertionError(f"window {window}: attempts are not in the expected order")
+
+        segment_times = frame[AttemptStat.SEGMENT_TIME].to_numpy(dtype="timedelta64[ns]")[rows]
+        ordered = pd.DataFrame(np.where(np.isnat(segment_times), np.nan, segment_times.view(np.int64)))
+        earlier_bests = ordered.cummin().ffill().shift(1).fillna(np.inf).to_numpy()
+
+        for end in np.unique(np.linspace(0, len(rows) - 1, _CHECKED_WINDOW_COUNT).astype(np.int64)):
+            in_window = slice(get_first(end), end + 1)
+            expected = _get_naive_window_stats(frame, rows[in_window], earlier_bests[in_window])
+            for name in ("arrivals", "completions", "resets", "golds"):
+                if not np.array_equal(getattr(stats, name).iloc[end].to_numpy(), expected[name]):
+                    raise AssertionError(f"window {window}: {name} of window ending at row {end} differ")
+            for quantile in _CHECKED_QUANTILES:
+                found = stats.quantiles[quantile].iloc[end].to_numpy().astype("timedelta64[ns]")
+                found = np.where(np.isnat(found), np.nan, found.view(np.int64).astype(np.float64))
+                if not np.allclose(found, expected[quantile], rtol=0., atol=1., equal_nan=True):
+                    raise AssertionError(f"window {window}: quantile {quantile} of window ending at row {end} differ")
+
+
+CHECKS: dict[str, Callable[[BenchmarkInput], None]] = {
+    "rolling_segment_stats": _check_rolling_segment_stats,
+}
+
+
+@attrs.define(frozen=True)
+class CheckFailure:
+    name: str
+    attempt_count: int
+    segment_count: int
+    message: str
+
+
+def run_checks(
+    sizes: Iterable[tuple[int, int]] = DEFAULT_SIZES,
+    names: Iterable[str] | None = None,
+    seed: int = 0,
+) -> list[CheckFailure]:
+    """
+    Runs every check in names that exists in CHECKS, by default all of them, on a synthetic run of each size,
+    returning the checks that failed, whether on a wrong result or by raising.
+    """
+    names = list(CHECKS) if names is None else [name for name in names if name in CHECKS]
+    failures = []
+    for attempt_count, segment_count in sizes:
+        inputs = BenchmarkInput.generate(attempt_count, segment_count, seed)
+        for name in names:
+            try:
+                CHECKS[name](inputs)
+            except Exception as error:
+                failures.append(CheckFailure(name, attempt_count, segment_count, f"{type(error).__name__}: {error}"))
+    return failures
+
+
+@attrs.define(frozen=True)
+class BenchmarkResult:
+    """
+    seconds:    best wall time of the repeated runs
+    peak_bytes: peak memory allocated during one separate run, as traced by tracemalloc
+    """
+    name: str
+    attempt_count: int
+    segment_count: int
+    seconds: float
+    peak_bytes: int
+
+    @property
+    def key(self) -> tuple[str, int, int]:
+        return self.name, self.attempt_count, self.segment_count
+
+
+@attrs.define(frozen=True)
+class Regression:
+    result: BenchmarkResult
+    baseline: BenchmarkResult
+
+    @property
+    def time_ratio(self) -> float:
+        return self.result.seconds / self.baseline.seconds
+
+    @property
+    def memory_ratio(self) -> float:
+        return self.result.peak_bytes / max(self.baseline.peak_bytes, 1)
+
+
+def _measure_time(func: Callable[[], object], repeats: int) -> float:
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _measure_peak_memory(func: Callable[[], object]) -> int:
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+
+def run_benchmarks(
+    sizes: Iterable[tuple[int, int]] = DEFAULT_SIZES,
+    names: Iterable[str] | None = None,
+    repeats: int = 3,
+    seed: int = 0,
+) -> list[BenchmarkResult]:
+    """
+    Times every benchmark in names, by default all of BENCHMARKS, on a synthetic run of each
+    (attempt_count, segment_count) in sizes.
+    """
+    names = list(BENCHMARKS) if names is None else list(names)
+    results = []
+    for attempt_count, segment_count in sizes:
+        inputs = BenchmarkInput.generate(attempt_count, segment_count, seed)
+        for name in names:
+            func = BENCHMARKS[name](inputs)
+            results.append(
+                BenchmarkResult(
+                    name=name,
+                    attempt_count=attempt_count,
+                    segment_count=segment_count,
+                    seconds=_measure_time(func, repeats),
+                    peak_bytes=_measure_peak_memory(func),
+                )
+            )
+    return results
+
+
+def save_baseline(results: Iterable[BenchmarkResult], path: str | os.PathLike) -> None:
+    Path(path).write_text(json.dumps([attrs.asdict(result) for result in results], indent=2))
+
+
+def load_baseline(path: str | os.PathLike) -> list[BenchmarkResult]:
+    return [BenchmarkResult(**result) for result in json.loads(Path(path).read_text())]
+
+
+def find_regressions(
+    results: Iterable[BenchmarkResult],
+    baseline: Iterable[BenchmarkResult],
+    tolerance: float = 0.25,
+) -> list[Regression]:
+    """
+    Results that are slower, or use more memory, than their baseline by more than the given fraction.
+    Results without a baseline at the same size are ignored.
+    """
+    baseline_results = {result.key: result for result in baseline}
+    return [
+        regression
+        for result in results
+        if result.key in baseline_results
+        for regression in [Regression(result, baseline_results[result.key])]
+        if regression.time_ratio > 1 + tolerance or regression.memory_ratio > 1 + tolerance
+    ]
+
+
+def to_frame(results: Iterable[BenchmarkResult]) -> pd.DataFrame:
+    return (
+        pd.DataFrame([attrs.asdict(result) for result in results])
+        .set_index(["name", "attempt_count", "segment_count"])
+    )
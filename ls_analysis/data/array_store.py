@@ -0,0 +1,221 @@
+# -*- coding: utf-8 -*-
+"""
+Created on 2026-10-18
+
+@author: brassbeat
+"""
+import enum
+import itertools
+from enum import Enum
+from typing import Self
+
+import attrs
+import numpy as np
+import pandas as pd
+
+from ls_analysis.data.enums import AttemptStat, IndexCategory
+
+MISSING = np.iinfo(np.int64).min
+_NANOSECONDS_PER_SECOND = 10 ** 9
+_FULL_ATTEMPT_SEGMENT = -1
+
+
+class StatKind(Enum):
+    TIMEDELTA = enum.auto()
+    DATETIME = enum.auto()
+    INTEGER = enum.auto()
+
+    @classmethod
+    def of(cls, dtype) -> Self:
+        if pd.api.types.is_timedelta64_dtype(dtype):
+            return cls.TIMEDELTA
+        if pd.api.types.is_datetime64_dtype(dtype):
+            return cls.DATETIME
+        if pd.api.types.is_integer_dtype(dtype):
+            return cls.INTEGER
+        raise TypeError(f"Unsupported statistic dtype {dtype}")
+
+
+@attrs.define
+class StatArray:
+    """
+    int64 values of a single statistic, nanoseconds for times, with missing values stored as the minimum int64.
+    Holds one value per attempt, or one row per attempt and one column per segment.
+    """
+    values: np.ndarray = attrs.field()
+    kind: StatKind = attrs.field()
+
+    @classmethod
+    def from_frame(cls, data: pd.DataFrame | pd.Series) -> Self:
+        kinds = {StatKind.of(dtype) for dtype in np.atleast_1d(data.dtypes)}
+        if len(kinds) != 1:
+            raise TypeError(f"Mixed statistic dtypes {kinds}")
+        kind, = kinds
+
+        match kind:
+            case StatKind.TIMEDELTA:
+                values = data.to_numpy(dtype="timedelta64[ns]").view(np.int64)
+            case StatKind.DATETIME:
+                values = data.to_numpy(dtype="datetime64[ns]").view(np.int64)
+            case StatKind.INTEGER:
+                values = data.to_numpy(dtype=np.int64, na_value=MISSING)
+        return cls(np.ascontiguousarray(values), kind)
+
+    @property
+    def is_missing(self) -> np.ndarray:
+        return self.values == MISSING
+
+    def get_rows(self, rows: slice | np.ndarray) -> Self:
+        """
+        The values of some attempts, a view when rows is a slice, such as from AttemptStartIndex.get_rows.
+        """
+        return StatArray(self.values[rows], self.kind)
+
+    def get_columns(self, columns: slice | np.ndarray) -> Self:
+        """
+        The values of some segments, by position.
+        """
+        return StatArray(self.values[:, columns], self.kind)
+
+    def to_numpy(self) -> np.ndarray:
+        """
+        Zero-copy timedelta64[ns]/datetime64[ns] view, or a float64 copy with NaN for missing integers.
+        """
+        match self.kind:
+            case StatKind.TIMEDELTA:
+                return self.values.view("timedelta64[ns]")
+            case StatKind.DATETIME:
+                return self.values.view("datetime64[ns]")
+            case StatKind.INTEGER:
+                return np.where(self.is_missing, np.nan, self.values)
+
+    def to_pandas(self, column: int | None = None) -> np.ndarray | pd.api.extensions.ExtensionArray:
+        """
+        Values ready to become a pandas column, keeping missing integers as pd.NA.
+        """
+        values = self.values if column is None else self.values[:, column]
+        if self.kind is StatKind.INTEGER:
+            return pd.arrays.IntegerArray(values, values == MISSING)
+        return StatArray(values, self.kind).to_numpy()
+
+    def to_seconds(self) -> np.ndarray:
+        """
+        float64 seconds with NaN for missing values, without boxing into Timedeltas.
+        """
+        return np.where(self.is_missing, np.nan, self.values / _NANOSECONDS_PER_SECOND)
+
+
+@attrs.define
+class ArrayStore:
+    """
+    Compact NumPy backing of a LivesplitData frame.
+
+    attempts:       (n_attempts,) attempt ids
+    segments:       (n_segments,) segment numbers
+    attempt_stats:  statistics of whole attempts, each (n_attempts,)
+    segment_stats:  statistics per segment, each (n_attempts, n_segments)
+
+    DataFrames are only built when asked for, and share memory with the arrays where pandas allows it.
+    """
+    attempts: np.ndarray = attrs.field()
+    segments: np.ndarray = attrs.field()
+    attempt_stats: dict[AttemptStat, StatArray] = attrs.field()
+    segment_stats: dict[AttemptStat, StatArray] = attrs.field()
+
+    @classmethod
+    def from_frame(cls, data: pd.DataFrame) -> Self:
+        segment_labels = data.columns.get_level_values(IndexCategory.SEGMENT)
+        is_attempt_stat = segment_labels < 0
+        segments = np.unique(np.asarray(segment_labels[~is_attempt_stat], dtype=np.int64))
+
+        attempt_stats = {
+            statistic: StatArray.from_frame(data[statistic, _FULL_ATTEMPT_SEGMENT])
+            for statistic in data.columns[is_attempt_stat].get_level_values(IndexCategory.STATISTIC)
+        }
+        # frames only have reset_time columns for segments some attempt was reset on, so none without any resets
+        segment_stats = {
+            statistic: StatArray.from_frame(
+                data[statistic].reindex(columns=segments).astype(data[statistic].dtypes.iloc[0])
+            )
+            for statistic in data.columns[~is_attempt_stat].get_level_values(IndexCategory.STATISTIC).unique()
+        }
+        segment_stats.setdefault(
+            AttemptStat.RESET_TIME,
+            StatArray(np.full((len(data), len(segments)), MISSING), StatKind.TIMEDELTA),
+        )
+        return cls(
+            attempts=data.index.to_numpy(dtype=np.int64),
+            segments=segments,
+            attempt_stats=attempt_stats,
+            segment_stats=segment_stats,
+        )
+
+    @property
+    def _index(self) -> pd.Index:
+        return pd.Index(pd.array(self.attempts, dtype="Int64"), name=IndexCategory.ATTEMPT)
+
+    def _get_columns(self, statistics: list[AttemptStat], segments: np.ndarray) -> pd.MultiIndex:
+        return pd.MultiIndex.from_arrays(
+            [
+                np.repeat(np.array(statistics, dtype=object), len(segments)),
+                pd.array(np.tile(segments, len(statistics)), dtype="Int64"),
+            ],
+            names=[IndexCategory.STATISTIC, IndexCategory.SEGMENT],
+        )
+
+    def get_segment_frame(self, statistic: AttemptStat) -> pd.DataFrame:
+        """
+        One statistic as an attempts x segments frame, like LivesplitData.segment_data.
+        """
+        stat = self.segment_stats[statistic]
+        data = pd.DataFrame(
+            data={column: stat.to_pandas(column) for column in range(len(self.segments))},
+            index=self._index,
+            copy=False,
+        )
+        data.columns = pd.Index(pd.array(self.segments, dtype="Int64"), name=IndexCategory.SEGMENT)
+        return data
+
+    def get_full_run_frame(self) -> pd.DataFrame:
+        data = pd.DataFrame(
+            data={
+                position: stat.to_pandas()
+                for position, stat in enumerate(self.attempt_stats.values())
+            },
+            index=self._index,
+            copy=False,
+        )
+        data.columns = self._get_columns(list(self.attempt_stats), np.array([_FULL_ATTEMPT_SEGMENT]))
+        return data
+
+    def get_segment_stats_frame(self) -> pd.DataFrame:
+        data = pd.DataFrame(
+            data={
+                position: stat.to_pandas(column)
+                for position, (stat, column) in enumerate(
+                    itertools.product(self.segment_stats.values(), range(len(self.segments)))
+                )
+            },
+            index=self._index,
+            copy=False,
+        )
+        data.columns = self._get_columns(list(self.segment_stats), self.segments)
+        return data
+
+    def to_frame(self) -> pd.DataFrame:
+        return pd.concat(
+            [
+                self.get_full_run_frame(),
+                self.get_segment_stats_frame(),
+            ],
+            axis=1,
+        )
+
+    @property
+    def nbytes(self) -> int:
+        return (
+            self.attempts.nbytes
+            + self.segments.nbytes
+            + sum(stat.values.nbytes for stat in self.attempt_stats.values())
+            + sum(stat.values.nbytes for stat in self.segment_stats.values())
+        )
@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+"""
+Created on 2026-10-18
+
+@author: brassbeat
+"""
+from typing import Self
+
+import attrs
+import numpy as np
+import pandas as pd
+
+from ls_analysis.data.array_store import ArrayStore
+from ls_analysis.data.enums import AttemptStat
+
+
+@attrs.define(frozen=True)
+class AttemptStartIndex:
+    """
+    Start times of the attempts of a dataset in sorted order, so the attempts started in a date range
+    are found with a binary search instead of comparing every start time.
+    Attempts without a start time are never selected.
+
+    starts:         (n_started,) start times of the attempts that have one, sorted, int64 ns
+    rows:           (n_started,) row of the attempt of each start time, ties in row order
+    is_contiguous:  whether the attempts with a start time are consecutive rows already sorted by it,
+                    so every range of start times is a slice of rows
+    """
+    starts: np.ndarray = attrs.field()
+    rows: np.ndarray = attrs.field()
+    is_contiguous: bool = attrs.field()
+
+    @classmethod
+    def from_store(cls, store: ArrayStore) -> Self:
+        start_stat = store.attempt_stats[AttemptStat.START_OF_ATTEMPT]
+        rows = np.flatnonzero(~start_stat.is_missing)
+        rows = rows[np.argsort(start_stat.values[rows], kind="stable")]
+        starts = start_stat.values[rows]
+
+        for array in (starts, rows):
+            array.flags.writeable = False
+
+        return cls(
+            starts=starts,
+            rows=rows,
+            is_contiguous=len(rows) == 0 or bool(np.all(np.diff(rows) == 1)),
+        )
+
+    def get_positions(self, cutoffs: np.ndarray | pd.DatetimeIndex) -> np.ndarray:
+        """
+        Number of attempts with a start time before each cutoff, in the order of starts.
+        """
+        cutoffs = pd.DatetimeIndex(cutoffs).as_unit("ns").asi8
+        return self.starts.searchsorted(cutoffs, side="left")
+
+    def get_rows(self, start: pd.Timestamp | None = None, end: pd.Timestamp | None = None) -> slice | np.ndarray:
+        """
+        Rows of the attempts started at or after start and before end, in row order.
+        This is a slice when the index is contiguous, so indexing arrays with it gives views rather than copies.
+        """
+        low = 0 if start is None else self.starts.searchsorted(pd.Timestamp(start).value, side="left")
+        high = len(self.starts) if end is None else self.starts.searchsorted(pd.Timestamp(end).value, side="left")
+        high = max(low, high)
+
+        if self.is_contiguous:
+            first = self.rows[0] if len(self.rows) else 0
+            return slice(first + low, first + high)
+        return np.sort(self.rows[low:high])
+
+    def get_sums_since(self, values: np.ndarray, cutoffs: np.ndarray | pd.DatetimeIndex) -> np.ndarray:
+        """
+        Sums of an (n_attempts, ...) array over the attempts started at or after each cutoff, in one sweep,
+        giving an (n_cutoffs, ...) array. Rows without a start time are left out.
+        """
+        sorted_values = np.asarray(values)[self.rows]
+        sums_since = np.zeros((len(self.rows) + 1, *sorted_values.shape[1:]), dtype=np.result_type(sorted_values, 0))
+        np.cumsum(sorted_values[::-1], axis=0, out=sums_since[-2::-1])
+        return sums_since[self.get_positions(cutoffs)]
@@ -0,0 +1,139 @@
+# -*- coding: utf-8 -*-
+"""
+Created on 2026-10-18
+
+@author: brassbeat
+"""
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from typing import TextIO
+
+import numpy as np
+import pandas as pd
+
+from ls_analysis.data.enums import AttemptStat
+
+# bump whenever the layout of imported data changes, so stale caches are ignored
+_CACHE_VERSION = 1
+_CHUNK_SIZE = 1 << 20
+
+_VALUES_FILE = "values.npy"
+_INDEX_FILE = "index.npy"
+_LAYOUT_FILE = "layout.json"
+
+_MISSING = np.iinfo(np.int64).min
+_NULLABLE_INTEGER = "Int64"
+_PLAIN_DTYPES = {"datetime64[ns]", "timedelta64[ns]", "int64", "float64"}
+
+
+def hash_lss(f: TextIO) -> str:
+    """
+    Hashes the remaining contents of f and rewinds it to where it started.
+    """
+    start = f.tell()
+    digest = hashlib.sha256()
+    while chunk := f.read(_CHUNK_SIZE):
+        digest.update(chunk.encode("utf-8"))
+    f.seek(start)
+    return digest.hexdigest()
+
+
+def get_cache_path(cache_dir: str | os.PathLike, digest: str, timing_method: str) -> Path:
+    return Path(cache_dir) / f"{digest}-{timing_method}-v{_CACHE_VERSION}"
+
+
+def _encode_column(column: pd.Series) -> np.ndarray:
+    dtype = str(column.dtype)
+    if dtype == _NULLABLE_INTEGER:
+        return column.to_numpy(dtype=np.int64, na_value=_MISSING)
+    if dtype in _PLAIN_DTYPES:
+        return column.to_numpy().view(np.int64)
+    raise TypeError(f"Cannot cache column {column.name} of dtype {dtype}")
+
+
+def _decode_column(values: np.ndarray, dtype: str) -> np.ndarray | pd.api.extensions.ExtensionArray:
+    if dtype == _NULLABLE_INTEGER:
+        return pd.arrays.IntegerArray(values.copy(), values == _MISSING)
+    return values.view(dtype)
+
+
+def _encode_label(label) -> str | int:
+    return int(label) if isinstance(label, (int, np.integer)) else str(label)
+
+
+def _decode_statistic(label: str) -> AttemptStat | str:
+    try:
+        return AttemptStat(label)
+    except ValueError:
+        return label
+
+
+def write_cache(data: pd.DataFrame, path: str | os.PathLike) -> None:
+    """
+    Stores data as one column-major int64 matrix plus a small json layout, so it can be memory-mapped back.
+    The directory is written next to its destination and moved into place, so readers never see partial caches.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    values = np.empty((len(data.index), len(data.columns)), dtype=np.int64, order="F")
+    for position in range(len(data.columns)):
+        values[:, position] = _encode_column(data.iloc[:, position])
+
+    layout = {
+        "index_name": data.index.name,
+        "index_dtype": str(data.index.dtype),
+        "column_names": list(data.columns.names),
+        "segment_dtype": str(data.columns.levels[1].dtype),
+        "columns": [[_encode_label(label) for label in column] for column in data.columns],
+        "dtypes": [str(dtype) for dtype in data.dtypes],
+    }
+
+    staging = Path(tempfile.mkdtemp(dir=path.parent, prefix=f".{path.name}-"))
+    try:
+        np.save(staging / _VALUES_FILE, values)
+        np.save(staging / _INDEX_FILE, _encode_column(data.index.to_series()))
+        (staging / _LAYOUT_FILE).write_text(json.dumps(layout))
+        os.replace(staging, path)
+    except OSError:
+        shutil.rmtree(staging, ignore_errors=True)
+        if not path.exists():
+            raise
+
+
+def read_cache(path: str | os.PathLike) -> pd.DataFrame:
+    """
+    Loads a frame stored by write_cache. Columns are copy-on-write memory maps of the cached matrix,
+    except for nullable integer columns, which need their own mask.
+    """
+    path = Path(path)
+    layout = json.loads((path / _LAYOUT_FILE).read_text())
+    values = np.load(path / _VALUES_FILE, mmap_mode="c")
+    index_values = np.load(path / _INDEX_FILE)
+
+    columns = pd.MultiIndex.from_arrays(
+        [
+            [_decode_statistic(statistic) for statistic, _ in layout["columns"]],
+            pd.array([segment for _, segment in layout["columns"]], dtype=layout["segment_dtype"]),
+        ],
+        names=layout["column_names"],
+    )
+    index = pd.Index(
+        _decode_column(index_values, layout["index_dtype"]),
+        name=layout["index_name"],
+    )
+
+    data = pd.DataFrame(
+        data={
+            position: _decode_column(values[:, position], dtype)
+            for position, dtype in enumerate(layout["dtypes"])
+        },
+        index=index,
+        copy=False,
+    )
+    data.columns = columns
+    return data
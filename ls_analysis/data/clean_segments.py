@@ -1,9 +1,7 @@
 import pandas as pd
 
-from ls_analysis.data.enums import AttemptStat
 
-
-def _pad_segment_data(segment_data: pd.DataFrame, attempt_data: pd.DataFrame) -> pd.DataFrame:
+def pad_segment_data(segment_data: pd.DataFrame, attempt_data: pd.DataFrame) -> pd.DataFrame:
     return (
         segment_data
 
@@ -15,30 +13,3 @@ def _pad_segment_data(segment_data: pd.DataFrame, attempt_data: pd.DataFrame) ->
             ),
         )
     )
-
-
-def _delete_merged_splits(segment_data: pd.DataFrame) -> pd.DataFrame:
-    segment_data[AttemptStat.SEGMENT_TIME] = (
-        segment_data[AttemptStat.SEGMENT_TIME]
-        .mask(
-            (
-                segment_data[AttemptStat.SEGMENT_TIME]
-                .isna()
-                .shift(
-                    periods=1,
-                    axis="columns",
-                    fill_value=False
-                )
-            ),
-            pd.NaT
-        )
-    )
-    return segment_data
-
-
-def clean_up_segments(attempt_data: pd.DataFrame, segment_data: pd.DataFrame) -> pd.DataFrame:
-    return (
-        segment_data
-        .pipe(_pad_segment_data, attempt_data)
-        .pipe(_delete_merged_splits)
-    )
@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+"""
+Created on 2026-10-18
+
+@author: brassbeat
+"""
+import os
+from collections.abc import Iterable
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Literal, Self
+
+import attrs
+import pandas as pd
+
+from ls_analysis.data.enums import IndexCategory
+from ls_analysis.data.livesplit_data import LivesplitData
+
+
+def _import_file(
+    path: Path,
+    timing_method: Literal["RealTime", "GameTime"],
+    cache_dir: str | os.PathLike | None,
+) -> pd.DataFrame:
+    with open(path, encoding="utf-8") as f:
+        return LivesplitData.from_lss(f, timing_method, cache_dir).data
+
+
+def _get_runner_key(path: Path, directory: Path) -> str:
+    return path.relative_to(directory).with_suffix("").as_posix()
+
+
+def _get_runner_keys(paths: list[Path]) -> dict[str, Path]:
+    if not paths:
+        return {}
+    directory = Path(os.path.commonpath([path.resolve().parent for path in paths]))
+    keys = {}
+    for path in paths:
+        key = _get_runner_key(path.resolve(), directory)
+        if key in keys:
+            raise ValueError(f"{path} and {keys[key]} would both be imported as runner {key!r}")
+        keys[key] = path
+    return keys
+
+
+@attrs.define
+class LivesplitCorpus:
+    """
+    Splits files of many runners of the same game and category.
+
+    runs: imported data per runner key, the path of the file relative to the imported directory without suffix
+    failures: the error raised for every file that could not be imported
+    """
+    runs: dict[str, LivesplitData] = attrs.field(factory=dict)
+    failures: dict[str, BaseException] = attrs.field(factory=dict)
+
+    @classmethod
+    def from_directory(
+        cls,
+        directory: str | os.PathLike,
+        timing_method: Literal["RealTime", "GameTime"] = "RealTime",
+        pattern: str = "**/*.lss",
+        max_workers: int | None = None,
+        cache_dir: str | os.PathLike | None = None,
+    ) -> Self:
+        directory = Path(directory)
+        paths = {
+            _get_runner_key(path, directory): path
+            for path in sorted(directory.glob(pattern))
+        }
+        return cls.from_files(paths, timing_method, max_workers, cache_dir)
+
+    @classmethod
+    def from_files(
+        cls,
+        paths: dict[str, str | os.PathLike] | Iterable[str | os.PathLike],
+        timing_method: Literal["RealTime", "GameTime"] = "RealTime",
+        max_workers: int | None = None,
+        cache_dir: str | os.PathLike | None = None,
+    ) -> Self:
+        """
+        Imports every file in its own worker process. A file that fails to import is recorded in failures
+        and does not affect the others.
+        Without a mapping of runner keys, files are keyed like from_directory does,
+        relative to the deepest directory containing all of them.
+        """
+        if not isinstance(paths, dict):
+            paths = _get_runner_keys([Path(path) for path in paths])
+
+        corpus = cls()
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                executor.submit(_import_file, Path(path), timing_method, cache_dir): key
+                for key, path in paths.items()
+            }
+            for future in as_completed(futures):
+                key = futures[future]
+                try:
+                    corpus.runs[key] = LivesplitData(future.result())
+                except Exception as e:
+                    corpus.failures[key] = e
+
+        # keep the order in which the files were given
+        corpus.runs = {key: corpus.runs[key] for key in paths if key in corpus.runs}
+        return corpus
+
+    @property
+    def data(self) -> pd.DataFrame:
+        """
+        All runs in one frame, with the runner key as an extra outer index level.
+        """
+        return pd.concat(
+            {key: run.data for key, run in self.runs.items()},
+            names=[IndexCategory.RUNNER],
+        )
+
+    def __len__(self) -> int:
+        return len(self.runs)
+
+    def __getitem__(self, key: str) -> LivesplitData:
+        return self.runs[key]
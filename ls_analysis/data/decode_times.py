@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+"""
+Created on 2026-10-18
+
+@author: brassbeat
+"""
+import re
+
+import numpy as np
+import pandas as pd
+
+# LiveSplit writes TimeSpans in the .NET "c" format, [-][d.]hh:mm:ss[.fffffff],
+# and timestamps as MM/dd/yyyy HH:mm:ss
+_TIMESPAN_PATTERN = re.compile(
+    r"(?P<sign>-)?(?:(?P<days>\d+)\.)?(?P<hours>\d+):(?P<minutes>\d+):(?P<seconds>\d+)(?:\.(?P<fraction>\d+))?"
+)
+_SHORT_TIMESPAN_LENGTH = len("hh:mm:ss")
+_FULL_TIMESPAN_LENGTH = len("hh:mm:ss.fffffff")
+_DATETIME_LENGTH = len("MM/dd/yyyy HH:mm:ss")
+
+_NANOSECONDS_PER_SECOND = 10 ** 9
+_NANOSECONDS_PER_TICK = 100
+
+
+def _to_byte_matrix(values: np.ndarray, width: int) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Encodes an object array of strings (or None) as a (len(values), width) matrix of ascii digits,
+    together with the length of each string. Missing values have length 0.
+    """
+    raw = np.where(pd.isna(values), "", values).astype(f"S{width}")
+    lengths = np.char.str_len(raw)
+    digits = raw.view(np.uint8).reshape(len(raw), width).astype(np.int64) - ord("0")
+    return digits, lengths
+
+
+def _pair(digits: np.ndarray, position: int) -> np.ndarray:
+    return digits[:, position] * 10 + digits[:, position + 1]
+
+
+def _parse_timespan(value: str) -> int:
+    match = _TIMESPAN_PATTERN.fullmatch(value)
+    if match is None:
+        raise ValueError(f"Invalid LiveSplit time: {value!r}")
+
+    fraction = (match["fraction"] or "").ljust(9, "0")[:9]
+    nanoseconds = (
+        (
+            int(match["days"] or 0) * 86_400
+            + int(match["hours"]) * 3_600
+            + int(match["minutes"]) * 60
+            + int(match["seconds"])
+        ) * _NANOSECONDS_PER_SECOND
+        + int(fraction)
+    )
+    return -nanoseconds if match["sign"] else nanoseconds
+
+
+def decode_timespans(values: np.ndarray) -> np.ndarray:
+    """
+    Converts an object array of LiveSplit time strings to timedelta64[ns] in bulk. Missing values become NaT.
+
+    The common hh:mm:ss.fffffff and hh:mm:ss layouts are decoded digit by digit on the whole array at once;
+    only strings with a day or sign prefix fall back to a regular expression.
+    """
+    if len(values) == 0:
+        return np.empty(0, dtype="timedelta64[ns]")
+
+    digits, lengths = _to_byte_matrix(values, _FULL_TIMESPAN_LENGTH)
+    has_layout = (digits[:, 2] == ord(":") - ord("0")) & (digits[:, 5] == ord(":") - ord("0"))
+    is_full = has_layout & (lengths == _FULL_TIMESPAN_LENGTH) & (digits[:, 8] == ord(".") - ord("0"))
+    is_short = has_layout & (lengths == _SHORT_TIMESPAN_LENGTH)
+
+    seconds = _pair(digits, 0) * 3_600 + _pair(digits, 3) * 60 + _pair(digits, 6)
+    ticks = (digits[:, 9:16] * (10 ** np.arange(6, -1, -1))).sum(axis=1)
+    nanoseconds = np.where(
+        is_full,
+        seconds * _NANOSECONDS_PER_SECOND + ticks * _NANOSECONDS_PER_TICK,
+        seconds * _NANOSECONDS_PER_SECOND,
+    )
+
+    result = np.where(is_full | is_short, nanoseconds, np.iinfo(np.int64).min)
+    is_other = ~(is_full | is_short) & (lengths > 0)
+    # lengths are truncated to the matrix width, so re-read the original strings
+    for index in np.flatnonzero(is_other):
+        result[index] = _parse_timespan(values[index])
+
+    return result.view("timedelta64[ns]")
+
+
+def decode_datetimes(values: np.ndarray) -> np.ndarray:
+    """
+    Converts an object array of MM/dd/yyyy HH:mm:ss strings to datetime64[ns] in bulk. Missing values become NaT.
+    """
+    if len(values) == 0:
+        return np.empty(0, dtype="datetime64[ns]")
+
+    digits, lengths = _to_byte_matrix(values, _DATETIME_LENGTH)
+    is_missing = lengths == 0
+    if not np.all(is_missing | (lengths == _DATETIME_LENGTH)):
+        # not the layout we expected, let pandas work it out
+        return pd.to_datetime(values).to_numpy(dtype="datetime64[ns]")
+
+    months = _pair(digits, 0)
+    days = _pair(digits, 3)
+    years = _pair(digits, 6) * 100 + _pair(digits, 8)
+    seconds = _pair(digits, 11) * 3_600 + _pair(digits, 14) * 60 + _pair(digits, 17)
+
+    dates = (
+        ((years - 1970) * 12 + months - 1).astype("datetime64[M]").astype("datetime64[D]")
+        + (days - 1).astype("timedelta64[D]")
+    )
+    result = dates.astype("datetime64[ns]") + (seconds * _NANOSECONDS_PER_SECOND).astype("timedelta64[ns]")
+    result[is_missing] = np.datetime64("NaT")
+    return result
@@ -3,6 +3,7 @@ from enum import StrEnum
 
 
 class IndexCategory(StrEnum):
+    RUNNER = enum.auto()
     ATTEMPT = enum.auto()
     SEGMENT = enum.auto()
     STATISTIC = enum.auto()
@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+"""
+Created on 2026-10-18
+
+@author: brassbeat
+"""
+import attrs
+import numpy as np
+import pandas as pd
+
+from ls_analysis.data.array_store import MISSING
+from ls_analysis.data.enums import AttemptStat, IndexCategory
+
+
+@attrs.define
+class DerivedStats:
+    """
+    segment_times:      segment times, without the merged times following a skipped split
+    reset_at:           segment each attempt was reset on, one past its last split with a time,
+                        NA for attempts that reached the last split
+    time_upon_reset:    time between the last split and the end of unfinished attempts
+    reset_times:        the same time, in the column of the segment the attempt was reset on,
+                        with columns only for the segments some attempt was reset on
+    """
+    segment_times: pd.DataFrame = attrs.field()
+    reset_at: pd.Series = attrs.field()
+    time_upon_reset: pd.Series = attrs.field()
+    reset_times: pd.DataFrame = attrs.field()
+
+
+def _to_nanoseconds(data: pd.DataFrame | pd.Series) -> np.ndarray:
+    return data.to_numpy(dtype="timedelta64[ns]").view(np.int64)
+
+
+def _from_nanoseconds(values: np.ndarray) -> np.ndarray:
+    return values.view("timedelta64[ns]")
+
+
+def _remove_merged_segments(segment_times: np.ndarray) -> np.ndarray:
+    # the segment after a skipped split holds the time of both segments
+    follows_skip = np.zeros(segment_times.shape, dtype=bool)
+    follows_skip[:, 1:] = segment_times[:, :-1] == MISSING
+    return np.where(follows_skip, MISSING, segment_times)
+
+
+def get_clean_segment_times(segment_times: pd.DataFrame) -> pd.DataFrame:
+    """
+    Removes the times of segments following a skipped split from an attempts x segments frame.
+    """
+    return pd.DataFrame(
+        data=_from_nanoseconds(_remove_merged_segments(_to_nanoseconds(segment_times))),
+        index=segment_times.index,
+        columns=segment_times.columns,
+    )
+
+
+def get_derived_stats(attempt_data: pd.DataFrame, segment_data: pd.DataFrame) -> DerivedStats:
+    """
+    Computes all statistics derived from the split times in one pass over the attempts x segments arrays.
+
+    attempt_data needs the attempt_time and run_time columns,
+    segment_data the segment_time and split_time columns for every attempt in attempt_data.
+    """
+    index = segment_data.index
+    segment_columns = segment_data[AttemptStat.SEGMENT_TIME].columns
+    segment_count = len(segment_columns)
+
+    segment_times = _to_nanoseconds(segment_data[AttemptStat.SEGMENT_TIME])
+    split_times = _to_nanoseconds(segment_data[AttemptStat.SPLIT_TIME])
+    attempt_times = _to_nanoseconds(attempt_data[AttemptStat.ATTEMPT_TIME].reindex(index))
+    is_finished = attempt_data[AttemptStat.RUN_TIME].reindex(index).notna().to_numpy()
+
+    has_split = split_times != MISSING
+    has_attempt_time = attempt_times != MISSING
+
+    # number of splits up to and including the last one with a time
+    last_splits = np.where(
+        has_split.any(axis=1),
+        segment_count - np.argmax(has_split[:, ::-1], axis=1),
+        0,
+    )
+    is_reset = last_splits < segment_count
+    reset_at = pd.array(
+        np.where(is_reset, last_splits + 1, 0),
+        dtype="Int64",
+    )
+    reset_at[~is_reset] = pd.NA
+
+    latest_split_times = np.where(has_split, split_times, 0).max(axis=1, initial=0)
+    time_upon_reset = np.where(
+        ~is_finished & has_attempt_time,
+        attempt_times - latest_split_times,
+        MISSING,
+    )
+
+    # the reset segment started at the last split, so its time is the rest of the attempt
+    rows = np.flatnonzero(is_reset & has_attempt_time)
+    last_split_times = np.where(
+        last_splits[rows] > 0,
+        split_times[rows, np.maximum(last_splits[rows] - 1, 0)],
+        0,
+    )
+    reset_times = np.full_like(split_times, MISSING)
+    reset_times[rows, last_splits[rows]] = attempt_times[rows] - last_split_times
+    reset_positions = np.unique(last_splits[is_reset])
+
+    return DerivedStats(
+        segment_times=pd.DataFrame(
+            data=_from_nanoseconds(_remove_merged_segments(segment_times)),
+            index=index,
+            columns=segment_columns,
+        ),
+        reset_at=pd.Series(reset_at, index=index),
+        time_upon_reset=pd.Series(_from_nanoseconds(time_upon_reset), index=index),
+        reset_times=pd.DataFrame(
+            data=_from_nanoseconds(reset_times[:, reset_positions]),
+            index=index,
+            columns=pd.MultiIndex.from_product(
+                [[AttemptStat.RESET_TIME], segment_columns[reset_positions]],
+                names=[IndexCategory.STATISTIC, IndexCategory.SEGMENT],
+            ),
+        ),
+    )
@@ -4,19 +4,18 @@ Created on 2023/07/24
 
 @author: brassbeat
 """
-from io import StringIO
-
 import pandas as pd
 
 from typing import TextIO, Literal
 
-from ls_analysis.data.clean_segments import clean_up_segments
+from ls_analysis.data.clean_segments import pad_segment_data
 from ls_analysis.data.enums import AttemptStat, IndexCategory
-from ls_analysis.data.extra_data.reset_on import get_segment_reset_on
-from ls_analysis.data.extra_data.time_on_reset import get_time_on_reset, add_reset_time_to_segment_data
+from ls_analysis.data.extra_data.derived_stats import DerivedStats, get_clean_segment_times, get_derived_stats
+from ls_analysis.data.decode_times import decode_datetimes, decode_timespans
+from ls_analysis.data.read_lss import LssRecords, TIMING_METHODS, read_lss_records
 
 
-def _read_segments(f: TextIO, timing_method: Literal["RealTime", "GameTime"] = "RealTime") -> pd.DataFrame:
+def _read_segments(records: LssRecords, timing_method: Literal["RealTime", "GameTime"] = "RealTime") -> pd.DataFrame:
     r"""
     Returned dataframe index:
     "attempt" Livesplit attempt id
@@ -28,25 +27,11 @@ def _read_segments(f: TextIO, timing_method: Literal["RealTime", "GameTime"] = "
     """
     # get (id, segment time) pairs
     # skipped segments will still be there as NaTs
-    # noinspection PyTypeChecker
-    long_data = (
-            pd.read_xml(
-                    f,
-                    xpath=".//Time",
-                    converters={
-                            "id": int,
-                            "RealTime": pd.to_timedelta,
-                            "GameTime": pd.to_timedelta,
-                    },
-                    parser="etree",
-            )
-            .loc[:, ["id", timing_method]]
-            .rename(
-                columns={
-                    timing_method: AttemptStat.SEGMENT_TIME,
-                    "id": IndexCategory.ATTEMPT
-                }
-            )
+    long_data = pd.DataFrame(
+        data={
+            IndexCategory.ATTEMPT: records.segment_ids,
+            AttemptStat.SEGMENT_TIME: decode_timespans(records.segment_times[timing_method]),
+        }
     )
 
     # get split times and segment ids
@@ -85,7 +70,7 @@ def _read_segments(f: TextIO, timing_method: Literal["RealTime", "GameTime"] = "
     return wide_data
 
 
-def _read_attempts(f: TextIO, timing_method: Literal["RealTime", "GameTime"] = "RealTime") -> pd.DataFrame:
+def _read_attempts(records: LssRecords, timing_method: Literal["RealTime", "GameTime"] = "RealTime") -> pd.DataFrame:
     """
     Returned dataframe index:
     "id" Livesplit attempt id
@@ -96,30 +81,13 @@ def _read_attempts(f: TextIO, timing_method: Literal["RealTime", "GameTime"] = "
     ("attempt_time", None)
     ("CumulativePlaytime", None)
     """
-    # noinspection PyTypeChecker
-    data: pd.DataFrame = (
-        pd.read_xml(
-            f,
-            xpath=".//Attempt",
-            converters={
-                    "id":       int,
-                    "started":  pd.to_datetime,
-                    "ended":    pd.to_datetime,
-                    "RealTime": pd.to_timedelta,
-                    "GameTime": pd.to_timedelta,
-            },
-            parser="etree",
-        )
-        .drop(columns=["isStartedSynced", "isEndedSynced", "PauseTime"], errors="ignore")
-        .rename(
-            columns={
-                "id": IndexCategory.ATTEMPT,
-                timing_method: AttemptStat.RUN_TIME,
-                "started": AttemptStat.START_OF_ATTEMPT,
-                "ended": AttemptStat.END_OF_ATTEMPT,
-            }
-        )
-        .set_index(IndexCategory.ATTEMPT)
+    data = pd.DataFrame(
+        data={
+            AttemptStat.START_OF_ATTEMPT: decode_datetimes(records.attempt_started),
+            AttemptStat.END_OF_ATTEMPT: decode_datetimes(records.attempt_ended),
+            AttemptStat.RUN_TIME: decode_timespans(records.attempt_times[timing_method]),
+        },
+        index=pd.Index(records.attempt_ids, name=IndexCategory.ATTEMPT),
     )
     data[AttemptStat.ATTEMPT_TIME] = (
         data[AttemptStat.END_OF_ATTEMPT]
@@ -137,13 +105,25 @@ def _read_attempts(f: TextIO, timing_method: Literal["RealTime", "GameTime"] = "
     )
 
 
-def _add_extra_attempt_stats(attempt_data: pd.DataFrame, segment_data: pd.DataFrame) -> pd.DataFrame:
-    attempt_data[AttemptStat.RESET_AT] = get_segment_reset_on(attempt_data, segment_data)
-    attempt_data[AttemptStat.TIME_UPON_RESET] = get_time_on_reset(attempt_data, segment_data)
+def _add_extra_attempt_stats(attempt_data: pd.DataFrame, derived_stats: DerivedStats) -> pd.DataFrame:
+    attempt_data[AttemptStat.RESET_AT] = derived_stats.reset_at
+    attempt_data[AttemptStat.TIME_UPON_RESET] = derived_stats.time_upon_reset
 
     return attempt_data
 
 
+def _add_extra_segment_stats(segment_data: pd.DataFrame, derived_stats: DerivedStats) -> pd.DataFrame:
+    segment_data[AttemptStat.SEGMENT_TIME] = derived_stats.segment_times
+
+    return pd.concat(
+        [
+            segment_data,
+            derived_stats.reset_times,
+        ],
+        axis=1
+    )
+
+
 def _join_livesplit_data(attempt_data: pd.DataFrame, segment_data: pd.DataFrame) -> pd.DataFrame:
 
     attempt_data = (
@@ -169,8 +149,8 @@ def remake_livesplit_data(attempt_data: pd.DataFrame, segment_data: pd.DataFrame
         attempt_data
         .loc[:, AttemptStat.imported_attempt_stats]
         .droplevel(IndexCategory.SEGMENT, axis="columns")
-        .pipe(_add_extra_attempt_stats, segment_data)
     )
+    attempt_data = _add_extra_attempt_stats(attempt_data, get_derived_stats(attempt_data, segment_data))
 
     return _join_livesplit_data(attempt_data, segment_data)
 
@@ -203,21 +183,129 @@ def import_lss(f: TextIO, timing_method: Literal["RealTime", "GameTime"] = "Real
         Layer 'segment': either integer corresponding to segment index or NaN for columns relating
                 to the whole attempt
     """
-    raw_xml = f.read()
-    xml_start = raw_xml.index("<")
-    stream1 = StringIO(raw_xml[xml_start:])
-    stream2 = StringIO(raw_xml[xml_start:])
+    records = read_lss_records(f, timing_methods=(timing_method,))
 
-    segment_data = _read_segments(stream2, timing_method)
-    attempt_data = _read_attempts(stream1, timing_method)
+    segment_data = _read_segments(records, timing_method)
+    attempt_data = _read_attempts(records, timing_method)
 
-    segment_data = clean_up_segments(attempt_data, segment_data)
-    attempt_data = _add_extra_attempt_stats(attempt_data, segment_data)
-    segment_data = add_reset_time_to_segment_data(segment_data, attempt_data)
+    segment_data = pad_segment_data(segment_data, attempt_data)
+    derived_stats = get_derived_stats(attempt_data, segment_data)
+    attempt_data = _add_extra_attempt_stats(attempt_data, derived_stats)
+    segment_data = _add_extra_segment_stats(segment_data, derived_stats)
 
     return _join_livesplit_data(attempt_data, segment_data)
 
 
+def import_lss_timing_methods(
+    f: TextIO,
+    reset_timing_method: Literal["RealTime", "GameTime"] = "RealTime",
+) -> dict[str, pd.DataFrame]:
+    """
+    Imports f once for both timing methods, returning a frame like import_lss's for each.
+
+    Only run_time, segment_time and split_time differ between the frames. The attempt index and all other
+    statistics are shared, with the reset statistics derived from the splits of reset_timing_method.
+    """
+    records = read_lss_records(f, timing_methods=TIMING_METHODS)
+
+    attempt_data = _read_attempts(records, reset_timing_method)
+    segment_data = pad_segment_data(_read_segments(records, reset_timing_method), attempt_data)
+    derived_stats = get_derived_stats(attempt_data, segment_data)
+    attempt_data = _add_extra_attempt_stats(attempt_data, derived_stats)
+
+    data = {}
+    for timing_method in TIMING_METHODS:
+        if timing_method == reset_timing_method:
+            method_segment_data = segment_data
+        else:
+            method_segment_data = (
+                _read_segments(records, timing_method)
+                .reindex(index=segment_data.index, columns=segment_data.columns)
+                .astype(segment_data.dtypes)
+            )
+
+        method_attempt_data = attempt_data.assign(
+            **{AttemptStat.RUN_TIME: decode_timespans(records.attempt_times[timing_method])}
+        )
+        method_segment_data = method_segment_data.copy()
+        method_segment_data[AttemptStat.SEGMENT_TIME] = get_clean_segment_times(
+            method_segment_data[AttemptStat.SEGMENT_TIME]
+        )
+        method_segment_data = pd.concat(
+            [
+                method_segment_data,
+                derived_stats.reset_times,
+            ],
+            axis=1
+        )
+        data[timing_method] = _join_livesplit_data(method_attempt_data, method_segment_data)
+
+    return data
+
+
+def _continue_cumulative_playtime(previous_attempt_times: pd.Series, attempt_times: pd.Series) -> pd.Series:
+    # same as the cumsum in _read_attempts, picking up where previous_attempt_times left off
+    running_times = (
+        pd.concat([previous_attempt_times.tail(1), attempt_times])
+        .cumsum()
+        .add(previous_attempt_times.iloc[:-1].sum())
+    )
+    return (
+        running_times
+        .shift()
+        .iloc[1:]
+    )
+
+
+def update_livesplit_data(
+    data: pd.DataFrame,
+    f: TextIO,
+    timing_method: Literal["RealTime", "GameTime"] = "RealTime",
+) -> pd.DataFrame:
+    """
+    Appends the attempts of f that are newer than the last attempt in data,
+    which is assumed to have been imported from an earlier version of the same file.
+    Only records of the new attempts are decoded, and derived statistics are computed for the new rows alone.
+
+    Falls back to a full import when the file has segments that data does not know about.
+    """
+    start = f.tell()
+    records = read_lss_records(f, timing_methods=(timing_method,), min_attempt_id=data.index.max())
+    if len(records.attempt_ids) == 0:
+        return data
+
+    segment_columns = data.loc[:, [AttemptStat.SEGMENT_TIME, AttemptStat.SPLIT_TIME]].columns
+    segment_data = _read_segments(records, timing_method)
+    if not segment_data.columns.isin(segment_columns).all():
+        f.seek(start)
+        return import_lss(f, timing_method)
+
+    attempt_data = _read_attempts(records, timing_method)
+    attempt_data[AttemptStat.CUMULATIVE_PLAYTIME] = _continue_cumulative_playtime(
+        data[AttemptStat.ATTEMPT_TIME, -1],
+        attempt_data[AttemptStat.ATTEMPT_TIME],
+    )
+
+    segment_data = pad_segment_data(
+        segment_data
+        .reindex(columns=segment_columns)
+        .astype(data.dtypes[segment_columns]),
+        attempt_data,
+    )
+    derived_stats = get_derived_stats(attempt_data, segment_data)
+    attempt_data = _add_extra_attempt_stats(attempt_data, derived_stats)
+    segment_data = _add_extra_segment_stats(segment_data, derived_stats)
+
+    new_data = _join_livesplit_data(attempt_data, segment_data)
+    # new attempts can be reset on a segment no earlier attempt was reset on, which adds its reset_time column
+    new_data = (
+        new_data
+        .reindex(columns=data.columns.append(new_data.columns.difference(data.columns, sort=False)))
+        .astype(data.dtypes.to_dict())
+    )
+    return pd.concat([data, new_data], axis=0)
+
+
 def main():
     pass
 
@@ -3,13 +3,19 @@ Created on 2024-05-25
 
 @author: brassbeat
 """
+import os
 from typing import TextIO, Literal, Self
 
 import attrs
+import numpy as np
 import pandas as pd
 
+from ls_analysis.data.array_store import ArrayStore
+from ls_analysis.data.attempt_starts import AttemptStartIndex
+from ls_analysis.data.cache import get_cache_path, hash_lss, read_cache, write_cache
 from ls_analysis.data.enums import AttemptStat, IndexCategory
-from ls_analysis.data.import_lss import import_lss
+from ls_analysis.data.import_lss import import_lss, update_livesplit_data
+from ls_analysis.data.sorted_segments import SortedSegmentTable
 
 
 @attrs.define
@@ -40,19 +46,105 @@ class LivesplitData:
 
         Layer 'segment': either integer corresponding to segment index or NaN for columns relating
                 to the whole attempt
+
+    The data is held either as that dataframe, or as a compact ArrayStore (see from_lss's storage argument),
+    in which case the dataframe is only built when data is first accessed.
     """
-    data: pd.DataFrame = attrs.field()
+    _data: pd.DataFrame | None = attrs.field(default=None)
+    _store: ArrayStore | None = attrs.field(default=None, kw_only=True)
+    _sorted_segments: SortedSegmentTable | None = attrs.field(default=None, init=False, repr=False)
+    _start_index: AttemptStartIndex | None = attrs.field(default=None, init=False, repr=False)
+
+    def __attrs_post_init__(self):
+        if self._data is None and self._store is None:
+            raise ValueError("LivesplitData needs either a dataframe or an array store")
 
     @classmethod
-    def from_lss(cls, f: TextIO, timing_method: Literal["RealTime", "GameTime"] = "RealTime") -> Self:
-        return cls(
-            data=import_lss(f, timing_method)
-        )
+    def from_lss(
+        cls,
+        f: TextIO,
+        timing_method: Literal["RealTime", "GameTime"] = "RealTime",
+        cache_dir: str | os.PathLike | None = None,
+        storage: Literal["frame", "arrays"] = "frame",
+    ) -> Self:
+        """
+        If cache_dir is given, the imported data is stored there under a hash of the file contents,
+        and later imports of an unchanged file are loaded from that cache instead of being parsed again.
+
+        With storage="arrays" only the compact ArrayStore is kept after importing.
+        """
+        if cache_dir is None:
+            data = cls(
+                data=import_lss(f, timing_method)
+            )
+        else:
+            cache_path = get_cache_path(cache_dir, hash_lss(f), timing_method)
+            if cache_path.exists():
+                data = cls.from_npy(cache_path)
+            else:
+                data = cls.from_lss(f, timing_method)
+                data.to_npy(cache_path)
+
+        if storage == "arrays":
+            return cls(store=data.store)
+        return data
+
+    @property
+    def data(self) -> pd.DataFrame:
+        if self._data is None:
+            self._data = self._store.to_frame()
+        return self._data
+
+    @data.setter
+    def data(self, data: pd.DataFrame) -> None:
+        self._data = data
+        self._store = None
+        self._sorted_segments = None
+        self._start_index = None
+
+    @property
+    def store(self) -> ArrayStore:
+        if self._store is None:
+            self._store = ArrayStore.from_frame(self._data)
+        return self._store
+
+    @property
+    def sorted_segments(self) -> SortedSegmentTable:
+        """
+        Segment times sorted within each segment, built once and shared by every distribution of this data.
+        """
+        if self._sorted_segments is None:
+            self._sorted_segments = SortedSegmentTable.from_store(self.store)
+        return self._sorted_segments
+
+    @property
+    def start_index(self) -> AttemptStartIndex:
+        """
+        Attempt start times sorted once, for selecting attempts by date and sweeping over many cutoffs.
+        """
+        if self._start_index is None:
+            self._start_index = AttemptStartIndex.from_store(self.store)
+        return self._start_index
+
+    def update_from_lss(self, f: TextIO, timing_method: Literal["RealTime", "GameTime"] = "RealTime") -> None:
+        """
+        Appends the attempts of f that are newer than the last known attempt.
+        f should be a later version of the file this data was imported from, with the same timing method.
+        """
+        self.data = update_livesplit_data(self.data, f, timing_method)
 
     @property
     def segment_data(self) -> pd.DataFrame:
+        if self._data is None:
+            return self._store.get_segment_frame(AttemptStat.SEGMENT_TIME)
         return self.data[AttemptStat.SEGMENT_TIME]
 
+    def get_segment_seconds(self, statistic: AttemptStat = AttemptStat.SEGMENT_TIME) -> np.ndarray:
+        """
+        attempts x segments array of float seconds, NaN where missing.
+        """
+        return self.store.segment_stats[statistic].to_seconds()
+
     def to_csv(self, f: TextIO | str) -> None:
         self.data.to_csv(f)
 
@@ -64,6 +156,13 @@ class LivesplitData:
         )
         return cls(data)
 
+    def to_npy(self, path: str | os.PathLike) -> None:
+        write_cache(self.data, path)
+
+    @classmethod
+    def from_npy(cls, path: str | os.PathLike) -> Self:
+        return cls(read_cache(path))
+
     @property
     def _column_is_full_attempt_statistic(self):
         return (
@@ -75,6 +174,8 @@ class LivesplitData:
 
     @property
     def full_run_stats(self) -> pd.DataFrame:
+        if self._data is None:
+            return self._store.get_full_run_frame()
         return (
             self.data
             .loc[:, self._column_is_full_attempt_statistic]
@@ -82,6 +183,8 @@ class LivesplitData:
 
     @property
     def segment_stats(self) -> pd.DataFrame:
+        if self._data is None:
+            return self._store.get_segment_stats_frame()
         return (
             self.data
             .loc[:, ~self._column_is_full_attempt_statistic]
@@ -0,0 +1,235 @@
+# -*- coding: utf-8 -*-
+"""
+Created on 2026-10-18
+
+@author: brassbeat
+"""
+from typing import Literal, Self, TextIO
+
+import attrs
+import numpy as np
+
+from ls_analysis.data.array_store import MISSING, StatArray, StatKind
+from ls_analysis.data.decode_times import decode_datetimes, decode_timespans
+from ls_analysis.data.enums import AttemptStat
+from ls_analysis.data.livesplit_data import LivesplitData
+from ls_analysis.data.read_lss import LssRecords, read_lss_records
+
+
+def _get_positions_in_rows(offsets: np.ndarray) -> np.ndarray:
+    lengths = np.diff(offsets)
+    return np.arange(offsets[-1]) - np.repeat(offsets[:-1], lengths)
+
+
+@attrs.define
+class RaggedSegments:
+    """
+    Segment history stored per attempt, CSR style, without padding attempts to the full segment count.
+
+    attempts:       (n_attempts,) sorted attempt ids
+    offsets:        (n_attempts + 1,) row i covers positions offsets[i]:offsets[i + 1] of the flat arrays,
+                    which hold segments 1, 2, ... of attempt i in order
+    segment_times:  flat segment times, ns, MISSING for skipped and merged splits
+    split_times:    flat split times, ns, MISSING for skipped splits
+    attempt_times:  (n_attempts,) time between start and end of each attempt, ns
+    reset_at:       (n_attempts,) segment each attempt was reset on, MISSING for finished attempts
+    reset_times:    (n_attempts,) time spent in the segment an attempt was reset on, MISSING for finished attempts
+    segment_count:  total number of segments
+    """
+    attempts: np.ndarray = attrs.field()
+    offsets: np.ndarray = attrs.field()
+    segment_times: np.ndarray = attrs.field()
+    split_times: np.ndarray = attrs.field()
+    attempt_times: np.ndarray = attrs.field()
+    reset_at: np.ndarray = attrs.field()
+    reset_times: np.ndarray = attrs.field()
+    segment_count: int = attrs.field()
+
+    @classmethod
+    def from_records(cls, records: LssRecords, timing_method: Literal["RealTime", "GameTime"] = "RealTime") -> Self:
+        """
+        Same segment numbering and cleanup as import_lss, without building the attempts x segments matrix.
+        """
+        segment_ids = records.segment_ids
+        raw_times = decode_timespans(records.segment_times[timing_method]).view(np.int64)
+        is_positive_attempt = segment_ids > 0
+
+        # a stable sort keeps the records of each attempt in segment order
+        order = np.argsort(segment_ids[is_positive_attempt], kind="stable")
+        segment_ids = segment_ids[is_positive_attempt][order]
+        raw_times = raw_times[is_positive_attempt][order]
+
+        attempts = np.union1d(records.attempt_ids, segment_ids)
+        lengths = np.bincount(np.searchsorted(attempts, segment_ids), minlength=len(attempts))
+        offsets = np.concatenate([[0], np.cumsum(lengths)])
+        is_row_start = _get_positions_in_rows(offsets) == 0
+
+        is_skipped = raw_times == MISSING
+        running_times = np.concatenate([[0], np.cumsum(np.where(is_skipped, 0, raw_times))])
+        split_times = running_times[1:] - np.repeat(running_times[offsets[:-1]], lengths)
+        split_times[is_skipped] = MISSING
+
+        # the segment after a skipped split holds the time of both segments, so it is dropped
+        follows_skip = np.concatenate([[False], is_skipped[:-1]]) & ~is_row_start
+        segment_times = np.where(follows_skip, MISSING, raw_times)
+
+        started = decode_datetimes(records.attempt_started).view(np.int64)
+        ended = decode_datetimes(records.attempt_ended).view(np.int64)
+        recorded_attempt_times = np.where((started == MISSING) | (ended == MISSING), MISSING, ended - started)
+        attempt_times = np.full(len(attempts), MISSING)
+        attempt_times[np.searchsorted(attempts, records.attempt_ids)] = recorded_attempt_times
+
+        return cls.from_split_times(
+            attempts=attempts,
+            offsets=offsets,
+            segment_times=segment_times,
+            split_times=split_times,
+            attempt_times=attempt_times,
+            segment_count=int(lengths.max(initial=0)),
+        )
+
+    @classmethod
+    def from_split_times(
+        cls,
+        attempts: np.ndarray,
+        offsets: np.ndarray,
+        segment_times: np.ndarray,
+        split_times: np.ndarray,
+        attempt_times: np.ndarray,
+        segment_count: int,
+    ) -> Self:
+        # reset_at is one past the last split with a time, like get_derived_stats
+        has_split = split_times != MISSING
+        rows = np.repeat(np.arange(len(attempts)), np.diff(offsets))[has_split]
+        last_splits = np.zeros(len(attempts), dtype=np.int64)
+        np.maximum.at(last_splits, rows, _get_positions_in_rows(offsets)[has_split] + 1)
+        reset_at = np.where(last_splits < segment_count, last_splits + 1, MISSING)
+
+        # split times only grow within an attempt, so the last split is also the largest
+        last_split_times = np.zeros(len(attempts), dtype=np.int64)
+        np.maximum.at(last_split_times, rows, split_times[has_split])
+        reset_times = np.where(
+            (reset_at == MISSING) | (attempt_times == MISSING),
+            MISSING,
+            attempt_times - last_split_times,
+        )
+
+        return cls(
+            attempts=attempts,
+            offsets=offsets,
+            segment_times=segment_times,
+            split_times=split_times,
+            attempt_times=attempt_times,
+            reset_at=reset_at,
+            reset_times=reset_times,
+            segment_count=segment_count,
+        )
+
+    @classmethod
+    def from_lss(cls, f: TextIO, timing_method: Literal["RealTime", "GameTime"] = "RealTime") -> Self:
+        return cls.from_records(read_lss_records(f, timing_methods=(timing_method,)), timing_method)
+
+    @classmethod
+    def from_livesplit_data(cls, data: LivesplitData) -> Self:
+        """
+        Drops the padding of each attempt after the last segment it recorded a split for.
+        """
+        store = data.store
+        split_matrix = store.segment_stats[AttemptStat.SPLIT_TIME].values
+        has_split = split_matrix != MISSING
+        segment_count = len(store.segments)
+
+        lengths = np.where(
+            has_split.any(axis=1),
+            segment_count - np.argmax(has_split[:, ::-1], axis=1),
+            0,
+        )
+        in_row = np.arange(segment_count) < lengths[:, np.newaxis]
+        return cls.from_split_times(
+            attempts=store.attempts,
+            offsets=np.concatenate([[0], np.cumsum(lengths)]),
+            segment_times=store.segment_stats[AttemptStat.SEGMENT_TIME].values[in_row],
+            split_times=split_matrix[in_row],
+            attempt_times=store.attempt_stats[AttemptStat.ATTEMPT_TIME].values,
+            segment_count=segment_count,
+        )
+
+    @property
+    def _rows(self) -> np.ndarray:
+        return np.repeat(np.arange(len(self.attempts)), np.diff(self.offsets))
+
+    @property
+    def _segments(self) -> np.ndarray:
+        # 1-based segment of every flat position
+        return _get_positions_in_rows(self.offsets) + 1
+
+    def _get_flat(self, statistic: AttemptStat) -> np.ndarray:
+        match statistic:
+            case AttemptStat.SEGMENT_TIME:
+                return self.segment_times
+            case AttemptStat.SPLIT_TIME:
+                return self.split_times
+        raise KeyError(statistic)
+
+    def get_segment_values(self, statistic: AttemptStat, segment: int) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Attempt ids and recorded values of one segment, leaving out missing values.
+        """
+        lengths = np.diff(self.offsets)
+        rows = np.flatnonzero(lengths >= segment)
+        values = self._get_flat(statistic)[self.offsets[rows] + segment - 1]
+        is_recorded = values != MISSING
+        return self.attempts[rows[is_recorded]], values[is_recorded]
+
+    def get_reset_counts(self) -> np.ndarray:
+        """
+        Number of attempts reset on each segment, index 0 being segment 1.
+        """
+        is_reset = self.reset_at != MISSING
+        return np.bincount(self.reset_at[is_reset] - 1, minlength=self.segment_count)
+
+    def get_arrival_counts(self) -> np.ndarray:
+        """
+        Number of attempts that started each segment.
+        """
+        reached_segments = np.where(self.reset_at == MISSING, self.segment_count, self.reset_at)
+        reached_counts = np.bincount(reached_segments - 1, minlength=self.segment_count)
+        return reached_counts[::-1].cumsum()[::-1]
+
+    def get_completion_counts(self, statistic: AttemptStat = AttemptStat.SEGMENT_TIME) -> np.ndarray:
+        """
+        Number of recorded values of each segment.
+        """
+        is_recorded = self._get_flat(statistic) != MISSING
+        return np.bincount(self._segments[is_recorded] - 1, minlength=self.segment_count)
+
+    def get_reset_rates(self) -> np.ndarray:
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return self.get_reset_counts() / self.get_arrival_counts()
+
+    def to_dense(self, statistic: AttemptStat) -> StatArray:
+        """
+        The attempts x segments matrix of a statistic, as stored by ArrayStore.
+        """
+        dense = np.full((len(self.attempts), self.segment_count), MISSING)
+        if statistic is AttemptStat.RESET_TIME:
+            is_reset = self.reset_at != MISSING
+            dense[np.flatnonzero(is_reset), self.reset_at[is_reset] - 1] = self.reset_times[is_reset]
+        else:
+            dense[self._rows, self._segments - 1] = self._get_flat(statistic)
+        return StatArray(dense, StatKind.TIMEDELTA)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(
+            array.nbytes
+            for array in (
+                self.attempts,
+                self.offsets,
+                self.segment_times,
+                self.split_times,
+                self.attempt_times,
+                self.reset_at,
+                self.reset_times,
+            )
+        )
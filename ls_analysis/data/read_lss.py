@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+"""
+Created on 2026-10-18
+
+@author: brassbeat
+"""
+from typing import TextIO
+from xml.parsers import expat
+
+import attrs
+import numpy as np
+
+_CHUNK_SIZE = 1 << 16
+TIMING_METHODS = ("RealTime", "GameTime")
+
+
+@attrs.define
+class LssRecords:
+    """
+    Raw records of a single .lss file, in document order.
+
+    Attempt arrays hold one entry per <Attempt> element of <AttemptHistory>:
+        attempt_ids:        "id" attribute
+        attempt_started:    "started" attribute, or None
+        attempt_ended:      "ended" attribute, or None
+        attempt_times:      text of the <RealTime>/<GameTime> children, or None
+
+    Segment arrays hold one entry per <Time> element of any <SegmentHistory>:
+        segment_ids:        "id" attribute
+        segment_times:      text of the <RealTime>/<GameTime> children, or None
+    """
+    attempt_ids: np.ndarray = attrs.field()
+    attempt_started: np.ndarray = attrs.field()
+    attempt_ended: np.ndarray = attrs.field()
+    attempt_times: dict[str, np.ndarray] = attrs.field()
+
+    segment_ids: np.ndarray = attrs.field()
+    segment_times: dict[str, np.ndarray] = attrs.field()
+
+
+class _RecordBuffer:
+    def __init__(self, *columns: str):
+        self._columns = {column: [] for column in columns}
+
+    def append(self, record: dict[str, str]) -> None:
+        for column, buffer in self._columns.items():
+            buffer.append(record.get(column))
+
+    def get(self, column: str, dtype=object) -> np.ndarray:
+        return np.array(self._columns[column], dtype=dtype)
+
+
+class _LssHandler:
+    """
+    expat callbacks that keep only the <Attempt> and <Time> elements, one flat record each.
+    No element tree is built, so memory use is bounded by the collected strings.
+    """
+    def __init__(self, timing_methods: tuple[str, ...], min_attempt_id: int | None):
+        self.buffers = {
+            "Attempt": _RecordBuffer("id", "started", "ended", *timing_methods),
+            "Time": _RecordBuffer("id", *timing_methods),
+        }
+        self._timing_methods = timing_methods
+        self._min_attempt_id = min_attempt_id
+        self._record: dict[str, str] | None = None
+        self._text_field: str | None = None
+
+    def start(self, name: str, attributes: dict[str, str]) -> None:
+        if name in self.buffers:
+            self._record = attributes
+        elif self._record is not None and name in self._timing_methods:
+            self._text_field = name
+            self._record[name] = ""
+
+    def characters(self, data: str) -> None:
+        if self._text_field is not None:
+            self._record[self._text_field] += data
+
+    def end(self, name: str) -> None:
+        if name == self._text_field:
+            self._text_field = None
+        elif self._record is not None and name in self.buffers:
+            if self._min_attempt_id is None or int(self._record["id"]) > self._min_attempt_id:
+                self.buffers[name].append(self._record)
+            self._record = None
+
+
+def read_lss_records(
+    f: TextIO,
+    timing_methods: tuple[str, ...] = TIMING_METHODS,
+    min_attempt_id: int | None = None,
+) -> LssRecords:
+    """
+    Walks the document once, collecting attempts and segment history times as raw strings.
+    Times are only collected for the requested timing methods,
+    and if min_attempt_id is given, only records of later attempts are kept.
+    """
+    handler = _LssHandler(timing_methods, min_attempt_id)
+
+    parser = expat.ParserCreate()
+    parser.buffer_text = True
+    parser.StartElementHandler = handler.start
+    parser.CharacterDataHandler = handler.characters
+    parser.EndElementHandler = handler.end
+
+    # skip the byte order mark and anything else preceding the xml declaration
+    chunk = f.read(_CHUNK_SIZE)
+    chunk = chunk[chunk.find("<"):]
+    while chunk:
+        parser.Parse(chunk, False)
+        chunk = f.read(_CHUNK_SIZE)
+    parser.Parse("", True)
+
+    attempts = handler.buffers["Attempt"]
+    segments = handler.buffers["Time"]
+    return LssRecords(
+        attempt_ids=attempts.get("id", dtype=np.int64),
+        attempt_started=attempts.get("started"),
+        attempt_ended=attempts.get("ended"),
+        attempt_times={method: attempts.get(method) for method in timing_methods},
+        segment_ids=segments.get("id", dtype=np.int64),
+        segment_times={method: segments.get(method) for method in timing_methods},
+    )
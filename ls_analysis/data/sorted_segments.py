@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+"""
+Created on 2026-10-18
+
+@author: brassbeat
+"""
+from typing import Self
+
+import attrs
+import numpy as np
+import pandas as pd
+
+from ls_analysis.data.array_store import ArrayStore, StatArray
+from ls_analysis.data.enums import AttemptStat
+
+
+@attrs.define(frozen=True)
+class SortedSegmentTable:
+    """
+    Every segment time of a dataset, segment after segment and sorted by time within each segment,
+    so distributions with any weights can be built without sorting again.
+    Ties keep the order of the attempts.
+
+    attempts:           (n_attempts,) attempt ids, in the order of the rows of the data
+    segments:           (n_segments,) segment numbers
+    offsets:            (n_segments + 1,) times of segment i are at offsets[i]:offsets[i + 1]
+    times:              (n_times,) segment times, int64 ns
+    attempt_positions:  (n_times,) row of the attempt of each time
+    """
+    attempts: np.ndarray = attrs.field()
+    segments: np.ndarray = attrs.field()
+    offsets: np.ndarray = attrs.field()
+    times: np.ndarray = attrs.field()
+    attempt_positions: np.ndarray = attrs.field()
+
+    @classmethod
+    def from_store(cls, store: ArrayStore) -> Self:
+        return cls._from_arrays(store.attempts, store.segments, store.segment_stats[AttemptStat.SEGMENT_TIME])
+
+    @classmethod
+    def from_segment_frame(cls, segment_data: pd.DataFrame) -> Self:
+        """
+        segment_data is an attempts x segments frame of segment times, like LivesplitData.segment_data.
+        """
+        return cls._from_arrays(
+            segment_data.index.to_numpy(dtype=np.int64),
+            segment_data.columns.to_numpy(dtype=np.int64),
+            StatArray.from_frame(segment_data),
+        )
+
+    @classmethod
+    def _from_arrays(cls, attempts: np.ndarray, segments: np.ndarray, segment_times: StatArray) -> Self:
+        # column-major nonzero walks segment by segment, in attempt order within each
+        segment_positions, attempt_positions = np.nonzero(~segment_times.is_missing.T)
+        times = segment_times.values[attempt_positions, segment_positions]
+        order = np.lexsort((times, segment_positions))
+        counts = np.bincount(segment_positions, minlength=len(segments))
+
+        for array in (times, attempt_positions):
+            array[...] = array[order]
+            array.flags.writeable = False
+
+        return cls(
+            attempts=attempts,
+            segments=segments,
+            offsets=np.append(0, np.cumsum(counts)),
+            times=times,
+            attempt_positions=attempt_positions,
+        )
+
+    @property
+    def segment_positions(self) -> np.ndarray:
+        """
+        (n_times,) column of the segment of each time
+        """
+        return np.repeat(np.arange(len(self.segments)), np.diff(self.offsets))
+
+    def get_time_values(self, values: np.ndarray) -> np.ndarray:
+        """
+        Picks the entry of each time from an (n_attempts, n_segments) array, such as the weights of a kernel.
+        """
+        return values[self.attempt_positions, self.segment_positions]
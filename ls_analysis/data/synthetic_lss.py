@@ -0,0 +1,246 @@
+# -*- coding: utf-8 -*-
+"""
+Created on 2026-10-18
+
+@author: brassbeat
+"""
+import io
+from typing import Self, TextIO
+
+import attrs
+import numpy as np
+import pandas as pd
+
+from ls_analysis.data.array_store import MISSING
+
+_NANOSECONDS_PER_SECOND = 10 ** 9
+_NANOSECONDS_PER_TICK = 100
+_TICKS_PER_SECOND = 10 ** 7
+_SECONDS_PER_DAY = 24 * 60 * 60
+
+_FIRST_START = pd.Timestamp(2024, 1, 1, 12)
+_DATETIME_FORMAT = "%m/%d/%Y %H:%M:%S"
+
+
+def _format_timespans(values: np.ndarray) -> list[str]:
+    """
+    C# TimeSpan strings, [d.]hh:mm:ss.fffffff, of non-negative nanosecond values.
+    """
+    ticks = values // _NANOSECONDS_PER_TICK
+    seconds, fractions = np.divmod(ticks, _TICKS_PER_SECOND)
+    days, seconds = np.divmod(seconds, _SECONDS_PER_DAY)
+    hours, seconds = np.divmod(seconds, 60 * 60)
+    minutes, seconds = np.divmod(seconds, 60)
+    return [
+        f"{d}.{h:02}:{m:02}:{s:02}.{f:07}" if d else f"{h:02}:{m:02}:{s:02}.{f:07}"
+        for d, h, m, s, f in zip(
+            days.tolist(), hours.tolist(), minutes.tolist(), seconds.tolist(), fractions.tolist()
+        )
+    ]
+
+
+def _get_segment_history(segment_times: np.ndarray, is_recorded: np.ndarray) -> np.ndarray:
+    # livesplit stores the time since the previous recorded split, so a skipped split merges into the next one
+    split_times = np.cumsum(segment_times, axis=1)
+    last_recorded_splits = np.maximum.accumulate(np.where(is_recorded, split_times, 0), axis=1)
+    previous_splits = np.zeros_like(split_times)
+    previous_splits[:, 1:] = last_recorded_splits[:, :-1]
+    return np.where(is_recorded, split_times - previous_splits, MISSING)
+
+
+@attrs.define
+class SyntheticRun:
+    """
+    Randomly generated attempt history of a speedrun, to be written as a .lss file.
+
+    segment_names:  (n_segments,)
+    started:        (n_attempts,) start of each attempt, datetime64[ns]
+    ended:          (n_attempts,) end of each attempt, datetime64[ns]
+    real_history:   (n_attempts, n_segments) RealTime segment history, ns, MISSING for skipped splits
+                    and for segments after the one an attempt was reset on
+    game_history:   the same for GameTime, or None for runs timed in RealTime only
+    real_run_times: (n_attempts,) RealTime of finished attempts, ns, MISSING for resets
+    game_run_times: the same for GameTime, or None
+    """
+    segment_names: list[str] = attrs.field()
+    started: np.ndarray = attrs.field()
+    ended: np.ndarray = attrs.field()
+    real_history: np.ndarray = attrs.field()
+    game_history: np.ndarray | None = attrs.field()
+    real_run_times: np.ndarray = attrs.field()
+    game_run_times: np.ndarray | None = attrs.field()
+
+    @classmethod
+    def generate(
+        cls,
+        attempt_count: int,
+        segment_count: int,
+        reset_hazard: float = 0.05,
+        skip_probability: float = 0.02,
+        game_time: bool = True,
+        seed: int = 0,
+    ) -> Self:
+        """
+        Draws a run history from a fixed seed, so the same arguments always give the same file.
+
+        reset_hazard:       chance of an attempt being reset on each segment it reaches
+        skip_probability:   chance of each split but the last being skipped
+        game_time:          whether to record GameTime as well, RealTime minus up to 10% of loads
+        """
+        rng = np.random.default_rng(seed)
+        shape = (attempt_count, segment_count)
+
+        # log-normal segment times around a mean of 20s to 90s per segment, in whole ticks like livesplit stores
+        mean_seconds = rng.uniform(20, 90, segment_count)
+        real_ticks = (rng.lognormal(np.log(mean_seconds), 0.15, shape) * _TICKS_PER_SECOND).astype(np.int64)
+        game_ticks = real_ticks - (real_ticks * rng.uniform(0, 0.1, shape)).astype(np.int64)
+        real_times = real_ticks * _NANOSECONDS_PER_TICK
+        game_times = game_ticks * _NANOSECONDS_PER_TICK
+
+        is_reset = rng.random(shape) < reset_hazard
+        reset_at = np.where(is_reset.any(axis=1), np.argmax(is_reset, axis=1), segment_count)
+        is_reached = np.arange(segment_count) < reset_at[:, np.newaxis]
+        is_finished = reset_at == segment_count
+
+        is_skipped = is_reached & (rng.random(shape) < skip_probability)
+        is_skipped[:, -1] = False
+        is_recorded = is_reached & ~is_skipped
+
+        # resets happen partway into the segment they are on, finished runs take a moment to stop the timer
+        played_times = np.where(is_reached, real_times, 0).sum(axis=1)
+        reset_row_times = real_times[np.arange(attempt_count), np.minimum(reset_at, segment_count - 1)]
+        extra_times = np.where(
+            is_finished,
+            rng.uniform(0, 5, attempt_count) * _NANOSECONDS_PER_SECOND,
+            rng.uniform(0, 1, attempt_count) * reset_row_times,
+        ).astype(np.int64)
+        attempt_times = played_times + extra_times
+
+        pauses = rng.integers(10, 600, attempt_count) * _NANOSECONDS_PER_SECOND
+        started = (
+            _FIRST_START.value
+            + np.cumsum(pauses)
+            + np.concatenate([[0], np.cumsum(attempt_times[:-1])])
+        )
+
+        return cls(
+            segment_names=[f"Segment {segment}" for segment in range(1, segment_count + 1)],
+            started=started.view("datetime64[ns]"),
+            ended=(started + attempt_times).view("datetime64[ns]"),
+            real_history=_get_segment_history(real_times, is_recorded),
+            game_history=_get_segment_history(game_times, is_recorded) if game_time else None,
+            real_run_times=np.where(is_finished, real_times.sum(axis=1), MISSING),
+            game_run_times=np.where(is_finished, game_times.sum(axis=1), MISSING) if game_time else None,
+        )
+
+    @property
+    def attempt_count(self) -> int:
+        return len(self.started)
+
+    @property
+    def segment_count(self) -> int:
+        return len(self.segment_names)
+
+    def _iter_times(self, real_times: np.ndarray, game_times: np.ndarray | None, indent: str):
+        real_strings = _format_timespans(real_times)
+        game_strings = (
+            _format_timespans(game_times)
+            if game_times is not None
+            else [None] * len(real_strings)
+        )
+        for real_string, game_string in zip(real_strings, game_strings):
+            yield f"{indent}<RealTime>{real_string}</RealTime>\n"
+            if game_string is not None:
+                yield f"{indent}<GameTime>{game_string}</GameTime>\n"
+
+    def _iter_attempts(self):
+        started = pd.DatetimeIndex(self.started).strftime(_DATETIME_FORMAT)
+        ended = pd.DatetimeIndex(self.ended).strftime(_DATETIME_FORMAT)
+        is_finished = self.real_run_times != MISSING
+        finished_times = self._iter_times(
+            self.real_run_times[is_finished],
+            self.game_run_times[is_finished] if self.game_run_times is not None else None,
+            indent="      ",
+        )
+        time_lines = 1 if self.game_run_times is None else 2
+
+        for attempt, (start, end, finished) in enumerate(zip(started, ended, is_finished.tolist()), start=1):
+            yield (
+                f'    <Attempt id="{attempt}" started="{start}" isStartedSynced="True" '
+                f'ended="{end}" isEndedSynced="True"'
+            )
+            if finished:
+                yield ">\n"
+                for _ in range(time_lines):
+                    yield next(finished_times)
+                yield "    </Attempt>\n"
+            else:
+                yield " />\n"
+
+    def _iter_segment_history(self, segment: int, split_counts: np.ndarray):
+        history = self.real_history[:, segment]
+        is_recorded = history != MISSING
+        recorded_times = self._iter_times(
+            history[is_recorded],
+            self.game_history[is_recorded, segment] if self.game_history is not None else None,
+            indent="          ",
+        )
+        time_lines = 1 if self.game_history is None else 2
+
+        # attempts are recorded up to their last split, skipped splits before it as empty times
+        for attempt in np.flatnonzero(split_counts > segment).tolist():
+            if is_recorded[attempt]:
+                yield f'        <Time id="{attempt + 1}">\n'
+                for _ in range(time_lines):
+                    yield next(recorded_times)
+                yield "        </Time>\n"
+            else:
+                yield f'        <Time id="{attempt + 1}" />\n'
+
+    def write_lss(self, f: TextIO) -> None:
+        f.write(
+            '<?xml version="1.0" encoding="UTF-8"?>\n'
+            '<Run version="1.7.0">\n'
+            "  <GameIcon />\n"
+            "  <GameName>Synthetic Game</GameName>\n"
+            "  <CategoryName>Any%</CategoryName>\n"
+            "  <Offset>00:00:00</Offset>\n"
+            f"  <AttemptCount>{self.attempt_count}</AttemptCount>\n"
+            "  <AttemptHistory>\n"
+        )
+        f.writelines(self._iter_attempts())
+
+        is_recorded = self.real_history != MISSING
+        split_counts = np.where(
+            is_recorded.any(axis=1),
+            self.segment_count - np.argmax(is_recorded[:, ::-1], axis=1),
+            0,
+        )
+        f.write(
+            "  </AttemptHistory>\n"
+            "  <Segments>\n"
+        )
+        for segment, name in enumerate(self.segment_names):
+            f.write(
+                "    <Segment>\n"
+                f"      <Name>{name}</Name>\n"
+                "      <Icon />\n"
+                "      <SplitTimes />\n"
+                "      <BestSegmentTime />\n"
+                "      <SegmentHistory>\n"
+            )
+            f.writelines(self._iter_segment_history(segment, split_counts))
+            f.write(
+                "      </SegmentHistory>\n"
+                "    </Segment>\n"
+            )
+        f.write(
+            "  </Segments>\n"
+            "  <AutoSplitterSettings />\n"
+            "</Run>\n"
+        )
+
+    def to_lss(self) -> str:
+        f = io.StringIO()
+        self.write_lss(f)
+        return f.getvalue()
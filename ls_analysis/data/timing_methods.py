@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+"""
+Created on 2026-10-18
+
+@author: brassbeat
+"""
+from typing import Literal, Self, TextIO
+
+import attrs
+import pandas as pd
+
+from ls_analysis.data.enums import AttemptStat
+from ls_analysis.data.import_lss import import_lss_timing_methods
+from ls_analysis.data.livesplit_data import LivesplitData
+
+
+@attrs.define
+class LivesplitTimingMethods:
+    """
+    A splits file imported once for both timing methods, see import_lss_timing_methods.
+    """
+    real_time: LivesplitData = attrs.field()
+    game_time: LivesplitData = attrs.field()
+
+    @classmethod
+    def from_lss(cls, f: TextIO, reset_timing_method: Literal["RealTime", "GameTime"] = "RealTime") -> Self:
+        data = import_lss_timing_methods(f, reset_timing_method)
+        return cls(
+            real_time=LivesplitData(data["RealTime"]),
+            game_time=LivesplitData(data["GameTime"]),
+        )
+
+    def __getitem__(self, timing_method: Literal["RealTime", "GameTime"]) -> LivesplitData:
+        match timing_method:
+            case "RealTime":
+                return self.real_time
+            case "GameTime":
+                return self.game_time
+        raise KeyError(timing_method)
+
+    def get_load_times(self, statistic: AttemptStat = AttemptStat.SEGMENT_TIME) -> pd.DataFrame:
+        """
+        RealTime - GameTime of every segment (or split) of every attempt, NaT where either is missing.
+        """
+        return (
+            self.real_time.data[statistic]
+            - self.game_time.data[statistic]
+        )
+
+    def get_run_load_times(self) -> pd.Series:
+        """
+        RealTime - GameTime of every finished attempt.
+        """
+        return (
+            self.real_time.data[AttemptStat.RUN_TIME, -1]
+            - self.game_time.data[AttemptStat.RUN_TIME, -1]
+        )
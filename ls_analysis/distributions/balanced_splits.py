@@ -4,40 +4,155 @@ Created on 2024/05/29
 
 @author: brassbeat
 """
+from collections.abc import Iterable
+from typing import Self
+
+import attrs
+import numpy as np
 import pandas as pd
 
-from distributions.enums import DistributionColumn
-from distributions.protocols import SegmentDistribution
+from ls_analysis.data.enums import IndexCategory
+from ls_analysis.distributions.core.quantile_nodes import QuantileNodes
+from ls_analysis.distributions.enums import DistributionColumn
+from ls_analysis.distributions.protocols import SegmentDistribution
 
-_BINARY_SEARCH_TOLERANCE = 10 ** -6
 
+@attrs.define
+class RunTimeCurve:
+    """
+    Sum of the segment times at a shared quantile, as a function of that quantile.
+    It is monotone, and changes only at breakpoints or linearly between them.
+    Run times are looked up the same way get_quantile_times does, only at the breakpoints a search needs.
 
-def get_balanced_segments(data: SegmentDistribution, target_time: pd.Timedelta) -> pd.DataFrame:
-    low_quantile, high_quantile = 0., 1.
+    nodes:          the nodes the segment times are looked up from
+    breakpoints:    (n_breakpoints,) every quantile at which a node of some segment starts, ascending
+    """
+    nodes: QuantileNodes = attrs.field()
+    breakpoints: np.ndarray = attrs.field()
+
+    @classmethod
+    def from_nodes(cls, nodes: QuantileNodes) -> Self:
+        return cls(nodes, np.unique(nodes.quantiles))
+
+    @property
+    def interpolate(self) -> bool:
+        return self.nodes.interpolate
+
+    def get_run_times(self, quantiles: np.ndarray) -> np.ndarray:
+        """
+        Run time at each quantile, int64 ns.
+        """
+        quantiles = np.asarray(quantiles, dtype=np.float64)
+        run_times = np.zeros(len(quantiles), dtype=np.int64)
+        for segment in range(self.nodes.segment_count):
+            run_times += self.nodes.get_segment_times(segment, quantiles).view(np.int64)
+        return run_times
+
+    def _locate(self, target_times: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Position of the last breakpoint with a run time of at most each target time, by bisection for all targets
+        together, -1 below the first and the last position at or above the last,
+        and how far the target is from its run time towards that of the next breakpoint.
+        """
+        breakpoint_count = len(self.breakpoints)
+        lower = np.full(len(target_times), -1)
+        upper = np.full(len(target_times), breakpoint_count)
+        while (upper - lower > 1).any():
+            middle = (lower + upper) // 2
+            is_within = self.get_run_times(self.breakpoints[np.clip(middle, 0, breakpoint_count - 1)]) <= target_times
+            is_searched = upper - lower > 1
+            lower = np.where(is_searched & is_within, middle, lower)
+            upper = np.where(is_searched & ~is_within, middle, upper)
 
-    best_segments = data.get_quantile_times(low_quantile)[DistributionColumn.SEGMENT_TIME]
-    worst_segments = data.get_quantile_times(high_quantile)[DistributionColumn.SEGMENT_TIME]
+        proportions = np.zeros(len(target_times))
+        is_inside = (lower >= 0) & (upper < breakpoint_count)
+        if self.interpolate and is_inside.any():
+            lower_runs = self.get_run_times(self.breakpoints[lower[is_inside]])
+            upper_runs = self.get_run_times(self.breakpoints[upper[is_inside]])
+            rises = (upper_runs - lower_runs).astype(np.float64)
+            with np.errstate(invalid="ignore", divide="ignore"):
+                proportions[is_inside] = np.clip(
+                    np.where(rises > 0, (target_times[is_inside] - lower_runs) / rises, 0.), 0., 1.
+                )
+        return lower, proportions
 
-    if best_segments.sum() > target_time:
-        return best_segments
-    if worst_segments.sum() < target_time:
-        return worst_segments
+    def get_quantiles(self, target_times: np.ndarray) -> np.ndarray:
+        """
+        Highest quantile with a run time of at most each target time, given in int64 ns.
+        Targets faster than the best segments give 0, targets at least the worst segments give 1.
+        """
+        target_times = np.asarray(target_times, dtype=np.int64)
+        lower, proportions = self._locate(target_times)
+        is_above = lower == len(self.breakpoints) - 1
+        lower = np.clip(lower, 0, len(self.breakpoints) - 1)
+        upper = np.minimum(lower + 1, len(self.breakpoints) - 1)
 
-    mid_quantile = 0.5
-    mid_segments = data.get_quantile_times(mid_quantile)
-    mid_total_time = mid_segments[DistributionColumn.SEGMENT_TIME].sum()
+        quantiles = self.breakpoints[lower] + proportions * (self.breakpoints[upper] - self.breakpoints[lower])
+        quantiles = np.where(is_above, 1., quantiles)
+        return np.where(lower < 0, 0., quantiles)
 
-    while (high_quantile - low_quantile) > _BINARY_SEARCH_TOLERANCE:
-        if mid_total_time < target_time:
-            low_quantile = mid_quantile
-        else:
-            high_quantile = mid_quantile
+    def get_segment_times(self, target_times: np.ndarray) -> np.ndarray:
+        """
+        (n_targets, n_segments) segment times adding up to each target time given in int64 ns, timedelta64[ns].
 
-        mid_quantile = (high_quantile + low_quantile) / 2
-        mid_segments = data.get_quantile_times(mid_quantile)
-        mid_total_time = mid_segments[DistributionColumn.SEGMENT_TIME].sum()
+        Between breakpoints every segment is linear in the quantile, so segment times are blended
+        from their lookups at the breakpoints around the target rather than looked up at its quantile,
+        which float64 cannot always pin down where nodes of tiny weight make the run time jump.
+        Targets outside of the curve give the best or the worst segments.
+        """
+        target_times = np.asarray(target_times, dtype=np.int64)
+        nodes = self.nodes
+        found, proportions = self._locate(target_times)
+        lower = np.clip(found, 0, len(self.breakpoints) - 1)
+        upper = np.minimum(lower + 1, len(self.breakpoints) - 1)
 
-    return mid_segments
+        segment_times = np.empty((len(target_times), nodes.segment_count), dtype=np.int64)
+        for segment in range(nodes.segment_count):
+            lower_times = nodes.get_segment_times(segment, self.breakpoints[lower]).view(np.int64)
+            upper_times = nodes.get_segment_times(segment, self.breakpoints[upper]).view(np.int64)
+            segment_times[:, segment] = lower_times + np.round(proportions * (upper_times - lower_times))
 
+        segment_times[found < 0] = nodes.times[nodes.offsets[:-1]].view(np.int64)
+        segment_times[found == len(self.breakpoints) - 1] = nodes.times[nodes.offsets[1:] - 1].view(np.int64)
+        return segment_times.view("timedelta64[ns]")
 
 
+def get_balanced_quantiles(data: SegmentDistribution, target_times: Iterable[pd.Timedelta]) -> pd.Series:
+    """
+    Shared quantile at which the segment times add up to each target time.
+    """
+    target_times = pd.TimedeltaIndex(list(target_times), name="target_time")
+    curve = RunTimeCurve.from_nodes(data.nodes)
+    return pd.Series(
+        data=curve.get_quantiles(target_times.asi8),
+        index=target_times,
+        name=DistributionColumn.QUANTILE,
+    )
+
+
+def get_balanced_segment_batch(data: SegmentDistribution, target_times: Iterable[pd.Timedelta]) -> pd.DataFrame:
+    """
+    Balanced segments for every target time at once, indexed by target time and segment.
+    """
+    target_times = pd.TimedeltaIndex(list(target_times), name="target_time")
+    curve = RunTimeCurve.from_nodes(data.nodes)
+    quantiles = curve.get_quantiles(target_times.asi8)
+    segment_times = curve.get_segment_times(target_times.asi8)
+    return pd.DataFrame(
+        data={
+            DistributionColumn.QUANTILE: np.repeat(quantiles, data.segment_count),
+            DistributionColumn.SEGMENT_TIME: segment_times.ravel(),
+        },
+        index=pd.MultiIndex.from_product(
+            [target_times, np.asarray(data.nodes.segments, dtype=np.int64)],
+            names=[target_times.name, IndexCategory.SEGMENT],
+        ),
+    )
+
+
+def get_balanced_segments(data: SegmentDistribution, target_time: pd.Timedelta) -> pd.DataFrame:
+    """
+    Segment times at the shared quantile that adds up to target_time,
+    the best or worst segments if the target is outside of their range.
+    """
+    return get_balanced_segment_batch(data, [target_time]).droplevel("target_time")
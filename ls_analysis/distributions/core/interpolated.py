@@ -6,10 +6,18 @@ Created on 2024-05-15
 """
 
 import attrs
+import numpy as np
 import pandas as pd
 
-from data.livesplit_data import LivesplitData
-from distributions.enums import DistributionColumn
+from ls_analysis.data.livesplit_data import LivesplitData
+from ls_analysis.data.sorted_segments import SortedSegmentTable
+from ls_analysis.distributions.core.quantile_nodes import (
+    DEFAULT_CHUNK_SIZE,
+    QuantileNodes,
+    QuantileTimeBatch,
+    get_distribution_frame,
+)
+from ls_analysis.distributions.enums import DistributionColumn
 from ls_analysis.data.enums import IndexCategory
 
 
@@ -26,6 +34,14 @@ class InterpolatedDistribution:
             "prior_cumulative_weight"
     """
     distribution: pd.DataFrame = attrs.field()
+    _nodes: QuantileNodes = attrs.field(init=False, repr=False)
+
+    def __attrs_post_init__(self):
+        self._nodes = QuantileNodes.from_distribution(
+            self.distribution,
+            DistributionColumn.QUANTILE,
+            interpolate=True,
+        )
 
     @classmethod
     def from_weight_func(
@@ -37,128 +53,61 @@ class InterpolatedDistribution:
     ):
         segment_data = data.segment_data
         weight_data = segment_data.apply(weight_func, args=args, **kwargs)
-        combined_data = pd.concat(
-            [
-                segment_data.rename(
-                    columns=lambda idx: (idx, DistributionColumn.SEGMENT_TIME)
-                ),
-                weight_data.rename(
-                    columns=lambda idx: (idx, DistributionColumn.NODE_WEIGHT)
-                ),
-            ],
-            axis=1,
-        )
-
-        combined_data.columns = pd.MultiIndex.from_tuples(
-            combined_data.columns,
-            names=[
-                IndexCategory.SEGMENT,
-                IndexCategory.STATISTIC,
-            ]
-        )
-
-        long_data: pd.DataFrame = (
-            combined_data
-            .stack(level=IndexCategory.SEGMENT, future_stack=True)
-            .dropna()
-        )
-
-        sorted_segments = (
-            long_data
-            .sort_values(
-                by=[
-                    IndexCategory.SEGMENT,
-                    DistributionColumn.SEGMENT_TIME
-                ]
-            )
+        table = data.sorted_segments
+        weights = (
+            weight_data
+            .reindex(columns=pd.Index(table.segments))
+            .to_numpy(dtype=np.float64, na_value=np.nan)
         )
+        return cls.from_sorted_segments(table, weights)
 
-        # drop weight of worst segments
-        sorted_segments[DistributionColumn.NODE_WEIGHT] = (
-            sorted_segments[DistributionColumn.NODE_WEIGHT]
-            .groupby(by=IndexCategory.SEGMENT)
-            .shift(1)
-            .groupby(by=IndexCategory.SEGMENT)
-            .shift(-1, fill_value=0)
-        )
-
-        sorted_segments[DistributionColumn.QUANTILE] = (
-            sorted_segments[DistributionColumn.NODE_WEIGHT]
-            .groupby(by=IndexCategory.SEGMENT)
-            .shift(1, fill_value=0)
-            .groupby(by=IndexCategory.SEGMENT)
-            .cumsum()
-        )
-
-        # normalize weight of each segment block
-        total_weights: pd.Series = (
-            sorted_segments[DistributionColumn.NODE_WEIGHT]
-            .rename("total_weight")
-            .groupby(by=IndexCategory.SEGMENT)
-            .sum()
-        )
+    @classmethod
+    def from_weight_kernel(
+        cls,
+        data: LivesplitData,
+        weight_kernel,
+        *args,
+        **kwargs,
+    ):
+        """
+        Like from_weight_func, with a kernel from weights.kernels giving the weights of every segment in one pass.
+        """
+        return cls.from_sorted_segments(data.sorted_segments, weight_kernel(data.store, *args, **kwargs))
 
-        sorted_segments[DistributionColumn.NODE_WEIGHT] /= total_weights
-        sorted_segments[DistributionColumn.QUANTILE] /= total_weights
+    @classmethod
+    def from_sorted_segments(cls, table: SortedSegmentTable, weights: np.ndarray):
+        """
+        weights holds a raw weight for every attempt and segment of table, NaN for times to leave out
+        """
+        return cls(get_distribution_frame(table, weights, DistributionColumn.QUANTILE, drop_worst_weight=True))
 
-        return cls(sorted_segments)
+    @property
+    def nodes(self) -> QuantileNodes:
+        return self._nodes
 
     @property
     def segment_count(self) -> int:
         return self.distribution.index.get_level_values(IndexCategory.SEGMENT).nunique()
 
     def get_quantile_times(self, quantiles: pd.Series | float) -> pd.DataFrame:
-        # get bounding quantile nodes for each segment
-        node_is_higher = (
-            self.distribution
-            [DistributionColumn.QUANTILE]
-            .gt(quantiles)
-        )  # strict inequality, so no nodes found when quantiles == 1
-
-        lower_nodes: pd.DataFrame = (
-            self.distribution
-            .loc[~node_is_higher, :]
-            .groupby(level=IndexCategory.SEGMENT, sort=False)
-            .last()
-        )
-
-        upper_nodes: pd.DataFrame = (
-            self.distribution
-            .loc[node_is_higher, :]
-            .groupby(level=IndexCategory.SEGMENT, sort=False)
-            .first()
-        )  # contains missing rows for quantiles == 1
-
-        # do the linear interpolation
-        wanted_interval_length = (
-            quantiles
-            - lower_nodes[DistributionColumn.QUANTILE]
-        )
-        wanted_interval_proportions = (
-            wanted_interval_length
-            / lower_nodes[DistributionColumn.NODE_WEIGHT]
+        """
+        Interpolates linearly between the bounding nodes of each segment, the worst time for quantiles of 1.
+        """
+        quantiles = self._nodes.broadcast_quantiles(quantiles)
+        return self._nodes.to_frame(
+            quantiles,
+            self._nodes.get_interpolated_times(quantiles.to_numpy()),
         )
-        interval_value_sizes = (
-            (
-                upper_nodes[DistributionColumn.SEGMENT_TIME]
-                - lower_nodes[DistributionColumn.SEGMENT_TIME]
-            )
-            .fillna(pd.Timedelta(seconds=0))
-        )
-
-        interpolation_time_steps = wanted_interval_proportions * interval_value_sizes
 
-        interpolated_times = (
-            lower_nodes[DistributionColumn.SEGMENT_TIME]
-            + interpolation_time_steps
-        )
-
-        return pd.DataFrame(
-            data={
-                DistributionColumn.QUANTILE: quantiles,
-                DistributionColumn.SEGMENT_TIME: interpolated_times
-            }
-        )
+    def get_quantile_time_batch(
+        self,
+        quantiles: np.ndarray,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> QuantileTimeBatch:
+        """
+        Segment times of many runs at once, one row of per-segment quantiles for each run.
+        """
+        return self._nodes.get_time_batch(quantiles, chunk_size)
 
 
 def main():
@@ -0,0 +1,203 @@
+# -*- coding: utf-8 -*-
+"""
+Created on 2026-10-18
+
+@author: brassbeat
+"""
+from typing import Self
+
+import attrs
+import numpy as np
+import pandas as pd
+
+from ls_analysis.data.enums import IndexCategory
+from ls_analysis.data.livesplit_data import LivesplitData
+from ls_analysis.distributions.core.quantile_nodes import (
+    DEFAULT_CHUNK_SIZE,
+    QuantileNodes,
+    QuantileTimeBatch,
+)
+from ls_analysis.distributions.core.weights.kernels import get_count_decay_weights
+
+
+# stored weights are divided down once a segment's scale passes this, long before float64 overflows
+_MAX_SCALE = 1e100
+
+
+@attrs.define
+class _SegmentNodes:
+    """
+    Nodes of one segment sorted by time, in buffers with room to insert more.
+    Weights are stored relative to scale, the weight the next new node is stored with,
+    which grows by 1 / decay with every new node instead of every stored weight shrinking by decay.
+
+    times:          (capacity,) segment times, int64 ns, the first count of them in use
+    weights:        (capacity,) stored weights
+    prior_weights:  (capacity,) sum of the stored weights of all earlier nodes
+    """
+    times: np.ndarray = attrs.field()
+    weights: np.ndarray = attrs.field()
+    prior_weights: np.ndarray = attrs.field()
+    count: int = attrs.field()
+    scale: float = attrs.field()
+
+    @classmethod
+    def from_sorted(cls, times: np.ndarray, weights: np.ndarray, scale: float) -> Self:
+        capacity = max(2 * len(times), 1)
+        segment = cls(
+            times=np.empty(capacity, dtype=np.int64),
+            weights=np.empty(capacity, dtype=np.float64),
+            prior_weights=np.empty(capacity, dtype=np.float64),
+            count=len(times),
+            scale=scale,
+        )
+        segment.times[:len(times)] = times
+        segment.weights[:len(times)] = weights
+        segment.prior_weights[:1] = 0.
+        np.cumsum(weights[:-1], out=segment.prior_weights[1:len(times)])
+        return segment
+
+    def insert(self, time: int, decay: float) -> None:
+        """
+        One binary search, and one in-place shift of the nodes after the new one.
+        """
+        if self.count == len(self.times):
+            self._grow()
+        count = self.count
+        position = self.times[:count].searchsorted(time, side="right")
+        weight = self.scale
+        prior_weight = (
+            self.prior_weights[position] if position < count
+            else self.prior_weights[count - 1] + self.weights[count - 1] if count
+            else 0.
+        )
+
+        self.times[position + 1:count + 1] = self.times[position:count]
+        self.weights[position + 1:count + 1] = self.weights[position:count]
+        self.prior_weights[position + 1:count + 1] = self.prior_weights[position:count] + weight
+        self.times[position] = time
+        self.weights[position] = weight
+        self.prior_weights[position] = prior_weight
+        self.count += 1
+
+        self.scale /= decay
+        if self.scale > _MAX_SCALE:
+            self.weights[:self.count] /= self.scale
+            self.prior_weights[:self.count] /= self.scale
+            self.scale = 1.
+
+    def _grow(self) -> None:
+        for name in ("times", "weights", "prior_weights"):
+            array = getattr(self, name)
+            grown = np.empty(2 * len(array), dtype=array.dtype)
+            grown[:self.count] = array[:self.count]
+            setattr(self, name, grown)
+
+    def normalize(self, drop_worst_weight: bool) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Normalized weights and quantiles of the nodes, as normalize_node_weights gives for this segment.
+        """
+        count = self.count
+        weights = self.weights[:count].copy()
+        total = self.prior_weights[count - 1]
+        if drop_worst_weight:
+            weights[-1] = 0.
+        else:
+            total += weights[-1]
+        return weights / total, self.prior_weights[:count] / total
+
+
+@attrs.define
+class OnlineDistribution:
+    """
+    Distribution with exponential weights by count that takes new attempts one at a time,
+    matching InterpolatedDistribution (interpolate=True) or WeightedEmpiricalDistribution (interpolate=False)
+    built from scratch with get_count_decay_weights on the same attempts.
+
+    Every segment keeps its own sorted nodes with unnormalized weights and running prior weights,
+    so a new attempt inserts one node into each of its segments without touching any other,
+    and only the segments that changed are normalized again when nodes are next needed.
+
+    Segments without any times yet are kept, empty, so that update can fill them,
+    but are left out of nodes until they have a time, as they are when built from scratch.
+
+    segments:   (n_segments,) labels of every segment of the run
+    """
+    decay: float = attrs.field()
+    interpolate: bool = attrs.field()
+    segments: pd.Index = attrs.field()
+    _segment_nodes: list[_SegmentNodes] = attrs.field()
+    _normalized: list[tuple[np.ndarray, np.ndarray] | None] = attrs.field(init=False, repr=False)
+    _nodes: QuantileNodes | None = attrs.field(default=None, init=False, repr=False)
+
+    def __attrs_post_init__(self):
+        self._normalized = [None] * len(self._segment_nodes)
+
+    @classmethod
+    def from_livesplit_data(cls, data: LivesplitData, decay: float, interpolate: bool = True) -> Self:
+        table = data.sorted_segments
+        raw_weights = table.get_time_values(get_count_decay_weights(data.store, decay))
+        return cls(
+            decay=decay,
+            interpolate=interpolate,
+            segments=pd.Index(table.segments, name=IndexCategory.SEGMENT),
+            # the latest time of each segment has weight 1, so the next one is stored with 1 / decay
+            segment_nodes=[
+                _SegmentNodes.from_sorted(table.times[start:end], raw_weights[start:end], 1 / decay)
+                for start, end in zip(table.offsets[:-1], table.offsets[1:])
+            ],
+        )
+
+    def update(self, attempt_row: pd.Series) -> None:
+        """
+        Adds one attempt, given as its segment times indexed by segment like a row of segment_data.
+        """
+        attempt_times = attempt_row.dropna()
+        positions = self.segments.get_indexer(attempt_times.index)
+        if (positions < 0).any():
+            raise ValueError(f"Segments {list(attempt_times.index[positions < 0])} are not in the distribution")
+        new_times = attempt_times.to_numpy(dtype="timedelta64[ns]").view(np.int64)
+
+        for position, time in zip(positions, new_times):
+            self._segment_nodes[position].insert(int(time), self.decay)
+            self._normalized[position] = None
+        self._nodes = None
+
+    @property
+    def nodes(self) -> QuantileNodes:
+        if self._nodes is None:
+            self._nodes = self._get_nodes()
+        return self._nodes
+
+    def _get_nodes(self) -> QuantileNodes:
+        filled = [position for position, segment in enumerate(self._segment_nodes) if segment.count]
+        for position in filled:
+            if self._normalized[position] is None:
+                self._normalized[position] = self._segment_nodes[position].normalize(self.interpolate)
+        weights, quantiles = zip(*(self._normalized[position] for position in filled))
+        counts = [self._segment_nodes[position].count for position in filled]
+        return QuantileNodes(
+            segments=self.segments[filled],
+            offsets=np.append(0, np.cumsum(counts)),
+            times=np.concatenate([
+                self._segment_nodes[position].times[:count] for position, count in zip(filled, counts)
+            ]).view("timedelta64[ns]"),
+            quantiles=np.concatenate(quantiles),
+            weights=np.concatenate(weights),
+            interpolate=self.interpolate,
+        )
+
+    @property
+    def segment_count(self) -> int:
+        return self.nodes.segment_count
+
+    def get_quantile_times(self, quantiles: pd.Series | float) -> pd.DataFrame:
+        quantiles = self.nodes.broadcast_quantiles(quantiles)
+        return self.nodes.to_frame(quantiles, self.nodes.get_times(quantiles.to_numpy()))
+
+    def get_quantile_time_batch(
+        self,
+        quantiles: np.ndarray,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> QuantileTimeBatch:
+        return self.nodes.get_time_batch(quantiles, chunk_size)
@@ -0,0 +1,270 @@
+# -*- coding: utf-8 -*-
+"""
+Created on 2026-10-18
+
+@author: brassbeat
+"""
+from typing import Self
+
+import attrs
+import numpy as np
+import pandas as pd
+
+from ls_analysis.data.enums import IndexCategory
+from ls_analysis.data.sorted_segments import SortedSegmentTable
+from ls_analysis.distributions.enums import DistributionColumn
+
+_NOT_A_TIME = np.timedelta64("NaT", "ns")
+DEFAULT_CHUNK_SIZE = 4096
+
+
+@attrs.define
+class QuantileTimeBatch:
+    """
+    segment_times:  (n_runs, n_segments) segment time of every requested quantile, timedelta64[ns]
+    run_times:      (n_runs,) total of each row, NaT if any of its segment times is NaT
+    """
+    segment_times: np.ndarray = attrs.field()
+    run_times: np.ndarray = attrs.field()
+
+
+@attrs.define
+class QuantileNodes:
+    """
+    Nodes of a distribution dataframe as flat arrays, segment after segment, sorted by time within each segment.
+
+    segments:   (n_segments,) segment labels
+    offsets:    (n_segments + 1,) nodes of segment i are at offsets[i]:offsets[i + 1]
+    times:      (n_nodes,) segment times, timedelta64[ns]
+    quantiles:  (n_nodes,) quantile of each node, the normalized weight of all earlier nodes of its segment
+    weights:    (n_nodes,) normalized weight of each node
+    interpolate: whether quantiles between nodes are interpolated linearly, or give the time of the lower node
+    """
+    segments: pd.Index = attrs.field()
+    offsets: np.ndarray = attrs.field()
+    times: np.ndarray = attrs.field()
+    quantiles: np.ndarray = attrs.field()
+    weights: np.ndarray = attrs.field()
+    interpolate: bool = attrs.field()
+    _segment_quantiles: tuple[np.ndarray, ...] = attrs.field(init=False, repr=False)
+    _index: pd.Index = attrs.field(init=False, repr=False)
+
+    def __attrs_post_init__(self):
+        self._index = pd.Index(np.asarray(self.segments, dtype=np.int64), name=IndexCategory.SEGMENT)
+        self._segment_quantiles = tuple(
+            self.quantiles[start:end]
+            for start, end in zip(self.offsets[:-1], self.offsets[1:])
+        )
+
+    @classmethod
+    def from_distribution(
+        cls,
+        distribution: pd.DataFrame,
+        quantile_column: DistributionColumn,
+        interpolate: bool,
+    ) -> Self:
+        """
+        distribution needs to be sorted by segment and segment time, as built by from_weight_func.
+        """
+        segment_labels = distribution.index.get_level_values(IndexCategory.SEGMENT)
+        is_segment_start = np.ones(len(segment_labels), dtype=bool)
+        is_segment_start[1:] = segment_labels[1:] != segment_labels[:-1]
+        starts = np.flatnonzero(is_segment_start)
+
+        return cls(
+            segments=segment_labels[starts],
+            offsets=np.append(starts, len(segment_labels)),
+            times=distribution[DistributionColumn.SEGMENT_TIME].to_numpy(dtype="timedelta64[ns]"),
+            quantiles=distribution[quantile_column].to_numpy(dtype=np.float64),
+            weights=distribution[DistributionColumn.NODE_WEIGHT].to_numpy(dtype=np.float64),
+            interpolate=interpolate,
+        )
+
+    @property
+    def segment_count(self) -> int:
+        return len(self.segments)
+
+    @property
+    def run_time_bounds(self) -> tuple[np.timedelta64, np.timedelta64]:
+        """
+        Sums of the fastest and of the slowest node of every segment, bounding every run made of node times.
+        """
+        return self.times[self.offsets[:-1]].sum(), self.times[self.offsets[1:] - 1].sum()
+
+    def get_lower_nodes(self, quantiles: np.ndarray) -> np.ndarray:
+        """
+        Position of the last node with a quantile at most the requested one, per segment, or -1 if there is none.
+        quantiles has shape (..., n_segments), and so does the result.
+        """
+        quantiles = np.asarray(quantiles, dtype=np.float64)
+        found = np.empty(quantiles.shape, dtype=np.int64)
+        for segment, segment_quantiles in enumerate(self._segment_quantiles):
+            found[..., segment] = segment_quantiles.searchsorted(quantiles[..., segment], side="right")
+        return np.where(found > 0, self.offsets[:-1] + found - 1, -1)
+
+    def _is_last_node(self, positions: np.ndarray) -> np.ndarray:
+        return positions == self.offsets[1:] - 1
+
+    def get_step_times(self, quantiles: np.ndarray) -> np.ndarray:
+        """
+        Time of the lower node of each requested quantile, NaT below the first node.
+        """
+        return self._get_step_times_at(self.get_lower_nodes(quantiles))
+
+    def get_interpolated_times(self, quantiles: np.ndarray) -> np.ndarray:
+        """
+        Linear interpolation between the nodes around each requested quantile, NaT below the first node.
+        Quantiles past the last node of a segment give its time.
+        """
+        positions = self.get_lower_nodes(quantiles)
+        return self._get_interpolated_times_at(quantiles, positions, self._is_last_node(positions))
+
+    def _get_step_times_at(self, positions: np.ndarray) -> np.ndarray:
+        return np.where(positions >= 0, self.times[positions], _NOT_A_TIME)
+
+    def _get_interpolated_times_at(
+        self,
+        quantiles: np.ndarray,
+        positions: np.ndarray,
+        is_last_node: np.ndarray,
+    ) -> np.ndarray:
+        quantiles = np.asarray(quantiles, dtype=np.float64)
+        is_found = positions >= 0
+        lower = np.where(is_found, positions, 0)
+        upper = np.where(is_last_node | ~is_found, lower, lower + 1)
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            proportions = np.where(
+                upper > lower,
+                (quantiles - self.quantiles[lower]) / self.weights[lower],
+                0.,
+            )
+        interpolated = self.times[lower] + proportions * (self.times[upper] - self.times[lower])
+        return np.where(is_found, interpolated, _NOT_A_TIME)
+
+    def get_segment_times(self, segment: int, quantiles: np.ndarray) -> np.ndarray:
+        """
+        get_times for the segment at position segment only, for a 1-d array of quantiles.
+        """
+        found = self._segment_quantiles[segment].searchsorted(quantiles, side="right")
+        positions = np.where(found > 0, self.offsets[segment] + found - 1, -1)
+        if self.interpolate:
+            return self._get_interpolated_times_at(
+                quantiles, positions, positions == self.offsets[segment + 1] - 1
+            )
+        return self._get_step_times_at(positions)
+
+    def get_segment_cdf(self, segment: int, times: np.ndarray) -> np.ndarray:
+        """
+        Share of quantiles that give a time of at most times, for the segment at position segment.
+        times are int64 nanoseconds.
+        """
+        start, end = self.offsets[segment], self.offsets[segment + 1]
+        node_times = self.times[start:end].view(np.int64)
+        node_quantiles = self.quantiles[start:end]
+        if self.interpolate:
+            return np.interp(times, node_times, node_quantiles, left=0., right=1.)
+        upper_quantiles = np.append(node_quantiles[1:], 1.)
+        return np.append(0., upper_quantiles)[np.searchsorted(node_times, times, side="right")]
+
+    def get_times(self, quantiles: np.ndarray) -> np.ndarray:
+        if self.interpolate:
+            return self.get_interpolated_times(quantiles)
+        return self.get_step_times(quantiles)
+
+    def get_time_batch(self, quantiles: np.ndarray, chunk_size: int = DEFAULT_CHUNK_SIZE) -> QuantileTimeBatch:
+        """
+        Applies get_times to an (n_runs, n_segments) array of quantiles,
+        chunk_size rows at a time so intermediate arrays stay small however many runs are requested.
+        Columns are the segments in order.
+        """
+        quantiles = np.asarray(quantiles, dtype=np.float64)
+        if quantiles.ndim != 2 or quantiles.shape[1] != self.segment_count:
+            raise ValueError(
+                f"Expected quantiles of shape (n_runs, {self.segment_count}), got {quantiles.shape}"
+            )
+
+        segment_times = np.empty(quantiles.shape, dtype="timedelta64[ns]")
+        for start in range(0, len(quantiles), chunk_size):
+            segment_times[start:start + chunk_size] = self.get_times(quantiles[start:start + chunk_size])
+        return QuantileTimeBatch(
+            segment_times=segment_times,
+            run_times=segment_times.sum(axis=1),
+        )
+
+    def broadcast_quantiles(self, quantiles: pd.Series | float) -> pd.Series:
+        """
+        One quantile per segment, from a float or from a series indexed by segment.
+        """
+        if isinstance(quantiles, pd.Series):
+            if not quantiles.index.equals(self._index):
+                quantiles = quantiles.reindex(self._index)
+            return quantiles.astype(np.float64)
+        return pd.Series(np.full(self.segment_count, quantiles, dtype=np.float64), index=self._index)
+
+    def to_frame(self, quantiles: pd.Series, times: np.ndarray) -> pd.DataFrame:
+        return pd.DataFrame(
+            data={
+                DistributionColumn.QUANTILE: quantiles.to_numpy(),
+                DistributionColumn.SEGMENT_TIME: times,
+            },
+            index=quantiles.index,
+        )
+
+
+def normalize_node_weights(
+    raw_weights: np.ndarray,
+    offsets: np.ndarray,
+    drop_worst_weight: bool,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Normalized weight and prior cumulative weight of every node, for nodes laid out as in QuantileNodes.
+    Dropping the weight of the worst node of each segment leaves it only as the end of the interpolation.
+    """
+    weights = np.array(raw_weights, dtype=np.float64)
+    if drop_worst_weight:
+        weights[offsets[1:][offsets[1:] > offsets[:-1]] - 1] = 0.
+
+    prior_weights = np.zeros_like(weights)
+    for start, end in zip(offsets[:-1], offsets[1:]):
+        if end == start:
+            continue
+        # summing only earlier raw weights, as subtracting a node's own weight can cancel tiny earlier ones,
+        # and dividing once by their running total, so no prior quantile can round past 1
+        np.cumsum(weights[start:end - 1], out=prior_weights[start + 1:end])
+        total = prior_weights[end - 1] + weights[end - 1]
+        weights[start:end] /= total
+        prior_weights[start:end] /= total
+    return weights, prior_weights
+
+
+def get_distribution_frame(
+    table: SortedSegmentTable,
+    weights: np.ndarray,
+    quantile_column: DistributionColumn,
+    drop_worst_weight: bool,
+) -> pd.DataFrame:
+    """
+    Distribution dataframe from sorted segment times and an (n_attempts, n_segments) array of raw weights,
+    leaving out times with a NaN weight.
+    """
+    time_weights = table.get_time_values(weights)
+    is_node = ~np.isnan(time_weights)
+    segment_positions = table.segment_positions[is_node]
+    offsets = np.append(0, np.cumsum(np.bincount(segment_positions, minlength=len(table.segments))))
+    node_weights, prior_weights = normalize_node_weights(time_weights[is_node], offsets, drop_worst_weight)
+
+    return pd.DataFrame(
+        data={
+            DistributionColumn.SEGMENT_TIME: table.times[is_node].view("timedelta64[ns]"),
+            DistributionColumn.NODE_WEIGHT: node_weights,
+            quantile_column: prior_weights,
+        },
+        index=pd.MultiIndex.from_arrays(
+            [
+                pd.array(table.attempts[table.attempt_positions[is_node]], dtype="Int64"),
+                table.segments[segment_positions],
+            ],
+            names=[IndexCategory.ATTEMPT, IndexCategory.SEGMENT],
+        ),
+    ).rename_axis(columns=IndexCategory.STATISTIC)
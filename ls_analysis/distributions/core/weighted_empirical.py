@@ -4,10 +4,18 @@ Created on 2024-05-15
 @author: brassbeat
 """
 import attrs
+import numpy as np
 import pandas as pd
 
 from ls_analysis.data.livesplit_data import LivesplitData
+from ls_analysis.data.sorted_segments import SortedSegmentTable
 from ls_analysis.data.enums import IndexCategory
+from ls_analysis.distributions.core.quantile_nodes import (
+    DEFAULT_CHUNK_SIZE,
+    QuantileNodes,
+    QuantileTimeBatch,
+    get_distribution_frame,
+)
 from ls_analysis.distributions.enums import DistributionColumn
 
 
@@ -24,6 +32,14 @@ class WeightedEmpiricalDistribution:
             "prior_cumulative_weight"
     """
     distribution: pd.DataFrame = attrs.field()
+    _nodes: QuantileNodes = attrs.field(init=False, repr=False)
+
+    def __attrs_post_init__(self):
+        self._nodes = QuantileNodes.from_distribution(
+            self.distribution,
+            DistributionColumn.PRIOR_CUMULATIVE_WEIGHT,
+            interpolate=False,
+        )
 
     @classmethod
     def from_weight_func(
@@ -32,10 +48,34 @@ class WeightedEmpiricalDistribution:
         weight_func,
         *args,
         **kwargs,
+    ):
+        segment_data = data.segment_data
+        weight_data = segment_data.apply(weight_func, args=args, **kwargs)
+        table = data.sorted_segments
+        weights = (
+            weight_data
+            .reindex(columns=pd.Index(table.segments))
+            .to_numpy(dtype=np.float64, na_value=np.nan)
+        )
+        return cls.from_sorted_segments(table, weights)
+
+    @classmethod
+    def from_weight_kernel(
+        cls,
+        data: LivesplitData,
+        weight_kernel,
+        *args,
+        **kwargs,
     ):
         """
-        segment_data is expected to be a simple table,
-            with attempts as index and segments as column names
+        Like from_weight_func, with a kernel from weights.kernels giving the weights of every segment in one pass.
+        """
+        return cls.from_sorted_segments(data.sorted_segments, weight_kernel(data.store, *args, **kwargs))
+
+    @classmethod
+    def from_sorted_segments(cls, table: SortedSegmentTable, weights: np.ndarray):
+        """
+        weights holds a raw weight for every attempt and segment of table, NaN for times to leave out
 
         returned dataframe index:
             Layer "attempt"
@@ -46,87 +86,31 @@ class WeightedEmpiricalDistribution:
                 "node_weight"
                 "prior_cumulative_weight"
         """
-        segment_data = data.segment_data
-        weight_data = segment_data.apply(weight_func, args=args, **kwargs)
-        combined_data = pd.concat(
-            [
-                segment_data.rename(
-                    columns=lambda idx: (idx, DistributionColumn.SEGMENT_TIME)
-                ),
-                weight_data.rename(
-                    columns=lambda idx: (idx, DistributionColumn.NODE_WEIGHT)
-                ),
-            ],
-            axis=1,
+        return cls(
+            get_distribution_frame(table, weights, DistributionColumn.PRIOR_CUMULATIVE_WEIGHT, drop_worst_weight=False)
         )
 
-        combined_data.columns = pd.MultiIndex.from_tuples(
-            combined_data.columns,
-            names=[
-                IndexCategory.SEGMENT,
-                IndexCategory.STATISTIC,
-            ]
-        )
-
-        long_data: pd.DataFrame = (
-            combined_data
-            .stack(level=IndexCategory.SEGMENT, future_stack=True)
-            .dropna()
-        )
-
-        sorted_segments = (
-            long_data
-            .sort_values(
-                by=[
-                    IndexCategory.SEGMENT,
-                    DistributionColumn.SEGMENT_TIME
-                ]
-            )
-        )
-
-        sorted_segments[DistributionColumn.PRIOR_CUMULATIVE_WEIGHT] = (
-            sorted_segments[DistributionColumn.NODE_WEIGHT]
-            .groupby(by=IndexCategory.SEGMENT)
-            .shift(1, fill_value=0)
-            .groupby(by=IndexCategory.SEGMENT)
-            .cumsum()
-        )
-
-        # normalize weight of each segment block
-        total_weights: pd.Series = (
-            sorted_segments[DistributionColumn.NODE_WEIGHT]
-            .rename("total_weight")
-            .groupby(by=IndexCategory.SEGMENT)
-            .sum()
-        )
-
-        sorted_segments[DistributionColumn.NODE_WEIGHT] /= total_weights
-        sorted_segments[DistributionColumn.PRIOR_CUMULATIVE_WEIGHT] /= total_weights
-
-        return cls(sorted_segments)
+    @property
+    def nodes(self) -> QuantileNodes:
+        return self._nodes
 
     @property
     def segment_count(self) -> int:
         return self.distribution.index.get_level_values(IndexCategory.SEGMENT).nunique()
 
     def get_quantile_times(self, quantiles: pd.Series | float) -> pd.DataFrame:
-        node_is_lower = (
-            self.distribution[
-                DistributionColumn.PRIOR_CUMULATIVE_WEIGHT
-            ]
-            .le(
-                quantiles
-            )
-        )
-        segments = (
-            self.distribution[DistributionColumn.SEGMENT_TIME]
-            .loc[node_is_lower]
-            .groupby(by="segment", sort=False, )
-            .last()
-        )
-        return pd.DataFrame(
-            data={
-                DistributionColumn.QUANTILE: quantiles,
-                DistributionColumn.SEGMENT_TIME: segments
-            }
+        quantiles = self._nodes.broadcast_quantiles(quantiles)
+        return self._nodes.to_frame(
+            quantiles,
+            self._nodes.get_step_times(quantiles.to_numpy()),
         )
+
+    def get_quantile_time_batch(
+        self,
+        quantiles: np.ndarray,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> QuantileTimeBatch:
+        """
+        Segment times of many runs at once, one row of per-segment quantiles for each run.
+        """
+        return self._nodes.get_time_batch(quantiles, chunk_size)
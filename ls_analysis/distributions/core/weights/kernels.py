@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+"""
+Created on 2026-10-18
+
+@author: brassbeat
+
+Weight kernels for from_weight_kernel.
+Each takes the array store of the data and returns an (n_attempts, n_segments) float array of node weights,
+NaN where an attempt has no time on a segment or is left out of the distribution.
+"""
+import numpy as np
+import pandas as pd
+
+from ls_analysis.data.array_store import ArrayStore
+from ls_analysis.data.enums import AttemptStat
+
+
+def _get_present_times(store: ArrayStore) -> np.ndarray:
+    return ~store.segment_stats[AttemptStat.SEGMENT_TIME].is_missing
+
+
+def _get_later_counts(is_present: np.ndarray) -> np.ndarray:
+    # number of later attempts with a time on the same segment
+    counts = is_present.astype(np.int64)
+    return counts.sum(axis=0) - counts.cumsum(axis=0)
+
+
+def get_uniform_weights(store: ArrayStore) -> np.ndarray:
+    return np.where(_get_present_times(store), 1., np.nan)
+
+
+def get_count_decay_weights(store: ArrayStore, decay: float) -> np.ndarray:
+    """
+    decay ** n for a segment time followed by n later times of the same segment, as exponential.get_weights.
+    """
+    is_present = _get_present_times(store)
+    return np.where(is_present, np.power(decay, _get_later_counts(is_present), dtype=np.float64), np.nan)
+
+
+def get_window_weights(store: ArrayStore, window: int) -> np.ndarray:
+    """
+    Equal weights for the window latest times of each segment, leaving out older ones.
+    """
+    is_present = _get_present_times(store)
+    return np.where(is_present & (_get_later_counts(is_present) < window), 1., np.nan)
+
+
+def get_time_decay_weights(store: ArrayStore, half_life: pd.Timedelta) -> np.ndarray:
+    """
+    Halves the weight of a segment time for every half_life its attempt started before the latest attempt.
+    Attempts without a start time are taken to start with the attempt before them.
+    """
+    starts = store.attempt_stats[AttemptStat.START_OF_ATTEMPT]
+    if starts.is_missing.all():
+        raise ValueError("No attempt start times to weight by")
+
+    known = np.where(starts.is_missing, -1, np.arange(len(starts.values)))
+    known = np.maximum.accumulate(known)
+    known[known < 0] = np.flatnonzero(~starts.is_missing)[0]
+    start_times = starts.values[known]
+
+    ages = (start_times.max() - start_times) / pd.Timedelta(half_life).value
+    attempt_weights = np.exp2(-ages)
+    return np.where(_get_present_times(store), attempt_weights[:, np.newaxis], np.nan)
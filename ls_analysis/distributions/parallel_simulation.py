@@ -0,0 +1,218 @@
+# -*- coding: utf-8 -*-
+"""
+Created on 2026-10-18
+
+@author: brassbeat
+"""
+from collections.abc import Iterable
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing.shared_memory import SharedMemory
+from typing import Self
+
+import attrs
+import numpy as np
+import pandas as pd
+
+from ls_analysis.distributions.core.interpolated import InterpolatedDistribution
+from ls_analysis.distributions.core.quantile_nodes import QuantileNodes
+from ls_analysis.distributions.core.weighted_empirical import WeightedEmpiricalDistribution
+from ls_analysis.distributions.enums import DistributionColumn
+from ls_analysis.distributions.random_splits import DEFAULT_BATCH_SIZE, draw_run_quantiles
+
+DEFAULT_TASK_SIZE = 1 << 20
+DEFAULT_BIN_COUNT = 10_000
+
+_SHARED_ARRAYS = ("segments", "offsets", "times", "quantiles", "weights")
+
+
+@attrs.define
+class RunTimeSummary:
+    """
+    Mergeable summary of simulated run times.
+
+    bin_edges:      (n_bins + 1,) edges of the run time histogram, ns, spanning every time the distribution can give
+    counts:         (n_bins,) runs per histogram bin
+    target_times:   (n_targets,) ns
+    beat_counts:    (n_targets,) runs faster than each target time
+    run_count:      number of simulated runs
+    """
+    bin_edges: np.ndarray = attrs.field()
+    counts: np.ndarray = attrs.field()
+    target_times: np.ndarray = attrs.field()
+    beat_counts: np.ndarray = attrs.field()
+    run_count: int = attrs.field(default=0)
+
+    @classmethod
+    def empty(cls, bin_edges: np.ndarray, target_times: np.ndarray) -> Self:
+        return cls(
+            bin_edges=bin_edges,
+            counts=np.zeros(len(bin_edges) - 1, dtype=np.int64),
+            target_times=target_times,
+            beat_counts=np.zeros(len(target_times), dtype=np.int64),
+        )
+
+    def add(self, run_times: np.ndarray) -> None:
+        run_times = run_times.view(np.int64)
+        low, high = self.bin_edges[0], self.bin_edges[-1]
+        bins = ((run_times - low) * (len(self.counts) / (high - low))).astype(np.int64)
+        self.counts += np.bincount(np.clip(bins, 0, len(self.counts) - 1), minlength=len(self.counts))
+        self.beat_counts += (run_times[:, np.newaxis] < self.target_times).sum(axis=0)
+        self.run_count += len(run_times)
+
+    def merge(self, other: Self) -> Self:
+        if not (
+            np.array_equal(self.bin_edges, other.bin_edges)
+            and np.array_equal(self.target_times, other.target_times)
+        ):
+            raise ValueError("Only summaries with the same histogram bins and target times can be merged")
+        return RunTimeSummary(
+            bin_edges=self.bin_edges,
+            counts=self.counts + other.counts,
+            target_times=self.target_times,
+            beat_counts=self.beat_counts + other.beat_counts,
+            run_count=self.run_count + other.run_count,
+        )
+
+    def get_beat_probabilities(self) -> pd.Series:
+        return pd.Series(
+            data=self.beat_counts / self.run_count,
+            index=pd.Index(self.target_times.view("timedelta64[ns]"), name="target_time"),
+            name="beat_probability",
+        )
+
+    def get_run_time_quantiles(self, quantiles: list[float] | np.ndarray) -> pd.Series:
+        """
+        Quantiles of the simulated run times, interpolated linearly within histogram bins.
+        """
+        cumulative_counts = np.concatenate([[0], np.cumsum(self.counts)]) / self.run_count
+        values = np.interp(quantiles, cumulative_counts, self.bin_edges)
+        return pd.Series(
+            data=values.astype(np.int64).view("timedelta64[ns]"),
+            index=pd.Index(quantiles, name=DistributionColumn.QUANTILE),
+            name=DistributionColumn.SEGMENT_TIME,
+        )
+
+
+def _summarize_runs(
+    nodes: QuantileNodes,
+    seed: np.random.SeedSequence,
+    run_count: int,
+    difficulty: float,
+    batch_size: int,
+    bin_edges: np.ndarray,
+    target_times: np.ndarray,
+) -> RunTimeSummary:
+    rng = np.random.default_rng(seed)
+    summary = RunTimeSummary.empty(bin_edges, target_times)
+    for start in range(0, run_count, batch_size):
+        quantiles = draw_run_quantiles(rng, min(batch_size, run_count - start), nodes.segment_count, difficulty)
+        summary.add(nodes.get_time_batch(quantiles).run_times)
+    return summary
+
+
+def _share_nodes(nodes: QuantileNodes) -> tuple[SharedMemory, dict]:
+    arrays = {
+        "segments": np.asarray(nodes.segments, dtype=np.int64),
+        "offsets": nodes.offsets,
+        "times": nodes.times,
+        "quantiles": nodes.quantiles,
+        "weights": nodes.weights,
+    }
+    memory = SharedMemory(create=True, size=max(sum(array.nbytes for array in arrays.values()), 1))
+
+    layout = {}
+    position = 0
+    for name in _SHARED_ARRAYS:
+        array = arrays[name]
+        np.ndarray(array.shape, array.dtype, buffer=memory.buf, offset=position)[...] = array
+        layout[name] = (position, array.dtype.str, array.shape)
+        position += array.nbytes
+
+    return memory, {"name": memory.name, "layout": layout, "interpolate": nodes.interpolate}
+
+
+# set in each worker process by _attach_nodes
+_worker_memory: SharedMemory | None = None
+_worker_nodes: QuantileNodes | None = None
+
+
+def _attach_nodes(description: dict) -> None:
+    global _worker_memory, _worker_nodes
+    _worker_memory = SharedMemory(name=description["name"])
+
+    arrays = {
+        name: np.ndarray(shape, dtype, buffer=_worker_memory.buf, offset=position)
+        for name, (position, dtype, shape) in description["layout"].items()
+    }
+    _worker_nodes = QuantileNodes(
+        segments=pd.Index(arrays["segments"]),
+        offsets=arrays["offsets"],
+        times=arrays["times"],
+        quantiles=arrays["quantiles"],
+        weights=arrays["weights"],
+        interpolate=description["interpolate"],
+    )
+
+
+def _summarize_worker_runs(*args) -> RunTimeSummary:
+    return _summarize_runs(_worker_nodes, *args)
+
+
+def simulate_run_summary(
+    distribution: InterpolatedDistribution | WeightedEmpiricalDistribution,
+    run_count: int,
+    target_times: Iterable[pd.Timedelta] = (),
+    difficulty: float = 1.,
+    seed: int | None = None,
+    max_workers: int | None = None,
+    task_size: int = DEFAULT_TASK_SIZE,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    bin_count: int = DEFAULT_BIN_COUNT,
+) -> RunTimeSummary:
+    """
+    Simulates run_count runs like simulate_runs, split into tasks of task_size runs spread over worker processes,
+    keeping only a mergeable summary of the run times.
+
+    The distribution arrays are placed in shared memory once, rather than being sent along with every task.
+    Every task draws from its own stream spawned from seed, and task summaries only add up counts,
+    so a seed gives the same summary for any number of workers.
+    """
+    seeds = np.random.SeedSequence(seed).spawn(-(-run_count // task_size))
+    task_sizes = [min(task_size, run_count - start) for start in range(0, run_count, task_size)]
+
+    nodes = distribution.nodes
+    fastest, slowest = nodes.run_time_bounds
+    bin_edges = np.linspace(
+        fastest.astype(np.int64),
+        max(slowest.astype(np.int64), fastest.astype(np.int64) + 1),
+        bin_count + 1,
+    )
+    target_times = np.array([pd.Timedelta(target).value for target in target_times], dtype=np.int64)
+    summary = RunTimeSummary.empty(bin_edges, target_times)
+
+    if max_workers == 1:
+        for task_seed, size in zip(seeds, task_sizes):
+            summary = summary.merge(
+                _summarize_runs(nodes, task_seed, size, difficulty, batch_size, bin_edges, target_times)
+            )
+        return summary
+
+    memory, description = _share_nodes(nodes)
+    try:
+        with ProcessPoolExecutor(
+            max_workers=max_workers,
+            initializer=_attach_nodes,
+            initargs=(description,),
+        ) as executor:
+            futures = [
+                executor.submit(
+                    _summarize_worker_runs, task_seed, size, difficulty, batch_size, bin_edges, target_times
+                )
+                for task_seed, size in zip(seeds, task_sizes)
+            ]
+            for future in as_completed(futures):
+                summary = summary.merge(future.result())
+    finally:
+        memory.close()
+        memory.unlink()
+    return summary
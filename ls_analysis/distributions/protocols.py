@@ -4,15 +4,25 @@ Created on 2023/05/18
 
 @author: brassbeat
 """
+import numpy as np
 import pandas as pd
 
 from typing import Protocol
 
+from ls_analysis.distributions.core.quantile_nodes import QuantileNodes, QuantileTimeBatch
+
 
 class SegmentDistribution(Protocol):
+    @property
+    def nodes(self) -> QuantileNodes:
+        ...
+
     @property
     def segment_count(self) -> int:
         ...
 
     def get_quantile_times(self, quantiles: pd.Series | float) -> pd.DataFrame:
         ...
+
+    def get_quantile_time_batch(self, quantiles: np.ndarray, chunk_size: int = ...) -> QuantileTimeBatch:
+        ...
@@ -5,12 +5,17 @@ Created on 2024/05/24
 """
 import random
 
+import attrs
+import numpy as np
 import pandas as pd
 
 from ls_analysis.data.enums import IndexCategory
 from ls_analysis.distributions.enums import DistributionColumn
 from ls_analysis.distributions.protocols import SegmentDistribution
 
+_TAIL_SIZE_PER_DIFFICULTY = 0.05
+DEFAULT_BATCH_SIZE = 65536
+
 
 def draw_quantile_segments(distribution: pd.DataFrame, quantiles: pd.Series) -> pd.Series:
     """
@@ -50,10 +55,10 @@ def roll_random_segments(
         seed: float = None
 ) -> pd.DataFrame:
 
-    if seed:
+    if seed is not None:
         random.seed(seed)
 
-    dropped_tail_size = 0.05 * difficulty
+    dropped_tail_size = _TAIL_SIZE_PER_DIFFICULTY * difficulty
     segment_count = distribution.segment_count
 
     rolled_quantiles = (
@@ -70,3 +75,86 @@ def roll_random_segments(
         .mul(1 - dropped_tail_size)
     )
     return distribution.get_quantile_times(rolled_quantiles)
+
+
+def draw_run_quantiles(
+        rng: np.random.Generator,
+        run_count: int,
+        segment_count: int,
+        difficulty: float,
+) -> np.ndarray:
+    """
+    (run_count, segment_count) quantiles transformed like roll_random_segments:
+    raised to the power of difficulty, then scaled down to drop the slowest tail.
+    """
+    dropped_tail_size = _TAIL_SIZE_PER_DIFFICULTY * difficulty
+    return rng.random((run_count, segment_count)) ** difficulty * (1 - dropped_tail_size)
+
+
+def get_drawn_quantile_cdf(quantiles: np.ndarray, difficulty: float) -> np.ndarray:
+    """
+    Probability of draw_run_quantiles drawing a quantile of at most quantiles.
+    """
+    dropped_tail_size = _TAIL_SIZE_PER_DIFFICULTY * difficulty
+    return np.minimum(quantiles / (1 - dropped_tail_size), 1.) ** (1 / difficulty)
+
+
+@attrs.define
+class SimulatedRuns:
+    """
+    run_times:      (n_runs,) final time of every simulated run, timedelta64[ns]
+    segment_times:  (n_runs, n_segments) segment times of every run, or None if they were not kept
+    """
+    run_times: np.ndarray = attrs.field()
+    segment_times: np.ndarray | None = attrs.field(default=None)
+
+    @property
+    def run_count(self) -> int:
+        return len(self.run_times)
+
+    def get_beat_probability(self, target_time: pd.Timedelta) -> float:
+        """
+        Share of simulated runs faster than target_time.
+        """
+        return float(np.mean(self.run_times < np.timedelta64(pd.Timedelta(target_time).value, "ns")))
+
+    def get_run_time_quantiles(self, quantiles: list[float] | np.ndarray) -> pd.Series:
+        values = np.quantile(self.run_times.view(np.int64), quantiles, method="inverted_cdf")
+        return pd.Series(
+            data=values.view("timedelta64[ns]"),
+            index=pd.Index(quantiles, name=DistributionColumn.QUANTILE),
+            name=DistributionColumn.SEGMENT_TIME,
+        )
+
+
+def simulate_runs(
+        distribution: SegmentDistribution,
+        run_count: int,
+        difficulty: float = 1.,
+        seed: int | np.random.SeedSequence | None = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        keep_segment_times: bool = False,
+) -> SimulatedRuns:
+    """
+    Simulates run_count runs, drawing quantiles like roll_random_segments from a numpy Generator,
+    batch_size runs at a time. The same seed gives the same runs for any batch_size.
+    """
+    rng = np.random.default_rng(seed)
+    segment_count = distribution.segment_count
+
+    run_times = np.empty(run_count, dtype="timedelta64[ns]")
+    segment_times = (
+        np.empty((run_count, segment_count), dtype="timedelta64[ns]")
+        if keep_segment_times
+        else None
+    )
+    for start in range(0, run_count, batch_size):
+        end = min(start + batch_size, run_count)
+        batch = distribution.get_quantile_time_batch(
+            draw_run_quantiles(rng, end - start, segment_count, difficulty)
+        )
+        run_times[start:end] = batch.run_times
+        if keep_segment_times:
+            segment_times[start:end] = batch.segment_times
+
+    return SimulatedRuns(run_times, segment_times)
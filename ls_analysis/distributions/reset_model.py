@@ -0,0 +1,268 @@
+# -*- coding: utf-8 -*-
+"""
+Created on 2026-10-18
+
+@author: brassbeat
+"""
+from typing import Self
+
+import attrs
+import numpy as np
+import pandas as pd
+from scipy import signal
+
+from ls_analysis.data.enums import AttemptStat, IndexCategory
+from ls_analysis.data.livesplit_data import LivesplitData
+from ls_analysis.distributions.core.interpolated import InterpolatedDistribution
+from ls_analysis.distributions.core.weighted_empirical import WeightedEmpiricalDistribution
+from ls_analysis.distributions.random_splits import DEFAULT_BATCH_SIZE
+from ls_analysis.distributions.run_time_distribution import DEFAULT_RESOLUTION, get_segment_pmfs
+
+_MAX_POLICY_ITERATIONS = 100
+_POLICY_TOLERANCE = 1e-9
+
+
+@attrs.define
+class PersonalBestOutlook:
+    """
+    Expected cost of beating target_time, resetting only as often as the runner does on each segment,
+    and when also resetting at a split whenever continuing is expected to take longer than starting over.
+
+    reset_thresholds: per split, the split time from which resetting is optimal, NaT if continuing always is
+    """
+    target_time: pd.Timedelta = attrs.field()
+    attempts_per_pb: float = attrs.field()
+    time_per_pb: pd.Timedelta = attrs.field()
+    optimal_attempts_per_pb: float = attrs.field()
+    optimal_time_per_pb: pd.Timedelta = attrs.field()
+    reset_thresholds: pd.Series = attrs.field()
+
+    @property
+    def time_saved_by_resetting(self) -> pd.Timedelta:
+        return self.time_per_pb - self.optimal_time_per_pb
+
+
+@attrs.define
+class SimulatedAttempts:
+    """
+    attempt_times:  (n_attempts,) time spent on every simulated attempt, timedelta64[ns]
+    is_pb:          (n_attempts,) whether the attempt finished faster than the target time
+    """
+    attempt_times: np.ndarray = attrs.field()
+    is_pb: np.ndarray = attrs.field()
+
+    @property
+    def attempts_per_pb(self) -> float:
+        return len(self.is_pb) / self.is_pb.sum()
+
+    @property
+    def time_per_pb(self) -> pd.Timedelta:
+        return pd.Timedelta(int(self.attempt_times.view(np.int64).sum() / self.is_pb.sum()), "ns")
+
+
+def _get_expectation_after(values: np.ndarray, pmf: np.ndarray, offset: int) -> np.ndarray:
+    # sum_j pmf[j] * values[i + offset + j] for every state i, with values 0 past the end
+    correlated = signal.fftconvolve(values, pmf[::-1])
+    start = offset + len(pmf) - 1
+    expectation = np.zeros(len(values))
+    available = correlated[start:start + len(values)]
+    expectation[:len(available)] = available
+    return expectation
+
+
+@attrs.define
+class ResetModel:
+    """
+    Attempts as a Markov chain over segments: on reaching a segment, the attempt is reset on it with its hazard,
+    after its mean reset time, and otherwise completes it with a time drawn from its completion distribution.
+
+    resolution:         width of the time bins of the completion distributions, ns
+    segment_pmfs:       per segment, probability of every completion time bin
+    segment_offsets:    (n_segments,) first completion time bin of every segment, in bins
+    completion_means:   (n_segments,) expected completion time of every segment, ns
+    reset_hazards:      (n_segments,) probability of resetting on a segment, once reached
+    reset_means:        (n_segments,) expected time spent on a segment before resetting on it, ns
+    """
+    distribution: InterpolatedDistribution | WeightedEmpiricalDistribution = attrs.field()
+    resolution: int = attrs.field()
+    segment_pmfs: list[np.ndarray] = attrs.field()
+    segment_offsets: np.ndarray = attrs.field()
+    completion_means: np.ndarray = attrs.field()
+    reset_hazards: np.ndarray = attrs.field()
+    reset_means: np.ndarray = attrs.field()
+
+    @classmethod
+    def from_livesplit_data(
+        cls,
+        data: LivesplitData,
+        distribution: InterpolatedDistribution | WeightedEmpiricalDistribution,
+        resolution: pd.Timedelta = DEFAULT_RESOLUTION,
+    ) -> Self:
+        """
+        Reset hazards and mean reset times are taken from the reset statistics of data,
+        completion times from distribution, which should be built from the same data.
+        """
+        resolution = pd.Timedelta(resolution).value
+        pmfs, starts = get_segment_pmfs(distribution.nodes, resolution)
+        first_edges = starts - resolution // 2
+        bin_centers = [
+            first_edge + resolution * (np.arange(len(pmf)) + 0.5)
+            for pmf, first_edge in zip(pmfs, first_edges)
+        ]
+
+        segments = np.asarray(distribution.nodes.segments, dtype=np.int64)
+        reset_at = data.data[AttemptStat.RESET_AT, -1].to_numpy(dtype=np.float64, na_value=np.inf)
+        reset_counts = (reset_at == segments[:, np.newaxis]).sum(axis=1)
+        arrival_counts = (reset_at >= segments[:, np.newaxis]).sum(axis=1)
+        reset_means = (
+            data.data[AttemptStat.RESET_TIME]
+            .mean()
+            .reindex(pd.Index(segments, name=IndexCategory.SEGMENT))
+            .fillna(pd.Timedelta(0))
+            .to_numpy(dtype="timedelta64[ns]")
+            .view(np.int64)
+        )
+
+        return cls(
+            distribution=distribution,
+            resolution=resolution,
+            segment_pmfs=pmfs,
+            segment_offsets=first_edges // resolution,
+            completion_means=np.array([pmf @ centers for pmf, centers in zip(pmfs, bin_centers)]),
+            reset_hazards=reset_counts / np.maximum(arrival_counts, 1),
+            reset_means=reset_means.astype(np.float64),
+        )
+
+    @property
+    def segment_count(self) -> int:
+        return len(self.segment_pmfs)
+
+    def _get_segment_costs(self) -> np.ndarray:
+        # expected time spent on each segment once reached
+        return self.reset_hazards * self.reset_means + (1 - self.reset_hazards) * self.completion_means
+
+    def _solve_policy(self, target_time: int, pb_value: float) -> tuple[float, float, list[np.ndarray]]:
+        """
+        Backward induction over (completed segments, elapsed time bin) for a given expected time per pb,
+        returning the expected attempt time and pb chance from the start, and the reset decision of every split.
+        """
+        # bins sum lower bin edges, every completed segment adds half a bin to the center of the sum
+        state_count = int(np.ceil((target_time - self.segment_count * self.resolution / 2) / self.resolution))
+        state_count = max(state_count, 0)
+        pb_chances = np.ones(state_count)
+        attempt_times = np.zeros(state_count)
+        resets = []
+        costs = self._get_segment_costs()
+
+        for segment in reversed(range(self.segment_count)):
+            pmf = self.segment_pmfs[segment]
+            offset = self.segment_offsets[segment]
+            hazard = self.reset_hazards[segment]
+            pb_chances = (1 - hazard) * _get_expectation_after(pb_chances, pmf, offset)
+            attempt_times = costs[segment] + (1 - hazard) * _get_expectation_after(attempt_times, pmf, offset)
+
+            if segment > 0:
+                # deciding at the split before this segment, past the target nothing is worth continuing for
+                continue_values = np.multiply(
+                    pb_chances, pb_value, out=np.zeros(state_count), where=pb_chances > 0
+                )
+                is_reset = attempt_times > continue_values
+                pb_chances = np.where(is_reset, 0., pb_chances)
+                attempt_times = np.where(is_reset, 0., attempt_times)
+                resets.append(is_reset)
+
+        if state_count == 0:
+            return float(costs[0]), 0., [np.zeros(0, dtype=bool)] * (self.segment_count - 1)
+        return attempt_times[0], pb_chances[0], resets[::-1]
+
+    def get_pb_outlook(self, target_time: pd.Timedelta) -> PersonalBestOutlook:
+        """
+        Attempts and time per pb without extra resets follow from the renewal of independent attempts.
+        The optimal reset policy is found by alternating backward induction for a given time per pb
+        with updating that time to the one the induced policy achieves, until it stops improving.
+        """
+        target = pd.Timedelta(target_time).value
+        reach_chances = np.concatenate([[1.], np.cumprod(1 - self.reset_hazards)])
+        attempt_time = reach_chances[:-1] @ self._get_segment_costs()
+        pb_chance = reach_chances[-1] * self._get_finish_beat_chance(target)
+
+        pb_value = np.inf
+        for _ in range(_MAX_POLICY_ITERATIONS):
+            optimal_attempt_time, optimal_pb_chance, resets = self._solve_policy(target, pb_value)
+            new_pb_value = _per_pb(optimal_attempt_time, optimal_pb_chance)
+            if np.isfinite(pb_value) and abs(pb_value - new_pb_value) <= _POLICY_TOLERANCE * pb_value:
+                break
+            pb_value = new_pb_value
+
+        thresholds = []
+        for split, is_reset in enumerate(resets, start=1):
+            reset_states = np.flatnonzero(is_reset)
+            thresholds.append(
+                pd.Timedelta(int(reset_states[0] * self.resolution + split * self.resolution / 2), "ns")
+                if len(reset_states)
+                else pd.NaT
+            )
+
+        return PersonalBestOutlook(
+            target_time=pd.Timedelta(target),
+            attempts_per_pb=_per_pb(1., pb_chance),
+            time_per_pb=_to_timedelta(_per_pb(attempt_time, pb_chance)),
+            optimal_attempts_per_pb=_per_pb(1., optimal_pb_chance),
+            optimal_time_per_pb=_to_timedelta(pb_value),
+            reset_thresholds=pd.Series(
+                data=thresholds,
+                index=pd.Index(np.asarray(self.distribution.nodes.segments[:-1]), name=IndexCategory.SEGMENT),
+                name="reset_threshold",
+                dtype="timedelta64[ns]",
+            ),
+        )
+
+    def _get_finish_beat_chance(self, target_time: int) -> float:
+        run_pmf = self.segment_pmfs[0]
+        for pmf in self.segment_pmfs[1:]:
+            run_pmf = signal.fftconvolve(run_pmf, pmf)
+        first_center = self.segment_offsets.sum() * self.resolution + self.segment_count * self.resolution / 2
+        beating_bins = int(np.ceil((target_time - first_center) / self.resolution))
+        return float(np.clip(run_pmf[:max(beating_bins, 0)], 0., None).sum())
+
+    def simulate_attempts(
+        self,
+        attempt_count: int,
+        target_time: pd.Timedelta,
+        seed: int | np.random.SeedSequence | None = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+    ) -> SimulatedAttempts:
+        """
+        Simulates attempts without extra resets, batch_size at a time, to check or extend get_pb_outlook.
+        """
+        rng = np.random.default_rng(seed)
+        target = pd.Timedelta(target_time).value
+        attempt_times = np.empty(attempt_count, dtype=np.int64)
+        is_pb = np.empty(attempt_count, dtype=bool)
+
+        for start in range(0, attempt_count, batch_size):
+            end = min(start + batch_size, attempt_count)
+            segment_times = (
+                self.distribution
+                .get_quantile_time_batch(rng.random((end - start, self.segment_count)))
+                .segment_times
+                .view(np.int64)
+            )
+            is_reset = rng.random(segment_times.shape) < self.reset_hazards
+            reset_at = np.where(is_reset.any(axis=1), np.argmax(is_reset, axis=1), self.segment_count)
+            is_completed = np.arange(self.segment_count) < reset_at[:, np.newaxis]
+
+            completed_times = np.where(is_completed, segment_times, 0).sum(axis=1)
+            reset_times = np.append(self.reset_means, 0.)[reset_at].astype(np.int64)
+            attempt_times[start:end] = completed_times + reset_times
+            is_pb[start:end] = (reset_at == self.segment_count) & (completed_times < target)
+
+        return SimulatedAttempts(attempt_times.view("timedelta64[ns]"), is_pb)
+
+
+def _per_pb(value: float, pb_chance: float) -> float:
+    return value / pb_chance if pb_chance > 0 else np.inf
+
+
+def _to_timedelta(nanoseconds: float) -> pd.Timedelta:
+    return pd.Timedelta(int(nanoseconds), "ns") if np.isfinite(nanoseconds) else pd.NaT
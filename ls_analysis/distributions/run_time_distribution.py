@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+"""
+Created on 2026-10-18
+
+@author: brassbeat
+"""
+import attrs
+import numpy as np
+import pandas as pd
+from scipy import fft
+
+from ls_analysis.distributions.core.interpolated import InterpolatedDistribution
+from ls_analysis.distributions.core.quantile_nodes import QuantileNodes
+from ls_analysis.distributions.core.weighted_empirical import WeightedEmpiricalDistribution
+from ls_analysis.distributions.enums import DistributionColumn
+from ls_analysis.distributions.random_splits import get_drawn_quantile_cdf
+
+DEFAULT_RESOLUTION = pd.Timedelta(milliseconds=100)
+
+
+@attrs.define
+class RunTimeDistribution:
+    """
+    Distribution of every split time of a run, on a grid of equal time bins.
+
+    resolution:     width of a bin, ns
+    split_starts:   (n_segments,) center of the first bin of every split, ns
+    split_pmfs:     (n_segments, n_bins) probability of each bin of every split, the last split being the full run
+    """
+    resolution: int = attrs.field()
+    split_starts: np.ndarray = attrs.field()
+    split_pmfs: np.ndarray = attrs.field()
+
+    @property
+    def segment_count(self) -> int:
+        return len(self.split_starts)
+
+    def _get_bin_edges(self, split: int) -> np.ndarray:
+        first_edge = self.split_starts[split] - self.resolution / 2
+        return first_edge + self.resolution * np.arange(self.split_pmfs.shape[1] + 1)
+
+    def _get_cumulative(self, split: int) -> np.ndarray:
+        return np.append(0., np.cumsum(self.split_pmfs[split]))
+
+    def get_split_frame(self, split: int = -1) -> pd.DataFrame:
+        """
+        pmf and cdf of one split, indexed by bin center. split -1 is the full run.
+        """
+        centers = self.split_starts[split] + self.resolution * np.arange(self.split_pmfs.shape[1])
+        pmf = self.split_pmfs[split]
+        return pd.DataFrame(
+            data={"pmf": pmf, "cdf": np.cumsum(pmf)},
+            index=pd.Index(centers.view("timedelta64[ns]"), name=DistributionColumn.SEGMENT_TIME),
+        )
+
+    def get_beat_probability(self, target_time: pd.Timedelta, split: int = -1) -> float:
+        """
+        Probability of a split time below target_time, treating the probability of each bin as spread evenly over it.
+        """
+        return float(
+            np.interp(pd.Timedelta(target_time).value, self._get_bin_edges(split), self._get_cumulative(split))
+        )
+
+    def get_quantile_times(self, quantiles: list[float] | np.ndarray, split: int = -1) -> pd.Series:
+        values = np.interp(quantiles, self._get_cumulative(split), self._get_bin_edges(split))
+        return pd.Series(
+            data=values.astype(np.int64).view("timedelta64[ns]"),
+            index=pd.Index(quantiles, name=DistributionColumn.QUANTILE),
+            name=DistributionColumn.SEGMENT_TIME,
+        )
+
+
+def get_segment_pmfs(
+    nodes: QuantileNodes,
+    resolution: int,
+    difficulty: float | None = None,
+) -> tuple[list[np.ndarray], np.ndarray]:
+    """
+    Probability of every segment time bin of width resolution ns, per segment,
+    with the center of the first bin of each segment, a multiple of resolution plus half a bin.
+    """
+    pmfs = []
+    starts = np.empty(nodes.segment_count, dtype=np.int64)
+    for segment in range(nodes.segment_count):
+        first_time = nodes.times[nodes.offsets[segment]].view(np.int64)
+        last_time = nodes.times[nodes.offsets[segment + 1] - 1].view(np.int64)
+
+        first_edge = first_time // resolution * resolution
+        edges = first_edge + resolution * np.arange((last_time - first_edge) // resolution + 2)
+        cdf = nodes.get_segment_cdf(segment, edges)
+        if difficulty is not None:
+            cdf = get_drawn_quantile_cdf(cdf, difficulty)
+        pmfs.append(np.diff(cdf))
+        starts[segment] = first_edge + resolution // 2
+    return pmfs, starts
+
+
+def get_run_time_distribution(
+    distribution: InterpolatedDistribution | WeightedEmpiricalDistribution,
+    resolution: pd.Timedelta = DEFAULT_RESOLUTION,
+    difficulty: float | None = None,
+) -> RunTimeDistribution:
+    """
+    Convolves the segment distributions, discretised to bins of the given resolution, with one FFT,
+    giving the distribution of the full run as well as of every split along the way.
+
+    Without difficulty, quantiles are uniform over the whole distribution.
+    With a difficulty, they are drawn like roll_random_segments and simulate_runs do,
+    so the result matches what simulating with that difficulty converges to.
+    Each segment adds at most one bin width of discretisation error.
+    """
+    resolution = pd.Timedelta(resolution).value
+    pmfs, starts = get_segment_pmfs(distribution.nodes, resolution, difficulty)
+
+    bin_count = sum(len(pmf) for pmf in pmfs) - len(pmfs) + 1
+    fft_length = fft.next_fast_len(bin_count, real=True)
+    spectra = np.stack([fft.rfft(pmf, fft_length) for pmf in pmfs])
+    split_pmfs = fft.irfft(np.cumprod(spectra, axis=0), fft_length, axis=1)[:, :bin_count]
+
+    return RunTimeDistribution(
+        resolution=resolution,
+        split_starts=np.cumsum(starts),
+        split_pmfs=np.clip(split_pmfs, 0., None),
+    )
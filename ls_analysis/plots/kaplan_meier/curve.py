@@ -5,15 +5,19 @@ Created on 2024/05/30
 @author: brassbeat
 """
 import attrs
+import numpy as np
 from matplotlib import pyplot as plt
-from scipy import stats
 
-from statistics.core.censored_segment import CensoredSegment
+from ls_analysis.statistics.kaplan_meier import KaplanMeierTable
 
 
 @attrs.define
-class KaplanMeierCurve:
-    data: CensoredSegment
+class KaplanMeierTableCurve:
+    """
+    One segment of a KaplanMeierTable, drawn like scipy draws an ecdf, past both ends by 5% of its range.
+    """
+    table: KaplanMeierTable
+    segment: int
     name: str
 
     @property
@@ -22,11 +26,15 @@ class KaplanMeierCurve:
             "label": self.name
         }
 
-    @property
-    def cdf(self):
-        scipy_data = self.data.get_scipy_censored_data()
-        return stats.ecdf(scipy_data).cdf
-
     def plot(self, ax: plt.Axes, **kwargs):
         full_kwargs = kwargs | self._plot_kwargs
-        self.cdf.plot(ax, **full_kwargs)
+        times, survival = self.table.get_steps(self.segment)
+        if not len(times):
+            return
+        margin = np.ptp(times) * 0.05
+        ax.step(
+            np.concatenate([[times[0] - margin], times, [times[-1] + margin]]),
+            np.concatenate([[0.], 1 - survival, [1 - survival[-1]]]),
+            where="post",
+            **full_kwargs,
+        )
@@ -10,9 +10,9 @@ from matplotlib import pyplot as plt
 from matplotlib import ticker
 from matplotlib import axis
 
-from data.livesplit_data import LivesplitData
-from plots.kaplan_meier.curve import KaplanMeierCurve
-from statistics.core.censored_segment import CensoredSegment
+from ls_analysis.data.livesplit_data import LivesplitData
+from ls_analysis.plots.kaplan_meier.curve import KaplanMeierTableCurve
+from ls_analysis.statistics.kaplan_meier import KaplanMeierTable
 
 _TITLE_TEMPLATE = "Recorded Segment Times for {0.name}\nin {0.game} - {0.category}"
 
@@ -26,7 +26,7 @@ class KaplanMeierSegment:
     category: str
     name: str
 
-    _curves: list[KaplanMeierCurve] = attrs.field(factory=list, init=False)
+    _curves: list[KaplanMeierTableCurve] = attrs.field(factory=list, init=False)
 
     fig: plt.Figure = attrs.field(init=False)
     ax: plt.Axes = attrs.field(init=False)
@@ -41,8 +41,17 @@ class KaplanMeierSegment:
         self.fig, self.ax = plt.subplots()
 
     def draw_segment_from_data(self, full_data: LivesplitData, name: str):
-        segment_data = CensoredSegment.from_livesplit_data(full_data, self.segment, self.cutoff)
-        curve = KaplanMeierCurve(segment_data, name)
+        """
+        Builds the table of this figure's segment only; figures of every segment can share one table instead.
+        """
+        table = KaplanMeierTable.from_livesplit_data(full_data, self.cutoff, [self.segment])
+        self.draw_segment_from_table(table, name)
+
+    def draw_segment_from_table(self, table: KaplanMeierTable, name: str):
+        """
+        table needs to be built with the cutoff of this figure, and can be shared by the figures of every segment.
+        """
+        curve = KaplanMeierTableCurve(table, self.segment, name)
 
         self._curves.append(curve)
         curve.plot(self.ax, **self._plot_kwargs)
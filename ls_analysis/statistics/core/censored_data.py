@@ -4,71 +4,92 @@ Created on 2024-05-26
 @author: brassbeat
 """
 from collections.abc import Iterator
+from typing import Self
 
+import attrs
+import numpy as np
 import pandas as pd
 from scipy.stats import CensoredData
 
 from ls_analysis.data.livesplit_data import LivesplitData
-from ls_analysis.data.enums import AttemptStat, IndexCategory
-
-
-def _reshape_resets(segments_reset_on: pd.Series, times_upon_reset: pd.Series):
-    return (
-        pd.DataFrame(
-            data={
-                IndexCategory.SEGMENT: segments_reset_on,
-                times_upon_reset.name: times_upon_reset
-            }
-            # [segments_reset_on, times_upon_reset],
-            # columns=[IndexCategory.SEGMENT, times_upon_reset.name]
+from ls_analysis.data.enums import AttemptStat
+
+
+@attrs.define
+class CensoredSegmentTable:
+    """
+    Completed and reset times of every segment, in seconds, grouped by segment and in attempt order within each.
+
+    segments:           (n_segments,) segment numbers
+    uncensored:         (n_completed,) segment times of attempts that completed the segment
+    uncensored_offsets: (n_segments + 1,) completed times of segment i are at uncensored_offsets[i]:[i + 1]
+    censored:           (n_reset,) times upon reset of attempts reset on the segment
+    censored_offsets:   (n_segments + 1,) reset times of segment i are at censored_offsets[i]:[i + 1]
+    """
+    segments: np.ndarray = attrs.field()
+    uncensored: np.ndarray = attrs.field()
+    uncensored_offsets: np.ndarray = attrs.field()
+    censored: np.ndarray = attrs.field()
+    censored_offsets: np.ndarray = attrs.field()
+
+    @classmethod
+    def from_livesplit_data(cls, data: LivesplitData, cutoff: pd.Timestamp = None) -> Self:
+        """
+        Converts every time once, for all segments together.
+        With a cutoff, only attempts started at or after it are included.
+        """
+        store = data.store
+        included_rows = data.start_index.get_rows(cutoff) if cutoff else slice(None)
+
+        segment_seconds = store.segment_stats[AttemptStat.SEGMENT_TIME].get_rows(included_rows).to_seconds()
+        segment_positions, attempt_positions = np.nonzero(~np.isnan(segment_seconds.T))
+
+        reset_at = store.attempt_stats[AttemptStat.RESET_AT].get_rows(included_rows).values
+        reset_seconds = store.attempt_stats[AttemptStat.TIME_UPON_RESET].get_rows(included_rows).to_seconds()
+        reset_positions = np.searchsorted(store.segments, reset_at)
+        is_censored = (
+            (reset_positions < len(store.segments))
+            & (store.segments[np.minimum(reset_positions, len(store.segments) - 1)] == reset_at)
+            & ~np.isnan(reset_seconds)
+        )
+        censored_order = np.argsort(reset_positions[is_censored], kind="stable")
+
+        return cls(
+            segments=store.segments,
+            uncensored=segment_seconds[attempt_positions, segment_positions],
+            uncensored_offsets=_get_offsets(segment_positions, len(store.segments)),
+            censored=reset_seconds[is_censored][censored_order],
+            censored_offsets=_get_offsets(reset_positions[is_censored], len(store.segments)),
+        )
+
+    def get_times(self, segment: int) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Completed and reset times of one segment.
+        """
+        position = np.searchsorted(self.segments, segment)
+        if position == len(self.segments) or self.segments[position] != segment:
+            raise KeyError(segment)
+        return (
+            self.uncensored[self.uncensored_offsets[position]:self.uncensored_offsets[position + 1]],
+            self.censored[self.censored_offsets[position]:self.censored_offsets[position + 1]],
         )
-        .pivot(columns=IndexCategory.SEGMENT)
-        .droplevel(0, axis="columns")
-    )
 
+    def get_censored_data(self, segment: int) -> CensoredData:
+        uncensored, censored = self.get_times(segment)
+        return CensoredData(uncensored=uncensored, right=censored)
 
-def get_censored_segment_data(data: LivesplitData, cutoff: pd.Timestamp = None) -> Iterator[CensoredData]:
-    wide_resets, segment_times = _prepare_data(data, cutoff)
+    def __iter__(self) -> Iterator[CensoredData]:
+        for segment in self.segments:
+            yield self.get_censored_data(segment)
 
-    for segment in segment_times.columns.get_level_values(IndexCategory.SEGMENT):
-        yield _get_censored_segment(wide_resets, segment_times, segment)
+
+def _get_offsets(positions: np.ndarray, segment_count: int) -> np.ndarray:
+    return np.append(0, np.cumsum(np.bincount(positions, minlength=segment_count)))
+
+
+def get_censored_segment_data(data: LivesplitData, cutoff: pd.Timestamp = None) -> Iterator[CensoredData]:
+    yield from CensoredSegmentTable.from_livesplit_data(data, cutoff)
 
 
 def get_single_censored_segment(data: LivesplitData, segment: int, cutoff: pd.Timestamp = None) -> CensoredData:
-    wide_resets, segment_times = _prepare_data(data, cutoff)
-    return _get_censored_segment(wide_resets, segment_times, segment)
-
-
-def _prepare_data(data: LivesplitData, cutoff: pd.Timestamp = None):
-    if cutoff:
-        attempt_is_included: pd.Series = data.data[AttemptStat.START_OF_ATTEMPT, -1] >= cutoff
-    else:
-        attempt_is_included: pd.Series = data.data[AttemptStat.START_OF_ATTEMPT, -1].apply(lambda _: True)
-
-    segments_reset_on = data.data[AttemptStat.RESET_AT, -1][attempt_is_included]
-    times_upon_reset = data.data[AttemptStat.TIME_UPON_RESET, -1][attempt_is_included]
-
-    # noinspection PyTypeChecker
-    wide_resets = _reshape_resets(segments_reset_on, times_upon_reset)
-
-    segment_times: pd.DataFrame = data.segment_data.loc[attempt_is_included, :]
-    return wide_resets, segment_times
-
-
-def _get_censored_segment(wide_resets: pd.DataFrame, segment_times: pd.DataFrame, segment: int) -> CensoredData:
-    uncensored_times = (
-        segment_times
-        .loc[:, segment]
-        .map(pd.Timedelta.total_seconds)
-        .dropna())
-    # noinspection PyTypeChecker
-    censored_times = (
-        wide_resets
-        .map(pd.Timedelta.total_seconds)
-        .get(segment, pd.Series(dtype="float64"))
-        .dropna()
-    )
-    return CensoredData(
-        uncensored=uncensored_times,
-        right=censored_times
-    )
+    return CensoredSegmentTable.from_livesplit_data(data, cutoff).get_censored_data(segment)
@@ -8,8 +8,8 @@ import attrs
 import pandas as pd
 from scipy import stats
 
-from data.enums import IndexCategory, AttemptStat
-from data.livesplit_data import LivesplitData
+from ls_analysis.data.enums import IndexCategory, AttemptStat
+from ls_analysis.data.livesplit_data import LivesplitData
 
 
 @attrs.define
@@ -36,19 +36,13 @@ class CensoredSegment:
 
     @classmethod
     def from_livesplit_data(cls, data: LivesplitData, segment: int, cutoff: pd.Timestamp | None):
-        cutoff = cutoff or pd.Timestamp.fromordinal(1)
-
-        included_attempts: pd.Series = (
-            data.full_run_stats
-            .droplevel(IndexCategory.SEGMENT, axis="columns")
-            [AttemptStat.START_OF_ATTEMPT]
-            >= cutoff
-        )
+        included_attempts = data.start_index.get_rows(cutoff)
 
         used_data = (
             data.segment_stats
+            .iloc[included_attempts]
             .loc[
-                included_attempts,
+                :,
                 pd.IndexSlice[
                     [AttemptStat.SEGMENT_TIME, AttemptStat.RESET_TIME],
                     segment
@@ -0,0 +1,177 @@
+# -*- coding: utf-8 -*-
+"""
+Created on 2026-10-18
+
+@author: brassbeat
+"""
+from typing import Literal, Self
+
+import attrs
+import numpy as np
+import pandas as pd
+from scipy import special
+
+from ls_analysis.data.enums import AttemptStat
+from ls_analysis.data.livesplit_data import LivesplitData
+
+ConfidenceMethod = Literal["linear", "log-log"]
+
+
+@attrs.define
+class KaplanMeierBands:
+    """
+    Kaplan-Meier estimates of every segment evaluated on a shared grid of times.
+
+    times:      (n_times,) seconds
+    survival:   (n_segments, n_times) share of attempts that have not completed the segment by each time
+    low:        (n_segments, n_times) lower confidence bound of survival
+    high:       (n_segments, n_times) upper confidence bound of survival
+    """
+    times: np.ndarray = attrs.field()
+    survival: np.ndarray = attrs.field()
+    low: np.ndarray = attrs.field()
+    high: np.ndarray = attrs.field()
+
+    @property
+    def cdf(self) -> np.ndarray:
+        return 1 - self.survival
+
+
+@attrs.define
+class KaplanMeierTable:
+    """
+    Kaplan-Meier estimates of every segment as step functions, with a step at every completion time.
+    Censored times are the reset times on each segment, as in CensoredSegment.
+
+    segments:   (n_segments,) segment numbers
+    offsets:    (n_segments + 1,) steps of segment i are at offsets[i]:offsets[i + 1]
+    times:      (n_steps,) completion times, seconds
+    survival:   (n_steps,) survival from each time until the next step
+    greenwood:  (n_steps,) Greenwood sum of d / (n * (n - d)) up to each time, inf once survival reaches 0
+    """
+    segments: np.ndarray = attrs.field()
+    offsets: np.ndarray = attrs.field()
+    times: np.ndarray = attrs.field()
+    survival: np.ndarray = attrs.field()
+    greenwood: np.ndarray = attrs.field()
+
+    @classmethod
+    def from_livesplit_data(
+            cls,
+            data: LivesplitData,
+            cutoff: pd.Timestamp | None = None,
+            segments: np.ndarray | None = None,
+    ) -> Self:
+        """
+        Sorts the times of every segment together once, instead of building each segment separately.
+        Only attempts with a start time are included, with a cutoff only those started at or after it.
+        With segments, only those segments are built, such as the one segment of a single figure.
+        """
+        store = data.store
+        included_rows = data.start_index.get_rows(cutoff)
+        if segments is None:
+            segments, columns = store.segments, slice(None)
+        else:
+            segments = np.unique(np.asarray(segments, dtype=np.int64))
+            is_unknown = ~np.isin(segments, store.segments)
+            if is_unknown.any():
+                raise KeyError(list(segments[is_unknown]))
+            columns = np.searchsorted(store.segments, segments)
+
+        completed = (
+            store.segment_stats[AttemptStat.SEGMENT_TIME].get_rows(included_rows).get_columns(columns).to_seconds()
+        )
+        reset = store.segment_stats[AttemptStat.RESET_TIME].get_rows(included_rows).get_columns(columns).to_seconds()
+
+        # resets faster than any completion are left out, slower ones count just past the worst completion
+        best, worst = np.fmin.reduce(completed, axis=0), np.fmax.reduce(completed, axis=0)
+        reset = np.where(reset > worst, worst + 1., reset)
+        is_censored = reset >= best
+
+        completed_attempts, completed_segments = np.nonzero(~np.isnan(completed))
+        censored_attempts, censored_segments = np.nonzero(is_censored)
+        segment_positions = np.concatenate([completed_segments, censored_segments])
+        times = np.concatenate([
+            completed[completed_attempts, completed_segments],
+            reset[censored_attempts, censored_segments],
+        ])
+        is_completed = np.arange(len(times)) < len(completed_attempts)
+
+        order = np.lexsort((times, segment_positions))
+        segment_positions, times, is_completed = segment_positions[order], times[order], is_completed[order]
+        observation_offsets = np.append(0, np.cumsum(np.bincount(segment_positions, minlength=len(segments))))
+
+        # one group per segment and distinct time, with the attempts still on the segment at its start
+        is_group_start = np.ones(len(times), dtype=bool)
+        is_group_start[1:] = (times[1:] != times[:-1]) | (segment_positions[1:] != segment_positions[:-1])
+        group_starts = np.flatnonzero(is_group_start)
+        group_segments = segment_positions[group_starts]
+        at_risk = (observation_offsets[group_segments + 1] - group_starts).astype(np.float64)
+        deaths = np.add.reduceat(is_completed, group_starts).astype(np.float64) if len(times) else np.empty(0)
+
+        is_step = deaths > 0
+        at_risk, deaths, group_segments = at_risk[is_step], deaths[is_step], group_segments[is_step]
+        step_offsets = np.append(0, np.cumsum(np.bincount(group_segments, minlength=len(segments))))
+
+        survival = (at_risk - deaths) / at_risk
+        with np.errstate(divide="ignore"):
+            greenwood = deaths / (at_risk * (at_risk - deaths))
+        for start, end in zip(step_offsets[:-1], step_offsets[1:]):
+            np.cumprod(survival[start:end], out=survival[start:end])
+            np.cumsum(greenwood[start:end], out=greenwood[start:end])
+
+        return cls(
+            segments=segments,
+            offsets=step_offsets,
+            times=times[group_starts][is_step],
+            survival=survival,
+            greenwood=greenwood,
+        )
+
+    def get_steps(self, segment: int) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Completion times and survival of one segment.
+        """
+        position = np.searchsorted(self.segments, segment)
+        if position == len(self.segments) or self.segments[position] != segment:
+            raise KeyError(segment)
+        steps = slice(self.offsets[position], self.offsets[position + 1])
+        return self.times[steps], self.survival[steps]
+
+    def evaluate(
+        self,
+        times: np.ndarray,
+        confidence_level: float = 0.95,
+        method: ConfidenceMethod = "linear",
+    ) -> KaplanMeierBands:
+        """
+        Survival and confidence bands of every segment at the given times, in seconds,
+        computed as scipy.stats.ecdf(...).sf.confidence_interval does, NaN where its formula is undefined.
+        Before the first completion of a segment, survival and both bounds are 1.
+        """
+        times = np.asarray(times, dtype=np.float64)
+        steps = np.empty((len(self.segments), len(times)), dtype=np.int64)
+        for position, (start, end) in enumerate(zip(self.offsets[:-1], self.offsets[1:])):
+            steps[position] = start + self.times[start:end].searchsorted(times, side="right") - 1
+        is_started = steps >= self.offsets[:-1, np.newaxis]
+
+        survival = np.where(is_started, self.survival[steps], 1.) if len(self.times) else np.ones(steps.shape)
+        greenwood = np.where(is_started, self.greenwood[steps], 0.) if len(self.times) else np.zeros(steps.shape)
+        z = special.ndtri(1 / 2 + confidence_level / 2)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            match method:
+                case "linear":
+                    z_se = z * np.sqrt(survival ** 2 * greenwood)
+                    low, high = survival - z_se, survival + z_se
+                case "log-log":
+                    z_se = z * np.sqrt(greenwood / np.log(survival) ** 2)
+                    log_log_survival = np.log(-np.log(survival))
+                    low = np.exp(-np.exp(log_log_survival + z_se))
+                    high = np.exp(-np.exp(log_log_survival - z_se))
+                case _:
+                    raise ValueError(f"Unknown confidence interval method {method!r}")
+
+        low = np.where(is_started, np.clip(low, 0., 1.), 1.)
+        high = np.where(is_started, np.clip(high, 0., 1.), 1.)
+        return KaplanMeierBands(times=times, survival=survival, low=low, high=high)
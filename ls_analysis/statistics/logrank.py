@@ -3,15 +3,22 @@ Created on 2024-05-26
 
 @author: brassbeat
 """
-from collections.abc import Iterable
+from collections.abc import Hashable, Iterator, Mapping
+from typing import Literal, Self
 
 import attrs
+import numpy as np
 import pandas as pd
 from scipy import stats
-from scipy.stats import CensoredData
 
+from ls_analysis.data.enums import IndexCategory
 from ls_analysis.data.livesplit_data import LivesplitData
-from ls_analysis.statistics.core.censored_data import get_censored_segment_data
+from ls_analysis.statistics.core.censored_data import CensoredSegmentTable
+
+Correction = Literal["bonferroni", "holm", "bh", "by"]
+
+# bounds the completion times of pairs gathered at once
+_PAIR_CHUNK_ELEMENTS = 1 << 22
 
 
 @attrs.define
@@ -24,19 +31,220 @@ class LogrankResult:
     p_value: float
 
 
+@attrs.define
+class _SegmentCounts:
+    """
+    Number at risk and number of completions of every group, at every completion time of any group on a segment.
+
+    at_risk:    (n_groups, n_times)
+    deaths:     (n_groups, n_times)
+    """
+    at_risk: np.ndarray = attrs.field()
+    deaths: np.ndarray = attrs.field()
+
+    @classmethod
+    def from_tables(cls, tables: list[CensoredSegmentTable], segment: int) -> Self:
+        uncensored, every_time = [], []
+        for table in tables:
+            group_uncensored, group_censored = (
+                table.get_times(segment) if segment in table.segments else (np.empty(0), np.empty(0))
+            )
+            uncensored.append(np.sort(group_uncensored))
+            every_time.append(np.sort(np.concatenate([group_uncensored, group_censored])))
+
+        event_times = np.unique(np.concatenate(uncensored))
+        at_risk = np.empty((len(tables), len(event_times)))
+        deaths = np.empty((len(tables), len(event_times)))
+        for group, (group_uncensored, group_times) in enumerate(zip(uncensored, every_time)):
+            # censored times count as at risk at their own time, as in scipy.stats.ecdf
+            at_risk[group] = len(group_times) - group_times.searchsorted(event_times, side="left")
+            deaths[group] = (
+                group_uncensored.searchsorted(event_times, side="right")
+                - group_uncensored.searchsorted(event_times, side="left")
+            )
+        return cls(at_risk, deaths)
+
+    def get_statistics(self, lefts: np.ndarray, rights: np.ndarray) -> np.ndarray:
+        """
+        Logrank statistic of each left group against its right group, signed like scipy.stats.logrank(left, right).
+        Only the times at which either group of a pair has completions add to its sums,
+        so every pair gathers the completion times of its two groups rather than going over all of them.
+        """
+        event_groups, event_columns = np.nonzero(self.deaths > 0)
+        event_counts = np.bincount(event_groups, minlength=len(self.deaths))
+        event_offsets = np.append(0, np.cumsum(event_counts))
+        observed = self.deaths.sum(axis=1)
+
+        statistics = np.empty(len(lefts))
+        pair_sizes = event_counts[lefts] + event_counts[rights]
+        for pairs in _chunk_by_size(pair_sizes, _PAIR_CHUNK_ELEMENTS):
+            pair_lefts, pair_rights = lefts[pairs], rights[pairs]
+            pair_ids = np.arange(len(pair_lefts))
+            left_columns = event_columns[_get_ragged_positions(event_offsets[pair_lefts], event_counts[pair_lefts])]
+            right_columns = event_columns[_get_ragged_positions(event_offsets[pair_rights], event_counts[pair_rights])]
+            left_ids = np.repeat(pair_ids, event_counts[pair_lefts])
+            right_ids = np.repeat(pair_ids, event_counts[pair_rights])
+
+            # times both groups have completions at are already gathered from the left group
+            is_right_only = self.deaths[pair_lefts[right_ids], right_columns] == 0
+            columns = np.concatenate([left_columns, right_columns[is_right_only]])
+            ids = np.concatenate([left_ids, right_ids[is_right_only]])
+
+            at_risk_left = self.at_risk[pair_lefts[ids], columns]
+            at_risk_right = self.at_risk[pair_rights[ids], columns]
+            at_risk = at_risk_left + at_risk_right
+            deaths = self.deaths[pair_lefts[ids], columns] + self.deaths[pair_rights[ids], columns]
+
+            with np.errstate(invalid="ignore", divide="ignore"):
+                variance_terms = np.where(
+                    at_risk > 1,
+                    at_risk_left * at_risk_right * deaths * (at_risk - deaths) / (at_risk ** 2 * (at_risk - 1)),
+                    0.,
+                )
+                expected = np.bincount(ids, at_risk_left * deaths / at_risk, minlength=len(pair_ids))
+                variance = np.bincount(ids, variance_terms, minlength=len(pair_ids))
+                statistics[pairs] = (observed[pair_lefts] - expected) / np.sqrt(variance)
+        return statistics
+
+
+def _get_ragged_positions(starts: np.ndarray, lengths: np.ndarray) -> np.ndarray:
+    # starts[k], starts[k] + 1, ..., starts[k] + lengths[k] - 1 for every k, concatenated
+    run_starts = np.cumsum(lengths) - lengths
+    return np.repeat(starts - run_starts, lengths) + np.arange(lengths.sum())
+
+
+def _chunk_by_size(sizes: np.ndarray, max_size: int) -> Iterator[slice]:
+    start = 0
+    cumulative_sizes = np.cumsum(sizes)
+    while start < len(sizes):
+        offset = cumulative_sizes[start - 1] if start else 0
+        end = max(int(np.searchsorted(cumulative_sizes, offset + max_size, side="right")), start + 1)
+        yield slice(start, end)
+        start = end
+
+
+@attrs.define
+class LogrankMatrix:
+    """
+    Logrank tests of every pair of groups on every segment.
+    statistics[s, i, j] tests group i against group j on segments[s], so statistics[s, j, i] == -statistics[s, i, j].
+
+    groups:             (n_groups,) group labels
+    segments:           (n_segments,) segment numbers
+    statistics:         (n_segments, n_groups, n_groups) NaN on the diagonal and where a test is undefined
+    p_values:           (n_segments, n_groups, n_groups) two-sided
+    adjusted_p_values:  (n_segments, n_groups, n_groups) corrected for testing every pair on every segment
+    """
+    groups: list[Hashable] = attrs.field()
+    segments: np.ndarray = attrs.field()
+    statistics: np.ndarray = attrs.field()
+    p_values: np.ndarray = attrs.field()
+    adjusted_p_values: np.ndarray = attrs.field()
+
+    def to_frame(self) -> pd.DataFrame:
+        """
+        One row per segment and unordered pair of groups.
+        """
+        lefts, rights = np.triu_indices(len(self.groups), k=1)
+        return pd.DataFrame(
+            data={
+                "test_statistic": self.statistics[:, lefts, rights].ravel(),
+                "p_value": self.p_values[:, lefts, rights].ravel(),
+                "adjusted_p_value": self.adjusted_p_values[:, lefts, rights].ravel(),
+            },
+            index=pd.MultiIndex.from_arrays(
+                [
+                    np.repeat(self.segments, len(lefts)),
+                    np.tile(np.array(self.groups, dtype=object)[lefts], len(self.segments)),
+                    np.tile(np.array(self.groups, dtype=object)[rights], len(self.segments)),
+                ],
+                names=[IndexCategory.SEGMENT, "left", "right"],
+            ),
+        )
+
+
+def adjust_p_values(p_values: np.ndarray, correction: Correction) -> np.ndarray:
+    """
+    Corrects a flat array of p-values for multiple testing, leaving NaN untouched.
+    bh and by control the false discovery rate, bonferroni and holm the family-wise error rate.
+    """
+    adjusted = np.full(len(p_values), np.nan)
+    is_tested = ~np.isnan(p_values)
+    tested = p_values[is_tested]
+    test_count = len(tested)
+    if test_count == 0:
+        return adjusted
+
+    match correction:
+        case "bonferroni":
+            adjusted[is_tested] = np.minimum(tested * test_count, 1.)
+        case "holm":
+            order = np.argsort(tested)
+            stepped = np.maximum.accumulate(tested[order] * (test_count - np.arange(test_count)))
+            adjusted_tested = np.empty(test_count)
+            adjusted_tested[order] = np.minimum(stepped, 1.)
+            adjusted[is_tested] = adjusted_tested
+        case "bh" | "by":
+            adjusted[is_tested] = stats.false_discovery_control(tested, method=correction)
+        case _:
+            raise ValueError(f"Unknown correction {correction!r}")
+    return adjusted
+
+
+def get_logrank_matrix(
+        tables: Mapping[Hashable, CensoredSegmentTable],
+        correction: Correction = "holm",
+) -> LogrankMatrix:
+    """
+    Compares every pair of groups on every segment any of them has, matching scipy.stats.logrank.
+    Each segment sorts its times once for all groups, and every pair is tested from the shared counts.
+    Groups can be runners, or time windows of one runner through CensoredSegmentTable's cutoff.
+    """
+    groups = list(tables)
+    group_tables = list(tables.values())
+    segments = np.unique(np.concatenate([table.segments for table in group_tables]))
+    lefts, rights = np.triu_indices(len(groups), k=1)
+
+    statistics = np.full((len(segments), len(groups), len(groups)), np.nan)
+    for position, segment in enumerate(segments):
+        pair_statistics = _SegmentCounts.from_tables(group_tables, segment).get_statistics(lefts, rights)
+        statistics[position, lefts, rights] = pair_statistics
+        statistics[position, rights, lefts] = -pair_statistics
+
+    p_values = 2 * stats.norm.sf(np.abs(statistics))
+    upper_p_values = p_values[:, lefts, rights]
+    adjusted_upper = adjust_p_values(upper_p_values.ravel(), correction).reshape(upper_p_values.shape)
+    adjusted_p_values = np.full_like(p_values, np.nan)
+    adjusted_p_values[:, lefts, rights] = adjusted_upper
+    adjusted_p_values[:, rights, lefts] = adjusted_upper
+
+    return LogrankMatrix(
+        groups=groups,
+        segments=segments,
+        statistics=statistics,
+        p_values=p_values,
+        adjusted_p_values=adjusted_p_values,
+    )
+
+
 def apply_logrank(
         left: LivesplitData,
         right: LivesplitData,
         left_cutoff: pd.Timestamp = None,
         right_cutoff: pd.Timestamp = None,
-):
-    left_censored_data = get_censored_segment_data(left, left_cutoff)
-    right_censored_data = get_censored_segment_data(right, right_cutoff)
-    both_data = zip(left_censored_data, right_censored_data)
-    for left_data, right_data in both_data:
-        left_data: CensoredData
-        right_data: CensoredData
-        result = stats.logrank(left_data, right_data)
+) -> Iterator[LogrankResult]:
+    """
+    Logrank test of left against right on every segment both have.
+    """
+    left_table = CensoredSegmentTable.from_livesplit_data(left, left_cutoff)
+    right_table = CensoredSegmentTable.from_livesplit_data(right, right_cutoff)
+    matrix = get_logrank_matrix({"left": left_table, "right": right_table})
+
+    for position, segment in enumerate(matrix.segments):
+        if segment not in left_table.segments or segment not in right_table.segments:
+            continue
+        left_data = left_table.get_censored_data(segment)
+        right_data = right_table.get_censored_data(segment)
 
         # noinspection PyTypeChecker
         yield LogrankResult(
@@ -44,6 +252,6 @@ def apply_logrank(
             left_censored=left_data.num_censored(),
             right_uncensored=len(right_data) - right_data.num_censored(),
             right_censored=right_data.num_censored(),
-            test_statistic=result.statistic,
-            p_value=result.pvalue,
+            test_statistic=matrix.statistics[position, 0, 1],
+            p_value=matrix.p_values[position, 0, 1],
         )
@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+"""
+Created on 2026-10-18
+
+@author: brassbeat
+"""
+from collections.abc import Iterable
+from typing import Self
+
+import attrs
+import numpy as np
+import pandas as pd
+from pandas.api.typing import Rolling
+
+from ls_analysis.data.enums import AttemptStat, IndexCategory
+from ls_analysis.data.livesplit_data import LivesplitData
+
+
+def _roll(
+        values: np.ndarray,
+        columns: pd.Index,
+        window: int | pd.Timedelta,
+        starts: np.ndarray | None,
+        min_periods: int,
+) -> Rolling:
+    frame = pd.DataFrame(values, columns=columns)
+    if starts is not None:
+        frame = frame.set_axis(pd.DatetimeIndex(starts))
+    return frame.rolling(window, min_periods=min_periods)
+
+
+@attrs.define
+class RollingSegmentStats:
+    """
+    Segment statistics over a window of attempts ending at every attempt, as attempts x segments frames.
+    Rows are the attempts in row order for count windows,
+    and the attempts with a start time in order of it for time windows.
+
+    quantiles:      segment time quantiles, with columns (quantile, segment)
+    arrivals:       number of attempts in the window reaching each segment, including those skipping its split
+    completions:    number of completions of each segment in the window
+    resets:         number of resets on each segment in the window
+    golds:          number of completions in the window faster than every earlier completion of the segment
+                    in the whole history, so the personal bests set in the window
+    """
+    quantiles: pd.DataFrame = attrs.field()
+    arrivals: pd.DataFrame = attrs.field()
+    completions: pd.DataFrame = attrs.field()
+    resets: pd.DataFrame = attrs.field()
+    golds: pd.DataFrame = attrs.field()
+
+    @classmethod
+    def from_livesplit_data(
+            cls,
+            data: LivesplitData,
+            window: int | pd.Timedelta | str,
+            quantiles: Iterable[float] = (0.5,),
+            min_periods: int = 1,
+    ) -> Self:
+        """
+        window is a number of attempts, or a duration covering the attempts started within it
+        up to and including the start of each attempt.
+
+        Every statistic comes from one rolling pass over all segments together,
+        which adds the attempt entering the window and drops the one leaving it instead of redoing each window.
+        Quantiles interpolate linearly between the segment times in the window,
+        and are NaN with fewer than min_periods of them.
+        """
+        store = data.store
+        is_time_window = not isinstance(window, (int, np.integer))
+        if is_time_window:
+            rows = data.start_index.rows
+            window = pd.Timedelta(window)
+        else:
+            rows = np.arange(len(store.attempts))
+
+        starts = store.attempt_stats[AttemptStat.START_OF_ATTEMPT].get_rows(rows).to_numpy()
+        window_starts = starts if is_time_window else None
+        index = pd.MultiIndex.from_arrays(
+            [pd.Index(store.attempts[rows]), pd.DatetimeIndex(starts)],
+            names=[IndexCategory.ATTEMPT, AttemptStat.START_OF_ATTEMPT],
+        )
+        columns = pd.Index(store.segments, name=IndexCategory.SEGMENT)
+
+        segment_times = store.segment_stats[AttemptStat.SEGMENT_TIME].get_rows(rows)
+        times = np.where(segment_times.is_missing, np.nan, segment_times.values.astype(np.float64))
+        earlier_bests = np.fmin.accumulate(np.vstack([np.full(len(columns), np.inf), times[:-1]]), axis=0)
+        # attempts reach every segment up to the one they are reset on, and finished attempts all of them
+        reset_at = store.attempt_stats[AttemptStat.RESET_AT].get_rows(rows)
+        reached_segments = np.where(reset_at.is_missing, np.inf, reset_at.values)
+        indicators = {
+            "arrivals": reached_segments[:, np.newaxis] >= store.segments,
+            "completions": ~segment_times.is_missing,
+            "resets": ~store.segment_stats[AttemptStat.RESET_TIME].get_rows(rows).is_missing,
+            "golds": times < earlier_bests,
+        }
+
+        quantile_frames = {
+            quantile: _roll(times, columns, window, window_starts, min_periods).quantile(quantile)
+            for quantile in quantiles
+        }
+        counts = {
+            name: _roll(values.astype(np.float64), columns, window, window_starts, 0).sum()
+            for name, values in indicators.items()
+        }
+
+        return cls(
+            quantiles=pd.concat(
+                {
+                    quantile: frame.set_axis(index).astype("timedelta64[ns]")
+                    for quantile, frame in quantile_frames.items()
+                },
+                axis="columns",
+                names=["quantile"],
+            ),
+            **{name: frame.set_axis(index).astype(np.int64) for name, frame in counts.items()},
+        )
+
+    @property
+    def reset_rates(self) -> pd.DataFrame:
+        """
+        Share of the attempts in the window reaching each segment that were reset on it.
+        """
+        return self.resets / self.arrivals
+
+    @property
+    def gold_rates(self) -> pd.DataFrame:
+        """
+        Share of the completions of each segment in the window that set a personal best.
+        """
+        return self.golds / self.completions
+
+    def to_frame(self) -> pd.DataFrame:
+        """
+        Every statistic as one column, in rows of (attempt, start of attempt, segment).
+        """
+        columns = {
+            f"quantile_{quantile:g}": self.quantiles[quantile].stack(future_stack=True)
+            for quantile in self.quantiles.columns.unique(level="quantile")
+        }
+        for name, frame in (
+                ("arrivals", self.arrivals),
+                ("completions", self.completions),
+                ("resets", self.resets),
+                ("golds", self.golds),
+                ("reset_rate", self.reset_rates),
+                ("gold_rate", self.gold_rates),
+        ):
+            columns[name] = frame.stack(future_stack=True)
+        return pd.DataFrame(columns)
@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+"""
+Created on 2026-10-18
+
+@author: brassbeat
+"""
+from collections.abc import Iterable
+
+import numpy as np
+import pandas as pd
+
+from ls_analysis.data.enums import AttemptStat, IndexCategory
+from ls_analysis.data.livesplit_data import LivesplitData
+
+
+def get_segment_changes(data: LivesplitData, cutoffs: Iterable[pd.Timestamp] | pd.DatetimeIndex) -> pd.DataFrame:
+    """
+    How every segment went in the attempts started before and since each cutoff,
+    such as the first day of every month of the history, with all cutoffs summed in one sweep.
+
+    The reset rate of a segment is the share of attempts reaching it that were reset on it,
+    where skipped splits still count as reached, as in the rolling statistics.
+    Attempts without a start time are left out.
+    """
+    store = data.store
+    cutoffs = pd.DatetimeIndex(cutoffs).as_unit("ns")
+    start_index = data.start_index
+
+    segment_times = store.segment_stats[AttemptStat.SEGMENT_TIME]
+    is_completed = ~segment_times.is_missing
+    is_reset = ~store.segment_stats[AttemptStat.RESET_TIME].is_missing
+    reset_at = store.attempt_stats[AttemptStat.RESET_AT]
+    reached_segments = np.where(reset_at.is_missing, np.inf, reset_at.values)
+    is_arrival = reached_segments[:, np.newaxis] >= store.segments
+    values = np.stack(
+        [
+            is_completed.astype(np.int64),
+            is_reset.astype(np.int64),
+            np.where(is_completed, segment_times.values, 0),
+            is_arrival.astype(np.int64),
+        ],
+        axis=-1,
+    )
+
+    since = start_index.get_sums_since(values, cutoffs)
+    before = values[start_index.rows].sum(axis=0) - since
+
+    columns = {}
+    for period, sums in (("before", before), ("since", since)):
+        completed, reset, time_sums, arrivals = sums[..., 0], sums[..., 1], sums[..., 2], sums[..., 3]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            means = time_sums / completed
+            reset_rates = reset / arrivals
+        columns[f"completed_{period}"] = completed.ravel()
+        columns[f"reset_{period}"] = reset.ravel()
+        columns[f"arrivals_{period}"] = arrivals.ravel()
+        columns[f"mean_{period}"] = pd.to_timedelta(means.ravel(), unit="ns")
+        columns[f"reset_rate_{period}"] = reset_rates.ravel()
+
+    changes = pd.DataFrame(
+        data=columns,
+        index=pd.MultiIndex.from_product(
+            [cutoffs, store.segments],
+            names=["cutoff", IndexCategory.SEGMENT],
+        ),
+    )
+    return changes.assign(
+        mean_change=changes["mean_since"] - changes["mean_before"],
+        reset_rate_change=changes["reset_rate_since"] - changes["reset_rate_before"],
+    )
@@ -0,0 +1,17 @@
+# -*- coding: utf-8 -*-
+"""
+Created on 2026-10-18
+
+@author: brassbeat
+"""
+import io
+
+import pytest
+
+from ls_analysis.data.livesplit_data import LivesplitData
+from ls_analysis.data.synthetic_lss import SyntheticRun
+
+
+@pytest.fixture(scope="session")
+def synthetic_data() -> LivesplitData:
+    return LivesplitData.from_lss(io.StringIO(SyntheticRun.generate(2000, 10, seed=0).to_lss()))
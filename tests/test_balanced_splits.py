@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+"""
+Created on 2026-10-18
+
+@author: brassbeat
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from ls_analysis.distributions.balanced_splits import get_balanced_segment_batch, get_balanced_segments
+from ls_analysis.distributions.core.interpolated import InterpolatedDistribution
+from ls_analysis.distributions.core.weighted_empirical import WeightedEmpiricalDistribution
+from ls_analysis.distributions.core.weights.kernels import get_count_decay_weights
+from ls_analysis.distributions.enums import DistributionColumn
+
+TARGET_FACTORS = (0.9, 1., 1.05, 1.1, 1.15, 1.2, 1.3)
+
+
+def _get_target_times(distribution) -> pd.TimedeltaIndex:
+    median = distribution.get_quantile_times(0.5)[DistributionColumn.SEGMENT_TIME].sum()
+    return pd.TimedeltaIndex([median * factor for factor in TARGET_FACTORS]).round("ns")
+
+
+@pytest.mark.parametrize("decay", (0.95, 0.99))
+def test_interpolated_segments_add_up_to_target(synthetic_data, decay):
+    distribution = InterpolatedDistribution.from_weight_kernel(synthetic_data, get_count_decay_weights, decay)
+    target_times = _get_target_times(distribution)
+    batch = get_balanced_segment_batch(distribution, target_times)
+    totals = batch[DistributionColumn.SEGMENT_TIME].groupby(level="target_time").sum()
+
+    # every segment time is rounded to a whole nanosecond
+    assert (abs(totals - target_times) <= pd.Timedelta(distribution.segment_count, "ns")).all()
+
+
+def test_interpolated_segments_match_lookup_at_quantile(synthetic_data):
+    distribution = InterpolatedDistribution.from_weight_kernel(synthetic_data, get_count_decay_weights, 0.99)
+    for target_time in _get_target_times(distribution):
+        balanced = get_balanced_segments(distribution, target_time)
+        looked_up = distribution.get_quantile_times(balanced[DistributionColumn.QUANTILE].iloc[0])
+        difference = balanced[DistributionColumn.SEGMENT_TIME] - looked_up[DistributionColumn.SEGMENT_TIME]
+        assert difference.abs().max() <= pd.Timedelta(microseconds=1)
+
+
+@pytest.mark.parametrize("decay", (0.95, 0.99))
+def test_empirical_segments_are_lookup_at_most_target(synthetic_data, decay):
+    distribution = WeightedEmpiricalDistribution.from_weight_kernel(synthetic_data, get_count_decay_weights, decay)
+    for target_time in _get_target_times(distribution):
+        balanced = get_balanced_segments(distribution, target_time)
+        looked_up = distribution.get_quantile_times(balanced[DistributionColumn.QUANTILE].iloc[0])
+        pd.testing.assert_frame_equal(balanced, looked_up)
+        assert balanced[DistributionColumn.SEGMENT_TIME].sum() <= target_time
+
+
+@pytest.mark.parametrize("distribution_cls", (InterpolatedDistribution, WeightedEmpiricalDistribution))
+def test_targets_outside_range_give_first_or_last_nodes(synthetic_data, distribution_cls):
+    distribution = distribution_cls.from_weight_kernel(synthetic_data, get_count_decay_weights, 0.95)
+    nodes = distribution.nodes
+    batch = get_balanced_segment_batch(distribution, [pd.Timedelta(1, "ns"), pd.Timedelta(days=1)])
+    segment_times = batch[DistributionColumn.SEGMENT_TIME].to_numpy().reshape(2, -1)
+
+    np.testing.assert_array_equal(segment_times[0], nodes.times[nodes.offsets[:-1]])
+    np.testing.assert_array_equal(segment_times[1], nodes.times[nodes.offsets[1:] - 1])
+    np.testing.assert_array_equal(batch[DistributionColumn.QUANTILE].to_numpy().reshape(2, -1)[:, 0], [0., 1.])
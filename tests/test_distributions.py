@@ -0,0 +1,159 @@
+# -*- coding: utf-8 -*-
+"""
+Created on 2026-10-18
+
+@author: brassbeat
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from ls_analysis.data.enums import AttemptStat, IndexCategory
+from ls_analysis.data.livesplit_data import LivesplitData
+from ls_analysis.distributions.core.interpolated import InterpolatedDistribution
+from ls_analysis.distributions.core.weighted_empirical import WeightedEmpiricalDistribution
+from ls_analysis.distributions.core.weights.exponential import get_weights
+from ls_analysis.distributions.core.weights.kernels import get_count_decay_weights
+from ls_analysis.distributions.enums import DistributionColumn
+
+DECAY = 0.95
+QUANTILES = (0., 1e-9, 0.1, 0.25, 0.5, 0.75, 0.9, 1. - 1e-9, 1.)
+
+
+def _get_reference_nodes(data: LivesplitData, drop_worst_weight: bool) -> pd.DataFrame:
+    """
+    The sorted and normalized nodes as the pandas implementation built them before QuantileNodes.
+    """
+    segment_data = data.segment_data
+    weight_data = segment_data.apply(get_weights, args=(DECAY,))
+    nodes = (
+        pd.concat(
+            {
+                DistributionColumn.SEGMENT_TIME: segment_data.stack(future_stack=True),
+                DistributionColumn.NODE_WEIGHT: weight_data.stack(future_stack=True).astype(np.float64),
+            },
+            axis=1,
+        )
+        .dropna()
+        .sort_values(by=[IndexCategory.SEGMENT, DistributionColumn.SEGMENT_TIME])
+    )
+    weights = nodes[DistributionColumn.NODE_WEIGHT]
+    if drop_worst_weight:
+        weights = (
+            weights
+            .groupby(by=IndexCategory.SEGMENT)
+            .shift(1)
+            .groupby(by=IndexCategory.SEGMENT)
+            .shift(-1, fill_value=0)
+        )
+    total_weights = weights.groupby(by=IndexCategory.SEGMENT).sum()
+    quantiles = (
+        weights
+        .groupby(by=IndexCategory.SEGMENT)
+        .shift(1, fill_value=0)
+        .groupby(by=IndexCategory.SEGMENT)
+        .cumsum()
+    )
+    return nodes.assign(
+        **{
+            DistributionColumn.NODE_WEIGHT: weights / total_weights,
+            DistributionColumn.QUANTILE: quantiles / total_weights,
+        }
+    )
+
+
+def _get_reference_times(nodes: pd.DataFrame, quantile: float, interpolate: bool) -> pd.Series:
+    """
+    Segment times at one quantile, looked up in the reference nodes as the pandas implementation did.
+    q=1 gives the worst time of every segment, which the interpolated lookup there left as NaT.
+    """
+    is_higher = nodes[DistributionColumn.QUANTILE].gt(quantile)
+    lower_nodes = nodes.loc[~is_higher].groupby(level=IndexCategory.SEGMENT).last()
+    if not interpolate:
+        return lower_nodes[DistributionColumn.SEGMENT_TIME]
+    upper_nodes = nodes.loc[is_higher].groupby(level=IndexCategory.SEGMENT).first().reindex(lower_nodes.index)
+
+    proportions = (quantile - lower_nodes[DistributionColumn.QUANTILE]) / lower_nodes[DistributionColumn.NODE_WEIGHT]
+    steps = upper_nodes[DistributionColumn.SEGMENT_TIME] - lower_nodes[DistributionColumn.SEGMENT_TIME]
+    return (
+        (lower_nodes[DistributionColumn.SEGMENT_TIME] + (proportions * steps).fillna(pd.Timedelta(0)))
+        .fillna(lower_nodes[DistributionColumn.SEGMENT_TIME])
+    )
+
+
+def _get_tied_data(data: LivesplitData) -> LivesplitData:
+    # whole seconds, so that most segments have many nodes with the same time
+    frame = data.data.copy()
+    segment_times = frame.loc[:, [AttemptStat.SEGMENT_TIME]]
+    frame.loc[:, [AttemptStat.SEGMENT_TIME]] = segment_times.apply(lambda column: column.dt.round("1s"))
+    return LivesplitData(frame)
+
+
+@pytest.fixture(scope="module", params=("distinct", "tied"))
+def reference_data(request, synthetic_data) -> LivesplitData:
+    return synthetic_data if request.param == "distinct" else _get_tied_data(synthetic_data)
+
+
+@pytest.mark.parametrize(
+    ("distribution_cls", "interpolate"),
+    ((InterpolatedDistribution, True), (WeightedEmpiricalDistribution, False)),
+)
+def test_nodes_match_reference(reference_data, distribution_cls, interpolate):
+    reference_nodes = _get_reference_nodes(reference_data, drop_worst_weight=interpolate)
+    nodes = distribution_cls.from_weight_kernel(reference_data, get_count_decay_weights, DECAY).nodes
+
+    np.testing.assert_array_equal(nodes.times, reference_nodes[DistributionColumn.SEGMENT_TIME].to_numpy())
+    for column, found in (
+        (DistributionColumn.QUANTILE, nodes.quantiles),
+        (DistributionColumn.NODE_WEIGHT, nodes.weights),
+    ):
+        np.testing.assert_allclose(found, reference_nodes[column].to_numpy(), rtol=1e-12, atol=1e-15, err_msg=column)
+
+
+@pytest.mark.parametrize(
+    ("distribution_cls", "interpolate"),
+    ((InterpolatedDistribution, True), (WeightedEmpiricalDistribution, False)),
+)
+def test_quantile_times_match_reference(reference_data, distribution_cls, interpolate):
+    reference_nodes = _get_reference_nodes(reference_data, drop_worst_weight=interpolate)
+    for distribution in (
+        distribution_cls.from_weight_func(reference_data, get_weights, DECAY),
+        distribution_cls.from_weight_kernel(reference_data, get_count_decay_weights, DECAY),
+    ):
+        for quantile in QUANTILES:
+            found = distribution.get_quantile_times(quantile)[DistributionColumn.SEGMENT_TIME]
+            expected = _get_reference_times(reference_nodes, quantile, interpolate)
+            difference = (found - expected.reindex(found.index)).abs()
+            assert difference.max() <= pd.Timedelta(1, "us"), f"quantile {quantile}"
+
+
+@pytest.mark.parametrize("distribution_cls", (InterpolatedDistribution, WeightedEmpiricalDistribution))
+def test_node_quantiles_give_node_times(reference_data, distribution_cls):
+    """
+    At exactly the prior quantile of a node, both lookups give the time of the last node with that prior quantile,
+    which is the node itself unless later nodes add too little weight to change it.
+    """
+    nodes = distribution_cls.from_weight_kernel(reference_data, get_count_decay_weights, DECAY).nodes
+    counts = np.diff(nodes.offsets)
+    picked = nodes.offsets[:-1] + np.arange(counts.max())[:, np.newaxis] % counts
+    segment_quantiles = nodes.quantiles[picked]
+    last_with_quantile = np.stack([
+        start + nodes.quantiles[start:end].searchsorted(segment_quantiles[:, position], side="right") - 1
+        for position, (start, end) in enumerate(zip(nodes.offsets[:-1], nodes.offsets[1:]))
+    ], axis=1)
+
+    batch = nodes.get_time_batch(segment_quantiles)
+    np.testing.assert_array_equal(batch.segment_times, nodes.times[last_with_quantile])
+
+
+@pytest.mark.parametrize("distribution_cls", (InterpolatedDistribution, WeightedEmpiricalDistribution))
+def test_batch_matches_single_lookups(reference_data, distribution_cls):
+    distribution = distribution_cls.from_weight_kernel(reference_data, get_count_decay_weights, DECAY)
+    quantiles = np.random.default_rng(0).random((50, distribution.segment_count))
+    quantiles[:2] = [[0.], [1.]]
+    batch = distribution.get_quantile_time_batch(quantiles, chunk_size=16)
+
+    for row, run_quantiles in enumerate(quantiles):
+        single = distribution.get_quantile_times(pd.Series(run_quantiles, index=distribution.nodes.segments))
+        np.testing.assert_array_equal(batch.segment_times[row], single[DistributionColumn.SEGMENT_TIME].to_numpy())
+        assert batch.run_times[row] == single[DistributionColumn.SEGMENT_TIME].sum()
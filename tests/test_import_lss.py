@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+"""
+Created on 2026-10-18
+
+@author: brassbeat
+"""
+import io
+
+import attrs
+import numpy as np
+import pandas as pd
+import pytest
+
+from ls_analysis.data.enums import AttemptStat
+from ls_analysis.data.import_lss import import_lss, update_livesplit_data
+from ls_analysis.data.livesplit_data import LivesplitData
+from ls_analysis.data.synthetic_lss import SyntheticRun
+
+
+def _get_first_attempts(run: SyntheticRun, count: int) -> SyntheticRun:
+    return attrs.evolve(
+        run,
+        started=run.started[:count],
+        ended=run.ended[:count],
+        real_history=run.real_history[:count],
+        game_history=None if run.game_history is None else run.game_history[:count],
+        real_run_times=run.real_run_times[:count],
+        game_run_times=None if run.game_run_times is None else run.game_run_times[:count],
+    )
+
+
+def _get_reset_segments(data: pd.DataFrame) -> list[int]:
+    return data.columns[data.columns.get_level_values(0) == AttemptStat.RESET_TIME].get_level_values(1).tolist()
+
+
+@pytest.mark.parametrize("attempt_count", (5, 20))
+def test_reset_time_columns_only_for_reset_segments(attempt_count):
+    data = import_lss(io.StringIO(SyntheticRun.generate(attempt_count, 10, seed=1).to_lss()))
+    reset_segments = np.unique(data[AttemptStat.RESET_AT, -1].dropna().to_numpy(dtype=np.int64))
+    assert _get_reset_segments(data) == reset_segments.tolist()
+
+    # the store still holds a reset time column for every segment
+    store = LivesplitData(data).store
+    assert store.segment_stats[AttemptStat.RESET_TIME].values.shape == (attempt_count, len(store.segments))
+
+
+@pytest.mark.parametrize("first_count", (3, 8, 12))
+def test_update_adds_new_reset_columns(first_count):
+    run = SyntheticRun.generate(20, 10, seed=1)
+    expected = import_lss(io.StringIO(run.to_lss()))
+    first = import_lss(io.StringIO(_get_first_attempts(run, first_count).to_lss()))
+    assert set(_get_reset_segments(first)) < set(_get_reset_segments(expected))
+
+    updated = update_livesplit_data(first, io.StringIO(run.to_lss()))
+    assert set(updated.columns) == set(expected.columns)
+    pd.testing.assert_frame_equal(updated.loc[:, expected.columns], expected)
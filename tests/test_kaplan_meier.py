@@ -0,0 +1,38 @@
+# -*- coding: utf-8 -*-
+"""
+Created on 2026-10-18
+
+@author: brassbeat
+"""
+import numpy as np
+import pytest
+from scipy import stats
+
+from ls_analysis.statistics.core.censored_segment import CensoredSegment
+from ls_analysis.statistics.kaplan_meier import KaplanMeierTable
+
+
+def test_segments_match_scipy_ecdf(synthetic_data):
+    table = KaplanMeierTable.from_livesplit_data(synthetic_data)
+    for segment in table.segments:
+        censored_data = CensoredSegment.from_livesplit_data(synthetic_data, segment, None).get_scipy_censored_data()
+        sf = stats.ecdf(censored_data).sf
+        # scipy also lists censored times, where survival does not change
+        is_step = np.diff(sf.probabilities, prepend=1.) != 0
+        times, survival = table.get_steps(segment)
+        # CensoredSegment converts with Timedelta.total_seconds, which drops everything below a microsecond
+        np.testing.assert_allclose(times, sf.quantiles[is_step], rtol=0., atol=1e-6)
+        np.testing.assert_allclose(survival, sf.probabilities[is_step], rtol=1e-12)
+
+
+def test_restricted_table_matches_full_table(synthetic_data):
+    full = KaplanMeierTable.from_livesplit_data(synthetic_data)
+    segments = full.segments[[0, 3, -1]]
+    restricted = KaplanMeierTable.from_livesplit_data(synthetic_data, segments=segments)
+
+    np.testing.assert_array_equal(restricted.segments, segments)
+    for segment in segments:
+        for found, expected in zip(restricted.get_steps(segment), full.get_steps(segment)):
+            np.testing.assert_array_equal(found, expected)
+    with pytest.raises(KeyError):
+        KaplanMeierTable.from_livesplit_data(synthetic_data, segments=[full.segments[-1] + 1])
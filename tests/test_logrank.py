@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+"""
+Created on 2026-10-18
+
+@author: brassbeat
+"""
+import io
+
+import numpy as np
+import pytest
+from scipy import stats
+
+from ls_analysis.data.enums import AttemptStat
+from ls_analysis.data.livesplit_data import LivesplitData
+from ls_analysis.data.synthetic_lss import SyntheticRun
+from ls_analysis.statistics.core.censored_data import CensoredSegmentTable
+from ls_analysis.statistics.logrank import adjust_p_values, get_logrank_matrix
+
+NAN = np.nan
+
+
+def _get_run(attempt_count: int, seed: int, round_to_seconds: bool = False) -> LivesplitData:
+    data = LivesplitData.from_lss(io.StringIO(SyntheticRun.generate(attempt_count, 6, seed=seed).to_lss()))
+    if not round_to_seconds:
+        return data
+    # whole seconds, so that groups share completion times and completions tie with resets
+    frame = data.data.copy()
+    for statistic in (AttemptStat.SEGMENT_TIME, AttemptStat.RESET_TIME, AttemptStat.TIME_UPON_RESET):
+        columns = frame.loc[:, [statistic]]
+        frame.loc[:, [statistic]] = columns.apply(lambda column: column.dt.round("1s"))
+    return LivesplitData(frame)
+
+
+@pytest.mark.parametrize("round_to_seconds", (False, True))
+def test_pairs_match_scipy_logrank(round_to_seconds):
+    tables = {
+        seed: CensoredSegmentTable.from_livesplit_data(_get_run(attempt_count, seed, round_to_seconds))
+        for seed, attempt_count in ((0, 300), (1, 200), (2, 400))
+    }
+    matrix = get_logrank_matrix(tables)
+
+    for position, segment in enumerate(matrix.segments):
+        for left, left_table in enumerate(tables.values()):
+            for right, right_table in enumerate(tables.values()):
+                if left == right:
+                    continue
+                expected = stats.logrank(left_table.get_censored_data(segment), right_table.get_censored_data(segment))
+                np.testing.assert_allclose(matrix.statistics[position, left, right], expected.statistic, rtol=1e-9)
+                np.testing.assert_allclose(matrix.p_values[position, left, right], expected.pvalue, rtol=1e-9)
+
+
+@pytest.mark.parametrize(
+    ("correction", "expected"),
+    (
+        ("bonferroni", [0.04, 0.16, 0.12, NAN, 0.02]),
+        ("holm", [0.03, 0.06, 0.06, NAN, 0.02]),
+        ("bh", [0.02, 0.04, 0.04, NAN, 0.02]),
+    ),
+)
+def test_adjusted_p_values_by_hand(correction, expected):
+    # four tests; sorted, the p-values are 0.005, 0.01, 0.03, 0.04
+    p_values = np.array([0.01, 0.04, 0.03, NAN, 0.005])
+    np.testing.assert_allclose(adjust_p_values(p_values, correction), expected, rtol=1e-12)
+
+
+@pytest.mark.parametrize(
+    ("correction", "expected"),
+    (
+        ("bonferroni", [1., 1.]),
+        ("holm", [1., 1.]),
+        ("bh", [0.6, 0.6]),
+    ),
+)
+def test_adjusted_p_values_stay_at_most_one(correction, expected):
+    np.testing.assert_allclose(adjust_p_values(np.array([0.5, 0.6]), correction), expected, rtol=1e-12)
+
+
+def test_adjusted_p_values_without_tests():
+    assert np.isnan(adjust_p_values(np.array([NAN, NAN]), "holm")).all()
+    with pytest.raises(ValueError):
+        adjust_p_values(np.array([0.5]), "sidak")
@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+"""
+Created on 2026-10-18
+
+@author: brassbeat
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from ls_analysis.data.enums import AttemptStat
+from ls_analysis.data.livesplit_data import LivesplitData
+from ls_analysis.distributions.core.interpolated import InterpolatedDistribution
+from ls_analysis.distributions.core.online import OnlineDistribution
+from ls_analysis.distributions.core.weighted_empirical import WeightedEmpiricalDistribution
+from ls_analysis.distributions.core.weights.kernels import get_count_decay_weights
+
+DECAY = 0.99
+
+
+def _assert_same_nodes(found, expected):
+    np.testing.assert_array_equal(found.segments, expected.segments)
+    np.testing.assert_array_equal(found.offsets, expected.offsets)
+    np.testing.assert_array_equal(found.times, expected.times)
+    np.testing.assert_allclose(found.quantiles, expected.quantiles, rtol=1e-12, atol=1e-15)
+    np.testing.assert_allclose(found.weights, expected.weights, rtol=1e-12, atol=1e-15)
+
+
+@pytest.mark.parametrize(
+    ("distribution_cls", "interpolate"),
+    ((InterpolatedDistribution, True), (WeightedEmpiricalDistribution, False)),
+)
+def test_update_fills_segments_without_times(synthetic_data, distribution_cls, interpolate):
+    frame = synthetic_data.data
+    last_segment = frame[AttemptStat.SEGMENT_TIME].columns[-1]
+    # early attempts that never got a time on the last segment, followed by the rest of the history
+    head = frame.iloc[:500]
+    head = head[head[AttemptStat.SEGMENT_TIME, last_segment].isna()]
+    tail = frame.iloc[500:600]
+
+    online = OnlineDistribution.from_livesplit_data(LivesplitData(head), DECAY, interpolate)
+    assert last_segment in online.segments
+    assert last_segment not in online.nodes.segments
+
+    for _, row in LivesplitData(tail).segment_data.iterrows():
+        online.update(row)
+
+    expected_data = LivesplitData(pd.concat([head, tail]))
+    expected = distribution_cls.from_weight_kernel(expected_data, get_count_decay_weights, DECAY)
+    _assert_same_nodes(online.nodes, expected.nodes)
+    pd.testing.assert_frame_equal(online.get_quantile_times(0.5), expected.get_quantile_times(0.5))
@@ -0,0 +1,33 @@
+# -*- coding: utf-8 -*-
+"""
+Created on 2026-10-18
+
+@author: brassbeat
+"""
+import numpy as np
+import pytest
+
+from ls_analysis.distributions.core.interpolated import InterpolatedDistribution
+from ls_analysis.distributions.core.weighted_empirical import WeightedEmpiricalDistribution
+from ls_analysis.distributions.core.weights.kernels import get_count_decay_weights
+from ls_analysis.distributions.enums import DistributionColumn
+
+DISTRIBUTIONS = (InterpolatedDistribution, WeightedEmpiricalDistribution)
+DECAYS = (0.9, 0.95, 0.99, 1.)
+
+
+@pytest.mark.parametrize("decay", DECAYS)
+@pytest.mark.parametrize("distribution_cls", DISTRIBUTIONS)
+def test_prior_quantiles_stay_within_unit_interval(synthetic_data, distribution_cls, decay):
+    nodes = distribution_cls.from_weight_kernel(synthetic_data, get_count_decay_weights, decay).nodes
+    assert nodes.quantiles.min() == 0.
+    assert nodes.quantiles.max() <= 1.
+
+
+@pytest.mark.parametrize("decay", DECAYS)
+@pytest.mark.parametrize("distribution_cls", DISTRIBUTIONS)
+def test_quantile_one_gives_last_nodes(synthetic_data, distribution_cls, decay):
+    distribution = distribution_cls.from_weight_kernel(synthetic_data, get_count_decay_weights, decay)
+    nodes = distribution.nodes
+    times = distribution.get_quantile_times(1.)[DistributionColumn.SEGMENT_TIME].to_numpy()
+    np.testing.assert_array_equal(times, nodes.times[nodes.offsets[1:] - 1])
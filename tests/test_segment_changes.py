@@ -0,0 +1,34 @@
+# -*- coding: utf-8 -*-
+"""
+Created on 2026-10-18
+
+@author: brassbeat
+"""
+import numpy as np
+import pandas as pd
+
+from ls_analysis.data.enums import AttemptStat
+from ls_analysis.statistics.segment_changes import get_segment_changes
+
+
+def test_reset_rates_divide_by_arrivals(synthetic_data):
+    frame = synthetic_data.data
+    starts = frame[AttemptStat.START_OF_ATTEMPT, -1]
+    cutoffs = pd.DatetimeIndex([starts.quantile(0.3), starts.quantile(0.7)]).as_unit("ns")
+    changes = get_segment_changes(synthetic_data, cutoffs)
+
+    # an attempt reached a segment if it has a time or reset on that segment or a later one, or finished the run
+    segment_columns = frame[AttemptStat.SEGMENT_TIME].columns
+    has_reset = frame[AttemptStat.RESET_TIME].reindex(columns=segment_columns).notna().to_numpy()
+    has_time = frame[AttemptStat.SEGMENT_TIME].notna().to_numpy() | has_reset
+    is_finished = frame[AttemptStat.RUN_TIME, -1].notna().to_numpy()
+    is_reached = np.logical_or.accumulate(has_time[:, ::-1], axis=1)[:, ::-1] | is_finished[:, np.newaxis]
+
+    for cutoff in cutoffs:
+        for period, rows in (("before", starts < cutoff), ("since", starts >= cutoff)):
+            rows = rows.to_numpy()
+            arrivals = is_reached[rows].sum(axis=0)
+            found = changes.loc[cutoff]
+            np.testing.assert_array_equal(found[f"arrivals_{period}"], arrivals)
+            np.testing.assert_array_equal(found[f"reset_{period}"], has_reset[rows].sum(axis=0))
+            np.testing.assert_allclose(found[f"reset_rate_{period}"], has_reset[rows].sum(axis=0) / arrivals)